@@ -0,0 +1,125 @@
+"""
+Streaming parser for AMFI's NAVAll.txt
+Reads the semicolon-delimited NAV file line by line and yields typed scheme records
+"""
+
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+import io
+
+AmfiScheme = namedtuple('AmfiScheme', [
+    'scheme_code', 'isin_growth', 'isin_reinvestment', 'scheme_name',
+    'nav', 'nav_date', 'amc', 'scheme_type', 'category'
+])
+
+HEADER_PREFIX = 'Scheme Code;'
+MISSING_VALUES = {'', '-', 'N.A.', 'NA'}
+
+
+def _open_lines(source):
+    """Yield decoded text lines from a URL, a file path or an open file/socket object"""
+    if hasattr(source, 'read'):
+        if isinstance(source, io.TextIOBase):
+            yield from source
+        else:
+            # Binary streams such as socket.makefile('rb') or a raw HTTP body
+            yield from io.TextIOWrapper(source, encoding='utf-8', errors='replace')
+        return
+
+    if source.startswith(('http://', 'https://')):
+        import http_cache
+
+        yield from http_cache.shared_cache().get(source).iter_lines()
+        return
+
+    with open(source, 'r', encoding='utf-8', errors='replace') as f:
+        yield from f
+
+
+def parse_lines(lines):
+    """Parse NAVAll.txt lines, tracking the scheme-type/category and AMC section headers"""
+    scheme_type = None
+    category = None
+    amc = None
+    parse_date = {}
+
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(HEADER_PREFIX):
+            continue
+
+        fields = line.split(';')
+        if len(fields) < 6:
+            # Section headers: "Open Ended Schemes(Equity Scheme - Small Cap Fund)" or an AMC name
+            if line.endswith(')') and '(' in line:
+                scheme_type, _, category = line[:-1].partition('(')
+                scheme_type = scheme_type.strip()
+                category = category.strip()
+            else:
+                amc = line
+            continue
+
+        code, isin_growth, isin_reinvestment, name, nav, date = fields[:6]
+
+        try:
+            scheme_code = int(code)
+        except ValueError:
+            continue
+
+        nav = nav.strip()
+        nav = None if nav in MISSING_VALUES else float(nav.replace(',', ''))
+
+        # Nearly every row of a daily file carries the same date, so parse each once
+        date = date.strip()
+        nav_date = parse_date.get(date)
+        if nav_date is None and date not in parse_date:
+            try:
+                nav_date = datetime.strptime(date, '%d-%b-%Y').date()
+            except ValueError:
+                nav_date = None
+            parse_date[date] = nav_date
+
+        yield AmfiScheme(
+            scheme_code,
+            None if isin_growth.strip() in MISSING_VALUES else isin_growth.strip(),
+            None if isin_reinvestment.strip() in MISSING_VALUES else isin_reinvestment.strip(),
+            name.strip(),
+            nav,
+            nav_date,
+            amc,
+            scheme_type,
+            category
+        )
+
+
+def stream_schemes(source):
+    """Stream scheme records from a NAVAll.txt URL, file path or open file/socket"""
+    return parse_lines(_open_lines(source))
+
+
+@lru_cache(maxsize=None)
+def short_category(category):
+    """Shorten an AMFI category like 'Equity Scheme - Small Cap Fund' to 'Small Cap'
+
+    Cached, so the few dozen categories are each one shared string across all funds.
+    """
+    if not category:
+        return category
+    name = category.rpartition(' - ')[2]
+    if name.endswith(' Fund'):
+        name = name[:-len(' Fund')]
+    return name
+
+
+def scheme_to_fund(scheme):
+    """Convert a scheme record into the fund dict shape used by the screener"""
+    return {
+        'fund_name': scheme.scheme_name,
+        'fund_code': str(scheme.scheme_code),
+        'category': short_category(scheme.category),
+        'amc': scheme.amc,
+        'isin': scheme.isin_growth,
+        'current_nav': scheme.nav,
+        'nav_date': scheme.nav_date.isoformat() if scheme.nav_date else None
+    }
@@ -0,0 +1,195 @@
+"""
+Vectorized historical backtest of the screener's recommendations
+Replays screening and scoring on every rebalance date of a NAV history store at once
+and reports forward returns and hit rates per recommendation bucket
+"""
+
+import numpy as np
+
+from nav_store import HISTORY_FIELDS, RANGE_DAYS, RETURN_PERIODS, trailing_return
+import indicators
+import rules
+import scoring
+import screening
+
+# Forward return horizons in calendar days
+HORIZONS = {'3m': 91, '6m': 182, '12m': 365}
+
+# Scheme rows per block, bounding the (rows x days) rolling-window copies to a few hundred MB
+BLOCK_ROWS = 1024
+
+ALL_FUNDS = 'All funds'
+
+
+def rebalance_days(dates, frequency='weekly'):
+    """Indices of the last stored day of every week or month, once a year of history exists"""
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    if frequency == 'weekly':
+        # 1970-01-05 was a Monday
+        periods = (dates - np.datetime64('1970-01-05', 'D')).astype(np.int64) // 7
+    elif frequency == 'monthly':
+        periods = dates.astype('datetime64[M]').astype(np.int64)
+    else:
+        raise ValueError(f"Unknown rebalance frequency '{frequency}', expected weekly or monthly")
+
+    last = np.flatnonzero(np.append(periods[1:] != periods[:-1], True))
+    return last[dates[last] - np.timedelta64(RANGE_DAYS, 'D') >= dates[0]]
+
+
+def _rolling_extreme(navs, span, ufunc):
+    """ufunc.reduce over navs[:, i:i + span] for every i, NaN-skipping (van Herk/Gil-Werman)"""
+    rows, days = navs.shape
+    padded_days = -(-days // span) * span
+    padded = np.full((rows, padded_days + span), np.nan)
+    padded[:, :days] = navs
+    blocks = padded.reshape(rows, -1, span)
+
+    prefix = ufunc.accumulate(blocks, axis=2).reshape(rows, -1)
+    suffix = ufunc.accumulate(blocks[:, :, ::-1], axis=2)[:, :, ::-1].reshape(rows, -1)
+    return ufunc(suffix[:, :days], prefix[:, span - 1:span - 1 + days])
+
+
+def _offset_days(dates, ends, days, side):
+    """Index of the stored day `days` calendar days from each end; searchsorted semantics per side"""
+    return np.searchsorted(dates, dates[ends] + np.timedelta64(days, 'D'), side=side)
+
+
+def _window_extremes(navs, starts, ends):
+    """(max, min) of navs[:, start:end + 1] for every start/end pair, NaN where the window is all NaN
+
+    When the longest window is at most twice the shortest, a fixed span of the
+    shortest length gives every window as two overlapping rolling extremes; other
+    windows (gaps in the stored days) are reduced one rebalance day at a time.
+    """
+    lengths = ends - starts + 1
+    span = int(lengths.min())
+    if lengths.max() <= 2 * span:
+        highs = _rolling_extreme(navs, span, np.fmax)
+        lows = _rolling_extreme(navs, span, np.fmin)
+        tails = ends - span + 1
+        return np.fmax(highs[:, starts], highs[:, tails]), np.fmin(lows[:, starts], lows[:, tails])
+
+    highs = np.column_stack([np.fmax.reduce(navs[:, start:end + 1], axis=1) for start, end in zip(starts, ends)])
+    lows = np.column_stack([np.fmin.reduce(navs[:, start:end + 1], axis=1) for start, end in zip(starts, ends)])
+    return highs, lows
+
+
+def history_columns(navs, dates, ends):
+    """HISTORY_FIELDS-style columns of shape (rows, len(ends)), as NavStore.derive_fields gives at each end"""
+    current = navs[:, ends]
+    high, low = _window_extremes(navs, _offset_days(dates, ends, -RANGE_DAYS, 'right'), ends)
+    columns = {'current_nav': current, '52w_high': high, '52w_low': low}
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for field, years in RETURN_PERIODS.items():
+            past = _offset_days(dates, ends, -RANGE_DAYS * years, 'right') - 1
+            values = trailing_return(current, navs[:, np.maximum(past, 0)], years)
+            columns[field] = np.where(past >= 0, values, np.nan)
+    return columns
+
+
+def forward_returns(navs, dates, ends):
+    """{horizon: percentage return from each end to the first stored day at least that far ahead}"""
+    returns = {}
+    for horizon, days in HORIZONS.items():
+        ahead = _offset_days(dates, ends, days, 'left')
+        valid = ahead < len(dates)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = (navs[:, np.minimum(ahead, len(dates) - 1)] / navs[:, ends] - 1) * 100
+        returns[horizon] = np.where(valid, values, np.nan)
+    return returns
+
+
+def recommendations(navs, dates, ends, static=None, program=None, screen_filter=None):
+    """Recommendation of every row at every end as a (rows, len(ends)) array; '' where screened out
+
+    static maps non-history fields (aum_cr, expense_ratio, ...) to per-row arrays.
+    """
+    program = program or rules.default_program()
+    screen_filter = screen_filter or screening.compile_filter()
+    rows = len(navs)
+    columns = history_columns(navs, dates, ends)
+
+    needed = set(scoring.input_fields(program)) | set(screen_filter.fields)
+    for field in needed.intersection(indicators.INDICATOR_FIELDS):
+        columns[field] = np.column_stack([indicators.compute(navs, dates, np.arange(rows), end)[field]
+                                          for end in ends])
+    for field in needed.difference(columns):
+        values = (static or {}).get(field)
+        values = np.full(rows, np.nan) if values is None else np.asarray(values, dtype=np.float64)
+        columns[field] = np.broadcast_to(values[:, None], (rows, len(ends)))
+
+    flat = {field: np.ascontiguousarray(values).ravel() for field, values in columns.items()}
+    keep = screen_filter.mask(flat)
+    scored = scoring.score_columns(flat, program)
+    labels = np.where(keep, scored['recommendation'], '')
+    return labels.reshape(rows, len(ends))
+
+
+def static_fields(funds, scheme_codes, program=None):
+    """Per-row arrays of the screening and scoring inputs NAV history cannot give, from fund dicts
+
+    Funds are matched to store rows on fund_code; these fields are held at their
+    current values across every rebalance date.
+    """
+    fields = set(scoring.input_fields(program)) | set(screening.compile_filter().fields)
+    by_code = {str(fund.get('fund_code')): fund for fund in funds}
+    matched = [by_code.get(str(code), {}) for code in scheme_codes]
+    return {field: scoring.build_columns(matched, fields=[field])[field]
+            for field in sorted(fields.difference(HISTORY_FIELDS))}
+
+
+def run_backtest(store, static=None, frequency='weekly', program=None):
+    """Forward-return statistics per recommendation bucket over every rebalance date of a NavStore
+
+    static maps fund fields that are not derived from NAV history to arrays aligned
+    with store.scheme_codes. Returns {bucket: {horizon: {count, mean_return,
+    median_return, hit_rate}}}, where hit_rate is the share of positive forward
+    returns; the 'All funds' bucket covers every scheme with a NAV on the day.
+    """
+    program = program or rules.default_program()
+    dates = np.asarray(store.dates[:store.length])
+    ends = rebalance_days(dates, frequency)
+    buckets = [label for _, label in program.recommendation_bands] + [program.recommendation_default, ALL_FUNDS]
+    collected = {bucket: {horizon: [] for horizon in HORIZONS} for bucket in buckets}
+
+    for block in range(0, len(store.scheme_codes), BLOCK_ROWS):
+        navs = np.asarray(store.navs[block:block + BLOCK_ROWS, :store.length], dtype=np.float64)
+        block_static = {field: np.asarray(values)[block:block + BLOCK_ROWS] for field, values in (static or {}).items()}
+        labels = recommendations(navs, dates, ends, block_static, program)
+        forward = forward_returns(navs, dates, ends)
+        listed = ~np.isnan(navs[:, ends])
+
+        for horizon, values in forward.items():
+            known = ~np.isnan(values)
+            collected[ALL_FUNDS][horizon].append(values[known & listed])
+            for bucket in buckets[:-1]:
+                collected[bucket][horizon].append(values[known & (labels == bucket)])
+
+    report = {}
+    for bucket, horizons in collected.items():
+        report[bucket] = {}
+        for horizon, parts in horizons.items():
+            values = np.concatenate(parts) if parts else np.array([])
+            report[bucket][horizon] = {
+                'count': int(len(values)),
+                'mean_return': round(float(values.mean()), 2) if len(values) else None,
+                'median_return': round(float(np.median(values)), 2) if len(values) else None,
+                'hit_rate': round(float((values > 0).mean()), 4) if len(values) else None,
+            }
+    return {'rebalance_dates': len(ends), 'frequency': frequency, 'buckets': report}
+
+
+def format_report(result):
+    """Plain-text table of a run_backtest result"""
+    lines = [f"Backtest over {result['rebalance_dates']} {result['frequency']} rebalance dates",
+             f"{'bucket':<12}" + ''.join(f"{horizon + ' mean':>11}{'hit':>7}{'n':>11}" for horizon in HORIZONS)]
+    for bucket, horizons in result['buckets'].items():
+        cells = []
+        for stats in horizons.values():
+            if stats['count']:
+                cells.append(f"{stats['mean_return']:+10.2f}%{stats['hit_rate']:7.0%}{stats['count']:11,}")
+            else:
+                cells.append(f"{'-':>11}{'-':>7}{0:11,}")
+        lines.append(f"{bucket:<12}" + ''.join(cells))
+    return '\n'.join(lines)
@@ -0,0 +1,96 @@
+"""
+Benchmark index loader for the Indian Mutual Fund Screener
+Pulls NIFTY index histories in one batched yfinance call and keeps them in a compact
+local .npz cache so later runs only download the missing date range (plus the last
+stored day, whose close may have been provisional)
+"""
+
+from datetime import date, timedelta
+import os
+
+import numpy as np
+
+from config import BENCHMARK_CONFIG
+
+
+def yfinance_download(tickers, start, end):
+    """Default downloader: one batched yf.download call for every ticker"""
+    import yfinance as yf
+
+    return yf.download(tickers, start=start, end=end, group_by='column',
+                       auto_adjust=True, progress=False, threads=True)
+
+
+class BenchmarkLoader:
+    """Cached daily closes (float32, one row per index) for the configured benchmark indices"""
+
+    def __init__(self, cache_path=None, indices=None, downloader=None, today=None):
+        self.cache_path = cache_path or BENCHMARK_CONFIG['cache_file']
+        self.indices = dict(indices or BENCHMARK_CONFIG['indices'])
+        self.downloader = downloader or yfinance_download
+        self.today = today
+        self.dates = np.array([], dtype='datetime64[D]')
+        self.closes = np.empty((len(self.indices), 0), dtype=np.float32)
+
+    def _read_cache(self):
+        if not os.path.exists(self.cache_path):
+            return
+        with np.load(self.cache_path) as cached:
+            if list(cached['names']) != list(self.indices):
+                return
+            self.dates = cached['dates']
+            self.closes = cached['closes']
+
+    def _write_cache(self):
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        tmp_path = self.cache_path + '.tmp.npz'
+        np.savez_compressed(tmp_path, names=np.array(list(self.indices)), dates=self.dates, closes=self.closes)
+        os.replace(tmp_path, self.cache_path)
+
+    def load(self):
+        """Read the cache and download only the days from its last stored date onward
+
+        The last stored day is downloaded again and replaced, since a close fetched
+        while that session was still trading is provisional.
+        """
+        self._read_cache()
+        today = self.today or date.today()
+
+        if len(self.dates):
+            start = date.fromisoformat(str(self.dates[-1]))
+        else:
+            start = today - timedelta(days=365 * BENCHMARK_CONFIG['history_years'])
+        if start > today:
+            return self
+
+        tickers = list(self.indices.values())
+        data = self.downloader(tickers, start=start.isoformat(), end=(today + timedelta(days=1)).isoformat())
+        if data is None or len(data) == 0:
+            return self
+
+        closes = data['Close'] if 'Close' in data.columns.get_level_values(0) else data
+        closes = closes.reindex(columns=tickers)
+        new_dates = np.asarray(closes.index.values, dtype='datetime64[D]')
+        keep = new_dates >= np.datetime64(start, 'D')
+        if not keep.any():
+            return self
+
+        stored = self.dates < new_dates[keep][0]
+        self.dates = np.concatenate([self.dates[stored], new_dates[keep]])
+        self.closes = np.concatenate([self.closes[:, stored], closes.to_numpy(dtype=np.float32).T[:, keep]], axis=1)
+        self._write_cache()
+        return self
+
+    def history(self, name):
+        """Dates and closes of one index; days the index did not trade are NaN"""
+        row = list(self.indices).index(name)
+        return self.dates, self.closes[row]
+
+    def latest_levels(self):
+        """Last available close per index name"""
+        levels = {}
+        for row, name in enumerate(self.indices):
+            valid = np.flatnonzero(~np.isnan(self.closes[row]))
+            if len(valid):
+                levels[name] = float(self.closes[row, valid[-1]])
+        return levels
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark the blocked correlation matrix on a 15k-scheme universe under a memory cap
+Run from the repository root: python -m benchmarks.bench_correlation [schemes] [max_memory_mb]
+"""
+
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import correlation
+
+
+def synthetic_navs(count, days=261, seed=2024):
+    """NAV rows driven by 40 shared factors, so schemes of one factor correlate strongly"""
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0.0003, 0.01, (40, days))
+    returns = factors[rng.integers(0, 40, count)] + rng.normal(0, rng.uniform(0.001, 0.01, (count, 1)), (count, days))
+    return 100 * np.cumprod(1 + returns, axis=1)
+
+
+def main(count=15000, max_memory_mb=256):
+    navs = synthetic_navs(count)
+    max_bytes = max_memory_mb * 2 ** 20
+    print(f"{count:,} x {count:,} correlations, cap {max_memory_mb} MiB "
+          f"(full float32 matrix: {count * count * 4 / 2 ** 20:,.0f} MiB)")
+
+    timings = {}
+    start = time.perf_counter()
+    z, usable = correlation.standardized_returns(navs, None, navs.shape[1] - 1)
+    del navs
+    timings['standardize'] = time.perf_counter() - start
+
+    # Traced from here, so the peak covers the returns and every block, not the generated NAVs
+    tracemalloc.start()
+    z = z.copy()
+
+    start = time.perf_counter()
+    found, _ = correlation.correlated_pairs(z, usable, max_bytes=max_bytes, top=20)
+    timings['pairs (upper triangle)'] = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        correlation.write_matrix(os.path.join(directory, 'corr.npy'), z, usable, max_bytes)
+        timings['full matrix to disk'] = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for name, seconds in timings.items():
+        print(f"  {name:<24} {seconds:8.2f} s")
+    print(f"  {found:,} pairs ≥ {correlation.CORRELATION_CONFIG['threshold']}, "
+          f"{correlation.block_rows(count, z.shape[1], max_bytes):,} rows per block")
+    print(f"  traced peak {peak / 2 ** 20:.0f} MiB of {max_memory_mb} MiB, "
+          f"process max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+    return peak <= max_bytes
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main(*[int(arg) for arg in sys.argv[1:]]) else 1)
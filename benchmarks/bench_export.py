@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Benchmark analysis data export formats
+Reports file size and serialize, full deserialize and single-column read times per format
+Run from the repository root: python -m benchmarks.bench_export
+"""
+
+import tempfile
+
+import exporters
+from synthetic_data import synthetic_screened_funds
+
+
+def main(rows=15000):
+    funds = synthetic_screened_funds(rows)
+    meta = {'nifty_valuation': {'nifty_50_level': 25125}, 'news_data': [], 'analysis_timestamp': '2026-01-01T00:00:00'}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = exporters.compare_formats(funds, meta, tmp_dir)
+
+    print(f"Analysis data export, {rows:,} funds")
+    print(f"{'format':<14} {'size':>10} {'write':>10} {'read':>10} {'1 column':>10}")
+    for result in results:
+        print(f"{result['format']:<14} {result['bytes'] / 1024:8.0f}KB "
+              f"{result['write_seconds'] * 1000:8.1f}ms {result['read_seconds'] * 1000:8.1f}ms "
+              f"{result['column_read_seconds'] * 1000:8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
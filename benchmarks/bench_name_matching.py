@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark joining AMFI scheme names to a secondary source by trigram similarity
+Run from the repository root: python -m benchmarks.bench_name_matching [funds]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import name_matching
+from synthetic_data import AMCS, CATEGORIES
+
+PLANS = ['Direct Plan - Growth', 'Regular Plan - Growth', 'Direct Plan - IDCW']
+SYLLABLES = ['ver', 'ta', 'lo', 'pra', 'gati', 'nid', 'hi', 'sam', 'ru', 'dhan', 'ka', 'mi', 'ra', 'vi', 'jay']
+
+
+def synthetic_names(count, seed=2024):
+    """(AMFI scheme names, factsheet names): three plans per fund, factsheets spelled differently"""
+    rng = np.random.default_rng(seed)
+    funds = []
+    for i in range(count):
+        word = ''.join(rng.choice(SYLLABLES, 3)).title()
+        funds.append((AMCS[i % len(AMCS)], word, CATEGORIES[rng.integers(len(CATEGORIES))]))
+    amfi_names = [f'{amc} {word} {category} Fund - {plan}' for amc, word, category in funds for plan in PLANS]
+    factsheet_names = [f'{amc.upper()} {word} {category.replace(" Cap", "cap")} Fund' for amc, word, category in funds]
+    return amfi_names, factsheet_names
+
+
+def main(count=5000):
+    amfi_names, factsheet_names = synthetic_names(count)
+    expected = np.repeat(np.arange(count), len(PLANS))
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, 'names.json')
+        print(f"{len(amfi_names):,} AMFI schemes against {count:,} factsheet names")
+        for label in ('first run', 'cached run'):
+            start = time.perf_counter()
+            matches = name_matching.match_names(amfi_names, factsheet_names,
+                                                cache=name_matching.MappingCache(cache_path))
+            elapsed = time.perf_counter() - start
+            correct = np.mean([position == want for (position, _), want in zip(matches, expected)])
+            print(f"{label:<11} {elapsed * 1000:9.1f} ms   {correct:.1%} joined to the right fund")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
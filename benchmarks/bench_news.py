@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Benchmark streaming news ingestion on a generated RSS feed
+Run from the repository root: python -m benchmarks.bench_news [items]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import news
+from synthetic_data import rss_feed
+
+
+def main(count=50000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'feed.xml')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(rss_feed(count))
+        news.default_matcher()
+
+        start = time.perf_counter()
+        kept = sum(1 for _ in news.iter_news([path]))
+        elapsed = time.perf_counter() - start
+
+        # Traced separately; tracemalloc slows allocation-heavy parsing several times over
+        tracemalloc.start()
+        sum(1 for _ in news.iter_news([path]))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{count:,} items ({os.path.getsize(path) / 2 ** 20:.1f} MiB), {kept:,} unique: "
+              f"{elapsed * 1000:.0f} ms, {count / elapsed:,.0f} items/s, {peak / 2 ** 20:.1f} MiB peak")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Benchmark NAV-derived indicator computation with 1..N worker processes
+Run from the repository root: python -m benchmarks.bench_parallel [schemes] [years]
+"""
+
+import os
+import sys
+import tempfile
+
+from benchmarks.bench_ranking import best_of
+from config import INDICATOR_CONFIG
+from synthetic_data import synthetic_universe
+
+
+def main(count=100000, years=10):
+    INDICATOR_CONFIG['min_schemes_per_worker'] = 1
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        _, store, _ = synthetic_universe(count, years, directory)
+        codes = store.scheme_codes
+
+        print(f"Derived NAV fields for {count:,} schemes x {years} years on {cpus} CPU(s) (best of 3)")
+        serial = best_of(3, lambda: store.derive_fields(codes))
+        print(f"{'in-process':<14} {serial * 1000:9.1f} ms")
+        for workers in sorted({2, 4, cpus} - {1}):
+            elapsed = best_of(3, lambda: store.derive_fields(codes, workers=workers))
+            print(f"{f'{workers} workers':<14} {elapsed * 1000:9.1f} ms   speed-up {serial / elapsed:4.2f}x")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark top-K leaderboard selection against sorting the whole screened list
+Run from the repository root: python -m benchmarks.bench_ranking
+"""
+
+import random
+import time
+
+import numpy as np
+
+import ranking
+
+
+def synthetic_scored_funds(count, seed=9):
+    """Scored funds with the heavy ties at 100 seen in real screens"""
+    rng = random.Random(seed)
+    return [{
+        'fund_code': f'F{i:06d}',
+        'category': rng.choice(['Small Cap', 'Mid Cap', 'Large Cap', 'Flexi Cap', 'ELSS']),
+        'momentum_score': rng.choice([100, 100, 100, 90, 85, 75, 65, 55, 40]),
+        'drawdown_from_high': round(rng.uniform(0, 40), 2),
+        'aum_cr': rng.randint(100, 90000),
+        'expense_ratio': round(rng.uniform(0.2, 2.5), 2),
+    } for i in range(count)]
+
+
+def best_of(runs, fn):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(count=15000, k=50):
+    funds = synthetic_scored_funds(count)
+    columns = {name: np.array([fund[name] for fund in funds]) for name in funds[0]}
+
+    print(f"Top-{k} leaderboard over {count:,} funds (best of 5)")
+    for label, fn in [
+        ('full sort', lambda: sorted(funds, key=ranking.rank_key)[:k]),
+        ('heapq.nsmallest', lambda: ranking.top_k(funds, k)),
+        ('np.partition + lexsort', lambda: ranking.top_k_indices(columns, k)),
+        ('full sort per category', lambda: {c: sorted((f for f in funds if f['category'] == c),
+                                                      key=ranking.rank_key)[:k]
+                                            for c in {f['category'] for f in funds}}),
+        ('heapq per category', lambda: ranking.top_k(funds, k, per_category=True)),
+        ('partition per category', lambda: ranking.top_k_indices_per_category(columns, k)),
+    ]:
+        print(f"{label:<28} {best_of(5, fn) * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
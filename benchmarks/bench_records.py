@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Memory per screened fund: merged dicts versus FundRecords
+Run from the repository root: python -m benchmarks.bench_records [schemes]
+"""
+
+import sys
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+import amfi
+from benchmarks.bench_ranking import best_of
+from synthetic_data import synthetic_universe
+import scoring
+
+
+def dict_records(funds, scored, indices):
+    """The previous result shape: one {**fund, **computed} dict per fund"""
+    columns = [(name, scored[name][indices].tolist()) for name in scoring.OUTPUT_FIELDS]
+    return [{**funds[fund_index], **{name: values[position] for name, values in columns}}
+            for position, fund_index in enumerate(indices.tolist())]
+
+
+def retained_bytes(fn):
+    """Bytes allocated by fn that its result still holds"""
+    tracemalloc.start()
+    result = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main(count=100000):
+    with tempfile.TemporaryDirectory() as directory:
+        navall, store, static = synthetic_universe(count, 2, directory)
+        funds = [{**amfi.scheme_to_fund(scheme), **static[scheme.scheme_code]} for scheme in amfi.stream_schemes(navall)]
+        updates = store.fund_updates([fund['fund_code'] for fund in funds])
+        funds = [{**fund, **update} for fund, update in zip(funds, updates)]
+
+    columns = scoring.build_columns(funds)
+    scored = scoring.score_columns(columns)
+    order = np.argsort(-scored['momentum_score'], kind='stable')
+
+    print(f"{count:,} screened funds, {len(funds[0]) + len(scoring.OUTPUT_FIELDS)} fields each")
+    for name, build in (('dict', dict_records), ('FundRecord', scoring.to_records)):
+        size = retained_bytes(lambda: build(funds, scored, order))
+        elapsed = best_of(3, lambda: build(funds, scored, order))
+        print(f"{name:<12} {size / count:8.0f} bytes/fund {elapsed * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
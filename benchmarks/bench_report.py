@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML report rendering at 10k fund rows
+Compares the old grow-a-string approach with streaming chunks straight to a file
+Run from the repository root: python -m benchmarks.bench_report
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+import report_writer
+from synthetic_data import synthetic_screened_funds
+
+
+def render_concatenated(funds, valuation, news):
+    """The previous approach: grow one string with += per row, then write it at once"""
+    html = report_writer.render_header('2026-01-01 00:00:00 IST', valuation)
+    for fund in funds:
+        html += report_writer.render_fund_row(fund)
+    html += report_writer.TABLE_FOOTER + report_writer.NEWS_HEADER
+    for item in news:
+        html += report_writer.render_news_item(item)
+    html += report_writer.render_footer()
+    return html
+
+
+def measure(label, render):
+    """Wall time and tracemalloc peak of one render-and-write pass"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'index.html')
+        tracemalloc.start()
+        start = time.perf_counter()
+        render(path)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        size = os.path.getsize(path)
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms   peak {peak / 1024 / 1024:7.2f} MiB   output {size / 1024 / 1024:6.2f} MiB")
+
+
+def main(rows=10000):
+    funds = synthetic_screened_funds(rows)
+    valuation = {'nifty_50_level': 25125, 'nifty_50_pe': 22.0, 'market_cap_to_gdp': 120.0,
+                 'current_vs_historical': 'Overvalued'}
+    news = [{'headline': f'Headline {i}', 'summary': 'Summary', 'impact': 'Mixed', 'date': '2026-01-01'}
+            for i in range(50)]
+
+    def concatenated(path):
+        html = render_concatenated(funds, valuation, news)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+
+    def streamed(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            report_writer.write_report(f, '2026-01-01 00:00:00 IST', funds, valuation, news)
+
+    print(f"HTML report render, {rows:,} fund rows")
+    measure('string concatenation', concatenated)
+    measure('streamed chunks', streamed)
+
+
+if __name__ == '__main__':
+    main()
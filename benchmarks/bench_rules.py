@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled scoring rules against the per-fund interpreted path
+Run from the repository root: python -m benchmarks.bench_rules
+"""
+
+from benchmarks.bench_ranking import best_of
+from mutual_fund_screener import IndianMutualFundScreener
+import rules
+import scoring
+from synthetic_data import synthetic_funds
+
+
+def main(count=15000):
+    screener = IndianMutualFundScreener()
+    funds = synthetic_funds(count)
+    columns = scoring.build_columns(funds)
+
+    def per_fund():
+        for fund in funds:
+            momentum = screener.calculate_momentum_indicators(fund)
+            screener.get_recommendation(fund, momentum)
+
+    print(f"Scoring {count:,} funds (best of 5)")
+    for label, fn in [
+        ('compile rules', rules.compile_rules),
+        ('per-fund rules', per_fund),
+        ('compiled columns', lambda: scoring.score_columns(columns)),
+        ('build + compiled columns', lambda: scoring.score_columns(scoring.build_columns(funds))),
+    ]:
+        print(f"{label:<26} {best_of(5, fn) * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the command-line entry point
+Runs `cli.py screen --help` under `python -X importtime`, sums the import time of
+every top-level module and fails when it exceeds the budget or pulls in a heavy
+dependency
+Run from the repository root: python -m benchmarks.bench_startup [--budget-ms 60]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+CLI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cli.py')
+COMMAND = ['screen', '--help']
+BUDGET_MS = 60
+HEAVY_MODULES = ('numpy', 'pandas', 'requests', 'yfinance')
+
+
+def import_profile(args=COMMAND):
+    """[(module, self microseconds, cumulative microseconds, depth)] for one CLI invocation"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', CLI] + list(args),
+                            capture_output=True, text=True, check=True)
+    profile = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        profile.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return profile
+
+
+def summarize(profile):
+    """(total import milliseconds, heavy modules imported)"""
+    total_us = sum(cumulative for _, _, cumulative, depth in profile if depth == 0)
+    imported = {name.split('.')[0] for name, _, _, _ in profile}
+    return total_us / 1000, sorted(imported.intersection(HEAVY_MODULES))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import-time budget for `cli.py screen --help`')
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=5, help='the fastest run is compared with the budget')
+    args = parser.parse_args(argv)
+
+    runs = [import_profile() for _ in range(args.runs)]
+    best = min(runs, key=lambda profile: summarize(profile)[0])
+    total_ms, heavy = summarize(best)
+
+    print(f"cli.py {' '.join(COMMAND)}: {total_ms:.1f} ms of imports (budget {args.budget_ms:.0f} ms)")
+    print("Slowest top-level imports:")
+    for name, _, cumulative, _ in sorted((entry for entry in best if entry[3] == 0), key=lambda e: -e[2])[:8]:
+        print(f"  {name:<32} {cumulative / 1000:7.1f} ms")
+
+    failed = False
+    if heavy:
+        print(f"❌ Heavy modules imported at startup: {', '.join(heavy)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"❌ Import time over budget by {total_ms - args.budget_ms:.1f} ms")
+        failed = True
+    if not failed:
+        print("✅ Within budget")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Per-stage benchmark suite on deterministic synthetic fund universes
+Times ingest, indicators, scoring, ranking, HTML render and JSON export for 1k, 10k
+and 100k schemes with 10 years of daily NAVs, records throughput and tracemalloc
+peak, and flags stages that regressed against the stored baseline
+
+Run from the repository root:
+    python -m benchmarks.suite                       # compare against benchmarks/baseline.json
+    python -m benchmarks.suite --sizes 1000,10000    # smaller universes only
+    python -m benchmarks.suite --update-baseline     # record new baseline numbers
+Exits with status 1 when any stage regressed beyond the tolerance.
+"""
+
+import argparse
+import contextlib
+from datetime import date
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import amfi
+import exporters
+from mutual_fund_screener import IndianMutualFundScreener
+import ranking
+import report_writer
+from synthetic_data import synthetic_universe
+
+SIZES = (1000, 10000, 100000)
+YEARS = 10
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+TOLERANCE = 0.25
+
+# Stages faster than this are dominated by timer noise and never flagged on time
+NOISE_FLOOR_SECONDS = 0.005
+
+VALUATION = {'nifty_50_level': 25125, 'nifty_50_pe': 22.0, 'market_cap_to_gdp': 120.0,
+             'current_vs_historical': 'Overvalued'}
+NEWS = [{'headline': f'Headline {i}', 'summary': 'Summary', 'impact': 'Mixed', 'date': '2026-01-01'}
+        for i in range(20)]
+
+
+def measure(fn, repeat):
+    """(result, best wall seconds, tracemalloc peak bytes) of fn
+
+    The peak comes from a separate traced run so tracing overhead stays out of the timings.
+    """
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best, peak
+
+
+def run_size(count, years, repeat, directory):
+    """Benchmark every stage on one universe size; returns {stage: metrics}"""
+    navall, store, static = synthetic_universe(count, years, directory)
+    screener = IndianMutualFundScreener(nav_store=store)
+    scorer = IndianMutualFundScreener()
+    out_dir = os.path.join(directory, 'out')
+    os.makedirs(out_dir, exist_ok=True)
+
+    def ingest():
+        funds = ({**amfi.scheme_to_fund(scheme), **static[scheme.scheme_code]}
+                 for scheme in amfi.stream_schemes(navall))
+        return screener.ingest_funds(funds)
+
+    def html_render():
+        with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+            report_writer.write_report(f, '2026-01-01 00:00:00 IST', screened, VALUATION, NEWS)
+
+    def json_export():
+        meta = {'nifty_valuation': VALUATION, 'news_data': NEWS, 'analysis_timestamp': '2026-01-01T00:00:00'}
+        return exporters.export(screened, meta, 'json-compact', os.path.join(out_dir, 'fund_analysis_data'))
+
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        funds, *metrics = measure(ingest, repeat)
+        results['ingest'] = metrics
+
+        enriched, *metrics = measure(lambda: screener.apply_nav_history(funds), repeat)
+        results['indicators'] = metrics
+
+        scorer.funds_data = enriched
+        screened, *metrics = measure(scorer.screen_beaten_down_funds, repeat)
+        results['scoring'] = metrics
+
+        _, *metrics = measure(lambda: (ranking.top_k(screened, 50), ranking.top_k(screened, 50, per_category=True)),
+                              repeat)
+        results['ranking'] = metrics
+
+        _, *metrics = measure(html_render, repeat)
+        results['html_render'] = metrics
+
+        _, *metrics = measure(json_export, repeat)
+        results['json_export'] = metrics
+
+    return {stage: {'seconds': round(seconds, 6), 'schemes_per_second': round(count / seconds) if seconds else None,
+                    'peak_bytes': peak}
+            for stage, (seconds, peak) in results.items()}
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Messages for every stage whose time or peak memory grew beyond tolerance"""
+    regressions = []
+    for size, stages in results.items():
+        for stage, metrics in stages.items():
+            reference = baseline.get(size, {}).get(stage)
+            if reference is None:
+                continue
+            if (metrics['seconds'] > NOISE_FLOOR_SECONDS
+                    and metrics['seconds'] > reference['seconds'] * (1 + tolerance)):
+                regressions.append(f"{size} schemes / {stage}: {metrics['seconds'] * 1000:.1f} ms "
+                                   f"vs baseline {reference['seconds'] * 1000:.1f} ms")
+            if metrics['peak_bytes'] > reference['peak_bytes'] * (1 + tolerance):
+                regressions.append(f"{size} schemes / {stage}: peak {metrics['peak_bytes'] / 2 ** 20:.1f} MiB "
+                                   f"vs baseline {reference['peak_bytes'] / 2 ** 20:.1f} MiB")
+    return regressions
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, years):
+    """Merge results into the baseline file, keeping sizes that were not re-run"""
+    baseline = load_baseline(path)
+    baseline.setdefault('results', {}).update(results)
+    baseline.update({'years': years, 'python': platform.python_version(), 'machine': platform.machine(),
+                     'recorded': date.today().isoformat()})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def print_table(size, years, stages):
+    print(f"\n{size:,} schemes x {years} years")
+    print(f"{'stage':<14} {'time':>11} {'schemes/s':>12} {'peak':>11}")
+    for stage, metrics in stages.items():
+        rate = metrics['schemes_per_second']
+        print(f"{stage:<14} {metrics['seconds'] * 1000:8.1f} ms {rate or 0:12,} "
+              f"{metrics['peak_bytes'] / 2 ** 20:7.1f} MiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', default=','.join(str(size) for size in SIZES),
+                        help='comma-separated universe sizes')
+    parser.add_argument('--years', type=int, default=YEARS)
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per stage; the best is kept')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='allowed relative slowdown or memory growth, e.g. 0.25 for 25%%')
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--output', help='also write this run\'s results to a JSON file')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in [int(size) for size in args.sizes.split(',')]:
+        with tempfile.TemporaryDirectory() as directory:
+            results[str(size)] = run_size(size, args.years, args.repeat, directory)
+        print_table(size, args.years, results[str(size)])
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results, args.years)
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline.get('years', args.years) != args.years:
+        print(f"\nBaseline was recorded with {baseline['years']} years of history; not comparing")
+        return 0
+
+    regressions = compare(results, baseline.get('results', {}), args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print(f"\n✅ No stage regressed beyond {args.tolerance:.0%} of the baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
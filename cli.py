@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Command-line entry point for the Indian Mutual Fund Screener
+
+    python cli.py fetch [--source URL_OR_PATH [--factsheets FILE]] [--news-feed URL_OR_PATH ...]
+                        [--nav-store DIR [--incremental]] [--benchmarks]
+    python cli.py screen [--nav-store DIR]
+    python cli.py render
+    python cli.py run [--source URL_OR_PATH] [--refresh]
+    python cli.py serve [--port 8000] [--data FILE]
+    python cli.py backtest --nav-store DIR [--frequency weekly|monthly] [--output FILE]
+    python cli.py correlate --nav-store DIR [--output FILE.npy] [--max-memory-mb MB] [--top N]
+
+fetch, screen and render hand their results to the next step through JSON files in
+--work-dir; run does all three in one process. Only the standard library is imported
+at startup: NumPy, requests and yfinance are imported by the subcommands that use them.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+WORK_DIR = os.path.join('.cache', 'run')
+FETCHED_FILE = 'fetched.json'
+SCREENED_FILE = 'screened.json'
+
+# Screener attributes that fetch hands to screen and render, plus the rows the
+# screening filters rejected while funds were ingested
+FETCHED_ATTRIBUTES = ['funds_data', 'nifty_valuation', 'news_data', 'fetch_errors',
+                      'fund_source_url', 'reused_screen']
+FETCH_REJECTIONS = 'screening_rejections'
+
+
+def _write_json(work_dir, name, data):
+    from fund_records import json_default
+
+    os.makedirs(work_dir, exist_ok=True)
+    path = os.path.join(work_dir, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), default=json_default)
+    return path
+
+
+def _read_json(work_dir, name, step):
+    path = os.path.join(work_dir, name)
+    if not os.path.exists(path):
+        raise SystemExit(f"{path} not found; run `{step}` first")
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _screener(args, fetched=None):
+    """Screener configured from the command line, restored from a fetch step when given"""
+    from instrumentation import Instrumentation
+    from mutual_fund_screener import IndianMutualFundScreener
+
+    nav_store = None
+    if getattr(args, 'nav_store', None):
+        from nav_store import NavStore
+
+        nav_store = NavStore.open(args.nav_store, mode='r+' if getattr(args, 'incremental', False) else 'r')
+
+    benchmarks = None
+    if getattr(args, 'benchmarks', False):
+        from benchmark_indices import BenchmarkLoader
+
+        benchmarks = BenchmarkLoader()
+
+    factsheets = None
+    if getattr(args, 'factsheets', None):
+        from name_matching import load_records
+
+        factsheets = load_records(args.factsheets)
+
+    instrumentation = None
+    if args.metrics:
+        instrumentation = Instrumentation(enabled=True, metrics_file=args.metrics)
+
+    screener = IndianMutualFundScreener(nav_store=nav_store, incremental=getattr(args, 'incremental', False),
+                                        benchmarks=benchmarks, instrumentation=instrumentation,
+                                        workers=getattr(args, 'workers', None), factsheets=factsheets,
+                                        news_feeds=getattr(args, 'news_feed', None))
+    for attribute in FETCHED_ATTRIBUTES:
+        if fetched and attribute in fetched:
+            setattr(screener, attribute, fetched[attribute])
+    screener.screen_filter.rejected.update((fetched or {}).get(FETCH_REJECTIONS, {}))
+    return screener
+
+
+def cmd_fetch(args):
+    screener = _screener(args)
+    screener.fetch_all_data(args.source)
+    fetched = {attribute: getattr(screener, attribute) for attribute in FETCHED_ATTRIBUTES}
+    fetched[FETCH_REJECTIONS] = screener.screen_filter.rejected
+    path = _write_json(args.work_dir, FETCHED_FILE, fetched)
+    screener.instrumentation.write_metrics()
+    print(f"📦 Fetched {len(screener.funds_data)} funds: {path}")
+
+
+def cmd_screen(args):
+    screener = _screener(args, _read_json(args.work_dir, FETCHED_FILE, 'fetch'))
+    screened_funds = screener.screen_beaten_down_funds()
+    path = _write_json(args.work_dir, SCREENED_FILE, {
+        'screened_funds': screened_funds,
+        'screening_rejections': screener.screen_filter.rejected,
+    })
+    screener.instrumentation.write_metrics()
+    print(f"📊 Screened {len(screened_funds)} beaten-down funds: {path}")
+    if screener.screen_filter.summary():
+        print(f"🚫 Rejected by screening filters: {screener.screen_filter.summary()}")
+
+
+def cmd_render(args):
+    screener = _screener(args, _read_json(args.work_dir, FETCHED_FILE, 'fetch'))
+    screened = _read_json(args.work_dir, SCREENED_FILE, 'screen')
+    screener.screen_filter.rejected.update(screened['screening_rejections'])
+    data_path = screener.write_outputs(screened['screened_funds'])
+    screener.instrumentation.write_metrics()
+    print("📄 Report generated: index.html")
+    print(f"📊 Data saved: {data_path}")
+
+
+def cmd_run(args):
+    _screener(args).run_analysis(args.source, refresh=args.refresh)
+
+
+def cmd_serve(args):
+    from config import EXPORT_CONFIG
+    import exporters
+    from query_server import QueryServer
+
+    data_path = args.data or os.path.join(args.directory, exporters.output_path(EXPORT_CONFIG['format']))
+    with QueryServer((args.host, args.port), data_path, directory=args.directory,
+                     reload_seconds=args.reload_seconds, verbose=True) as server:
+        print(f"🌐 Serving {os.path.abspath(args.directory)} on http://{args.host}:{server.server_port}/ "
+              f"with {server.dataset.count} funds at /api/funds")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def cmd_backtest(args):
+    import backtest
+    from nav_store import NavStore
+
+    store = NavStore.open(args.nav_store)
+    fetched_path = os.path.join(args.work_dir, FETCHED_FILE)
+    funds = _read_json(args.work_dir, FETCHED_FILE, 'fetch')['funds_data'] if os.path.exists(fetched_path) else []
+    result = backtest.run_backtest(store, backtest.static_fields(funds, store.scheme_codes), args.frequency)
+    print(backtest.format_report(result))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"📊 Backtest saved: {args.output}")
+
+
+def cmd_correlate(args):
+    import correlation
+    from nav_store import NavStore
+
+    store = NavStore.open(args.nav_store)
+    max_bytes = args.max_memory_mb * 2 ** 20 if args.max_memory_mb else None
+    z, usable = correlation.standardized_returns(store.navs, None, store.length - 1)
+    count, pairs = correlation.correlated_pairs(z, usable, args.threshold, max_bytes, top=args.top)
+    print(f"🔗 {count:,} scheme pairs with correlation ≥ "
+          f"{args.threshold if args.threshold is not None else correlation.CORRELATION_CONFIG['threshold']} "
+          f"among {int(usable.sum()):,} schemes")
+    for i, j, value in pairs:
+        print(f"  {store.scheme_codes[i]:>10}  {store.scheme_codes[j]:>10}  {value:.3f}")
+    if args.output:
+        correlation.write_matrix(args.output, z, usable, max_bytes)
+        print(f"📊 Correlation matrix saved: {args.output}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description='Indian Mutual Fund Recovery Screener')
+    parser.add_argument('--work-dir', default=WORK_DIR, help='where fetch/screen/render exchange results')
+    parser.add_argument('--metrics', metavar='FILE', help='record per-stage timings and memory to FILE')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_source(command):
+        command.add_argument('--source', help='AMFI NAVAll.txt URL or path; sample funds when omitted')
+        command.add_argument('--factsheets', metavar='FILE',
+                             help='JSON or CSV records with fund_name plus AUM/expense/manager, matched by name')
+        command.add_argument('--news-feed', metavar='URL_OR_PATH', action='append',
+                             help='RSS, Atom or HTML news feed; repeat for several (default NEWS_CONFIG["feeds"])')
+
+    def add_nav_store(command, incremental):
+        command.add_argument('--nav-store', metavar='DIR', help='derive NAV fields from this NAV history store')
+        command.add_argument('--workers', type=int, help='processes deriving NAV fields; 0 = one per CPU')
+        if incremental:
+            command.add_argument('--incremental', action='store_true',
+                                 help='append the fetched day to the NAV store and roll 52-week state forward')
+
+    fetch = commands.add_parser('fetch', help='fetch fund, valuation and news data')
+    add_source(fetch)
+    add_nav_store(fetch, incremental=True)
+    fetch.add_argument('--benchmarks', action='store_true', help='load benchmark index levels from Yahoo Finance')
+    fetch.set_defaults(handler=cmd_fetch)
+
+    screen = commands.add_parser('screen', help='screen and score the fetched funds')
+    add_nav_store(screen, incremental=False)
+    screen.set_defaults(handler=cmd_screen)
+
+    render = commands.add_parser('render', help='write index.html and the analysis data export')
+    render.set_defaults(handler=cmd_render)
+
+    run = commands.add_parser('run', help='fetch, screen and render in one process')
+    add_source(run)
+    add_nav_store(run, incremental=True)
+    run.add_argument('--benchmarks', action='store_true', help='load benchmark index levels from Yahoo Finance')
+    run.add_argument('--refresh', action='store_true',
+                     help='screen and render even when a cached run had the same inputs')
+    run.set_defaults(handler=cmd_run)
+
+    serve = commands.add_parser('serve', help='serve the report and a query API over the screened funds')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8000)
+    serve.add_argument('--directory', default='.', help='directory holding index.html')
+    serve.add_argument('--data', metavar='FILE', help='analysis data export to query; the configured export by default')
+    serve.add_argument('--reload-seconds', type=float, help='poll the export for new runs this often; 0 disables')
+    serve.set_defaults(handler=cmd_serve)
+
+    backtest = commands.add_parser('backtest', help='replay the screener on past rebalance dates of a NAV store')
+    backtest.add_argument('--nav-store', metavar='DIR', required=True, help='NAV history store to replay')
+    backtest.add_argument('--frequency', choices=['weekly', 'monthly'], default='weekly')
+    backtest.add_argument('--output', metavar='FILE', help='also write the bucket statistics as JSON')
+    backtest.set_defaults(handler=cmd_backtest)
+
+    correlate = commands.add_parser('correlate', help='pairwise daily-return correlation of every stored scheme')
+    correlate.add_argument('--nav-store', metavar='DIR', required=True, help='NAV history store to correlate')
+    correlate.add_argument('--threshold', type=float, help='list pairs at or above this correlation')
+    correlate.add_argument('--top', type=int, default=20, help='pairs to print, strongest first')
+    correlate.add_argument('--max-memory-mb', type=int, help='memory cap for returns plus correlation blocks')
+    correlate.add_argument('--output', metavar='FILE', help='also write the full float32 matrix as .npy')
+    correlate.set_defaults(handler=cmd_correlate)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -16,6 +16,24 @@ SCORING_WEIGHTS = {
     "fund_quality": 20,          # Weight for AUM and expense ratio
 }
 
+# Momentum Scoring Rules, compiled once into vectorized NumPy expressions
+# Each rule awards the points of the first matching band (operator, threshold, points)
+# on one field, or "otherwise" when no band matches; points of a factor may not exceed
+# its SCORING_WEIGHTS entry, and the total score is capped at the sum of the weights.
+# Fields are fund columns plus drawdown_from_high / recovery_potential_pct (unrounded).
+SCORING_RULES = [
+    {"factor": "beaten_down_factor", "field": "1y_return",
+     "bands": [["<", -5, 30], ["<", 0, 20]], "otherwise": 0},
+    {"factor": "historical_performance", "field": "5y_return",
+     "bands": [[">", 15, 25], [">", 10, 15]], "otherwise": 0},
+    {"factor": "current_positioning", "field": "recovery_potential_pct",
+     "bands": [[">", 70, 10], ["<", 30, 25]], "otherwise": 15},
+    {"factor": "fund_quality", "field": "aum_cr",
+     "bands": [[">", 10000, 10]], "otherwise": 0},
+    {"factor": "fund_quality", "field": "expense_ratio",
+     "bands": [["<", 1.5, 10]], "otherwise": 0},
+]
+
 # Recommendation Thresholds
 RECOMMENDATION_THRESHOLDS = {
     "strong_buy": 80,    # Score >= 80
@@ -24,23 +42,137 @@ RECOMMENDATION_THRESHOLDS = {
     "avoid": 0,          # Score < 50
 }
 
+RECOMMENDATION_LABELS = {
+    "strong_buy": "Strong Buy",
+    "buy": "Buy",
+    "hold": "Hold",
+    "avoid": "Avoid",
+}
+
+# Beaten-down level bands on the 1Y return, same (operator, threshold, label) format
+BEATEN_DOWN_LEVELS = {
+    "field": "1y_return",
+    "bands": [["<", -10, "High"], ["<", -5, "Medium"]],
+    "otherwise": "Low",
+}
+
 # Market Data Sources (for future API integration)
 DATA_SOURCES = {
     "mutual_funds": {
         "primary": "AMFI",
         "backup": "MorningStar",
-        "api_endpoint": "https://www.amfiindia.com/spages/NAVAll.txt"
+        "api_endpoint": "https://www.amfiindia.com/spages/NAVAll.txt",
+        "deadline_seconds": 60      # Per-source deadline for the concurrent fetch stage
     },
     "market_data": {
         "nifty": "NSE",
-        "api_endpoint": "https://www.nseindia.com/api/equity-stockIndices?index=NIFTY%2050"
+        "api_endpoint": "https://www.nseindia.com/api/equity-stockIndices?index=NIFTY%2050",
+        "deadline_seconds": 20
     },
     "news": {
         "primary": "Economic Times",
-        "backup": "Reuters"
+        "backup": "Reuters",
+        "deadline_seconds": 20
     }
 }
 
+# Joining secondary sources (factsheets, expense ratios) onto AMFI schemes by name
+NAME_MATCHING_CONFIG = {
+    "min_score": 0.7,                           # Trigram Jaccard similarity needed to accept a match
+    "fields": ["aum_cr", "expense_ratio", "fund_manager"],  # Copied from the matched record
+    "plan_fields": ["expense_ratio"],           # Differ between Direct and Regular plans of a scheme
+    "cache_file": ".cache/scheme_names.json",  # Matches persisted across runs
+}
+
+# Market news: RSS/Atom/HTML feeds parsed as streams, deduplicated and tagged with categories and AMCs
+NEWS_CONFIG = {
+    "feeds": [],                  # Feed URLs or paths; `cli.py run --news-feed URL` adds more
+    "max_items": 10,              # Newest unique items shown in the report
+    "summary_chars": 280,
+    "seen_max_entries": 50000,    # Content hashes remembered for deduplication
+    "categories": {
+        "Small Cap": ["smallcap", "small caps", "small-cap"],
+        "Mid Cap": ["midcap", "mid caps", "mid-cap"],
+        "Large Cap": ["largecap", "large caps", "large-cap", "bluechip"],
+        "Flexi Cap": ["flexicap", "flexi-cap"],
+        "ELSS": ["tax saver", "tax saving fund"],
+        "Large & Mid Cap": ["large and mid cap", "large and midcap"],
+    },
+    "amcs": ["SBI", "HDFC", "ICICI Prudential", "Axis", "Nippon India", "Kotak", "Tata", "Aditya Birla Sun Life",
+             "Mirae Asset", "Parag Parikh", "DSP", "UTI", "Motilal Oswal", "Franklin Templeton", "Quant",
+             "Canara Robeco", "Edelweiss", "Invesco", "Bandhan", "Mahindra Manulife"],
+    "impact": {
+        "Positive": ["rally", "rallies", "gain", "gains", "surge", "surges", "rebound", "recovery", "inflows",
+                     "record high", "rate cut", "upgrade", "beats estimates", "boost", "boosts"],
+        "Negative": ["fall", "falls", "slump", "selloff", "sell off", "plunge", "plunges", "decline", "declines",
+                     "outflows", "crash", "rate hike", "downgrade", "misses estimates", "losses"],
+    },
+}
+
+# Analysis data export (json, json-compact, ndjson, ndjson-gzip, npz, parquet)
+EXPORT_CONFIG = {
+    "format": "json-compact",            # Compact JSON keeps the committed file small
+    "base_path": "fund_analysis_data",   # Extension is added per format
+}
+
+# Benchmark indices loaded from Yahoo Finance in one batched download
+BENCHMARK_CONFIG = {
+    "indices": {
+        "nifty_50": "^NSEI",
+        "nifty_500": "^CRSLDX",
+        "nifty_midcap_100": "NIFTY_MIDCAP_100.NS",
+        "nifty_smallcap_100": "^CNXSC",
+    },
+    "cache_file": ".cache/benchmarks.npz",
+    "history_years": 10,
+}
+
+# Shared HTTP layer: pooled session plus on-disk conditional-GET cache
+HTTP_CACHE_CONFIG = {
+    "cache_dir": ".cache/http",
+    "max_bytes": 200 * 1024 * 1024,  # Evict least recently used responses beyond this
+    "max_age_days": 7,               # Drop responses not revalidated for this long
+    "pool_size": 10,                 # Connections kept alive per host
+}
+
+# Indicator computation over the NAV history store
+INDICATOR_CONFIG = {
+    "workers": 1,                     # Worker processes; 0 = one per CPU, 1 = in-process
+    "min_schemes_per_worker": 5000,   # Smaller universes use fewer workers
+}
+
+# Per-stage timing and memory instrumentation (off by default; near-zero cost when off)
+INSTRUMENTATION_CONFIG = {
+    "enabled": False,
+    "trace_memory": True,               # tracemalloc peak per stage; slows allocation-heavy stages
+    "metrics_file": "run_metrics.json", # Stage records written here after an instrumented run
+    "report_footer": True,              # Show a run stats block in the report footer
+}
+
+# Finished runs keyed by a hash of their inputs, config and code; unchanged inputs reuse the outputs
+RESULT_CACHE_CONFIG = {
+    "enabled": True,
+    "cache_dir": ".cache/results",
+    "max_entries": 10,                  # Least recently used runs beyond this are dropped
+}
+
+# Pairwise daily-return correlation across schemes, used to flag near-duplicate picks
+CORRELATION_CONFIG = {
+    "enabled": True,                    # Flag redundant screened funds when a NAV store is available
+    "lookback_days": 250,               # Trailing trading days of returns correlated
+    "min_observations": 120,            # Schemes with fewer returns in the window are left out
+    "threshold": 0.95,                  # A pick this correlated with a better-ranked pick is redundant
+    "max_memory_mb": 512,               # Cap on returns plus correlation blocks held at once
+}
+
+# `cli.py serve` query API over the exported analysis data
+QUERY_SERVER_CONFIG = {
+    "aum_buckets_cr": [1000, 5000, 20000, 50000],  # AUM bucket edges in crores
+    "page_size": 25,
+    "max_page_size": 500,
+    "reload_seconds": 2.0,              # Poll the export for a new run this often; 0 disables
+}
+
 # HTML Report Styling
 REPORT_CONFIG = {
     "title": "Indian Mutual Fund Recovery Screener",
@@ -51,5 +183,9 @@ REPORT_CONFIG = {
         "success": "#28a745",
         "danger": "#dc3545",
         "warning": "#ffc107"
-    }
+    },
+    "sharded": False,        # Write a small index plus lazily loaded per-category JSON shards
+    "shard_dir": "shards",   # Shard directory, relative to index.html
+    "shard_size": 500,       # Funds per JSON shard
+    "top_n": 50,             # Funds embedded inline in the sharded index page
 }
@@ -0,0 +1,72 @@
+"""
+Shared pytest fixtures
+stand_in starts localhost HTTP servers that play AMFI, NSE or a news site, so fetch
+code runs against real sockets without touching the network
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+
+import pytest
+
+
+class StandIn:
+    """Localhost server answering every GET with one canned response; records every request
+
+    body, delay, status, etag and last_modified may be changed between requests. With
+    an etag, a request whose If-None-Match matches it gets a bodiless 304.
+    """
+
+    def __init__(self, body, delay=0.0, status=200, etag=None, last_modified=None):
+        self.body = body
+        self.delay = delay
+        self.status = status
+        self.etag = etag
+        self.last_modified = last_modified
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests.append(dict(self.headers))
+                time.sleep(stand_in.delay)
+                if stand_in.etag is not None and self.headers.get('If-None-Match') == stand_in.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                payload = stand_in.body.encode('utf-8')
+                self.send_response(stand_in.status)
+                if stand_in.etag is not None:
+                    self.send_header('ETag', stand_in.etag)
+                if stand_in.last_modified is not None:
+                    self.send_header('Last-Modified', stand_in.last_modified)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/'
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    """Factory of StandIn servers (same arguments); all are shut down after the test"""
+    servers = []
+
+    def start(body, **options):
+        servers.append(StandIn(body, **options))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
@@ -0,0 +1,192 @@
+"""
+Return correlation across schemes
+Standardizes each scheme's trailing daily returns into a float32 row, so the Pearson
+correlation of two schemes is the dot product of their rows. The (schemes, schemes)
+matrix is then produced a block of rows at a time with one matrix multiply per block,
+sized so the working set stays under CORRELATION_CONFIG["max_memory_mb"] however many
+schemes there are; the full matrix is only ever streamed to disk, never held. Screened
+picks that move almost identically to a better-ranked pick are flagged as redundant.
+"""
+
+import heapq
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+from config import CORRELATION_CONFIG
+
+# Rows of NAV history read and standardized at a time; a few MB of float64 scratch
+CHUNK_ROWS = 1024
+FLOAT32 = np.dtype(np.float32).itemsize
+# Share of the memory cap left for row masks, hit indices and the pairs found
+HEADROOM = 1 / 16
+
+
+def standardized_returns(navs, rows, end, days=None, min_observations=None):
+    """(z, usable) for the given rows (all rows when None) of a (schemes, days) NAV matrix as of day index end
+
+    z is float32 with shape (len(rows), days): each row's daily returns over the
+    trailing window, centered and scaled to unit norm, with days lacking a return set
+    to the row's mean (zero after centering). usable is False for rows with fewer than
+    min_observations returns or no variation; their z rows are zero.
+    """
+    days = CORRELATION_CONFIG['lookback_days'] if days is None else days
+    min_observations = CORRELATION_CONFIG['min_observations'] if min_observations is None else min_observations
+    rows = np.arange(len(navs)) if rows is None else np.asarray(rows, dtype=np.intp)
+    start = max(0, end - days)
+    z = np.zeros((len(rows), end - start), dtype=np.float32)
+    usable = np.zeros(len(rows), dtype=bool)
+
+    for block in range(0, len(rows), CHUNK_ROWS):
+        window = np.asarray(navs[rows[block:block + CHUNK_ROWS], start:end + 1], dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = window[:, 1:] / window[:, :-1] - 1
+        present = np.isfinite(returns)
+        counts = present.sum(axis=1)
+        returns = np.where(present, returns, 0.0)
+        with np.errstate(invalid='ignore'):
+            returns -= (returns.sum(axis=1) / counts)[:, None]
+        returns[~present] = 0.0
+        norms = np.sqrt(np.einsum('ij,ij->i', returns, returns))
+        ok = (counts >= min_observations) & (norms > 0)
+        returns[ok] /= norms[ok, None]
+        returns[~ok] = 0.0
+
+        positions = slice(block, block + len(window))
+        z[positions] = returns
+        usable[positions] = ok
+    return z, usable
+
+
+def block_rows(count, days, max_bytes=None):
+    """Rows per correlation block so z, one block and its boolean mask fit in max_bytes"""
+    max_bytes = CORRELATION_CONFIG['max_memory_mb'] * 2 ** 20 if max_bytes is None else max_bytes
+    fixed = count * days * FLOAT32
+    per_row = count * (FLOAT32 + 1)
+    rows = (int(max_bytes * (1 - HEADROOM)) - fixed) // per_row
+    if rows < 1:
+        raise ValueError(f"{count} x {days} returns need more than the {max_bytes / 2 ** 20:.0f} MiB "
+                         f"correlation memory cap")
+    return int(min(rows, count))
+
+
+def iter_blocks(z, usable, max_bytes=None, upper=False, lower=False):
+    """Yield (start, stop, block) with block = corr[start:stop, first:last] as float32
+
+    first is 0, or start when upper is True (the diagonal block onward, which is all a
+    symmetric scan needs); last is len(z), or stop when lower is True (everything up to
+    the diagonal block, which is all a scan in rank order needs). Pairs involving
+    unusable rows are NaN. Every block is written into one reused buffer, so it is only
+    valid until the next is yielded.
+    """
+    step = block_rows(len(z), z.shape[1], max_bytes)
+    buffer = np.empty(step * len(z), dtype=np.float32)
+    for start in range(0, len(z), step):
+        stop = min(start + step, len(z))
+        first = start if upper else 0
+        last = stop if lower else len(z)
+        block = buffer[:(stop - start) * (last - first)].reshape(stop - start, last - first)
+        np.matmul(z[start:stop], z[first:last].T, out=block)
+        np.clip(block, -1.0, 1.0, out=block)
+        block[~usable[start:stop]] = np.nan
+        block[:, ~usable[first:last]] = np.nan
+        yield start, stop, block
+
+
+def write_matrix(path, z, usable, max_bytes=None):
+    """Stream the full correlation matrix to a float32 .npy file, one block of rows at a time
+
+    Blocks are written with plain file writes, so no page of the matrix stays mapped;
+    open the result with np.load(path, mmap_mode='r').
+    """
+    header = {'descr': npy_format.dtype_to_descr(np.dtype(np.float32)), 'fortran_order': False,
+              'shape': (len(z), len(z))}
+    with open(path, 'wb') as f:
+        npy_format.write_array_header_2_0(f, header)
+        for _, _, block in iter_blocks(z, usable, max_bytes):
+            block.tofile(f)
+    return path
+
+
+def iter_pairs(z, usable, threshold=None, max_bytes=None):
+    """Yield (i, columns, correlations) for every row i: the columns j > i at or above threshold"""
+    threshold = CORRELATION_CONFIG['threshold'] if threshold is None else threshold
+    for start, stop, block in iter_blocks(z, usable, max_bytes, upper=True):
+        for row in range(stop - start):
+            # Strict upper triangle only: the columns after this row's diagonal
+            values = block[row, row + 1:]
+            with np.errstate(invalid='ignore'):
+                columns = np.flatnonzero(values >= threshold)
+            if len(columns):
+                yield start + row, columns + start + row + 1, values[columns]
+
+
+def correlated_pairs(z, usable, threshold=None, max_bytes=None, top=None):
+    """(count, pairs): how many pairs i < j reach threshold, and the top strongest as (i, j, correlation)
+
+    Pairs are strongest first. Only the top pairs are held in a min-heap while the
+    matrix is scanned, so memory does not grow with the number found; top=None keeps
+    every pair.
+    """
+    count = 0
+    heap = []
+    for row, columns, values in iter_pairs(z, usable, threshold, max_bytes):
+        count += len(columns)
+        if top is not None and 0 < top < len(values):
+            keep = np.argpartition(values, len(values) - top)[len(values) - top:]
+            columns, values = columns[keep], values[keep]
+        for column, value in zip(columns.tolist(), values.tolist()):
+            if top is None or len(heap) < top:
+                heapq.heappush(heap, (value, row, column))
+            elif top and value > heap[0][0]:
+                heapq.heapreplace(heap, (value, row, column))
+    heap.sort(key=lambda item: (-item[0], item[1], item[2]))
+    return count, [(i, j, value) for value, i, j in heap]
+
+
+def redundant_picks(z, usable, threshold=None, max_bytes=None):
+    """(pick, correlation) per row of z, with rows in rank order (best first)
+
+    A row is redundant when its correlation with a better-ranked row that is not itself
+    redundant reaches threshold; pick is the best-ranked such row, -1 otherwise.
+    """
+    threshold = CORRELATION_CONFIG['threshold'] if threshold is None else threshold
+    pick = np.full(len(z), -1, dtype=np.intp)
+    strength = np.full(len(z), np.nan)
+    kept = np.zeros(len(z), dtype=bool)
+    for start, stop, block in iter_blocks(z, usable, max_bytes, lower=True):
+        with np.errstate(invalid='ignore'):
+            close = block >= threshold
+        # Rows depend on which earlier rows were kept, so this runs in rank order
+        for row in range(start, stop):
+            hits = np.flatnonzero(close[row - start, :row] & kept[:row])
+            if len(hits):
+                pick[row] = hits[0]
+                strength[row] = block[row - start, hits[0]]
+            else:
+                kept[row] = usable[row]
+    return pick, strength
+
+
+def flag_redundant(funds, store, as_of=None, threshold=None, max_bytes=None):
+    """Set redundant_with and redundant_correlation on ranked screened funds in place
+
+    redundant_with names the better-ranked pick a fund's daily returns track at or
+    above threshold; both fields are None for distinct funds and funds without history.
+    """
+    rows = np.array([store.rows.get(str(fund['fund_code']), -1) for fund in funds], dtype=np.intp)
+    known = np.flatnonzero(rows >= 0)
+    pick = np.full(len(funds), -1, dtype=np.intp)
+    strength = np.full(len(funds), np.nan)
+    end = store.day_index(as_of)
+    if len(known) and end > 0:
+        z, usable = standardized_returns(store.navs, rows[known], end)
+        known_pick, known_strength = redundant_picks(z, usable, threshold, max_bytes)
+        redundant = known_pick >= 0
+        pick[known[redundant]] = known[known_pick[redundant]]
+        strength[known[redundant]] = known_strength[redundant]
+
+    for fund, other, value in zip(funds, pick.tolist(), strength.tolist()):
+        fund['redundant_with'] = funds[other]['fund_name'] if other >= 0 else None
+        fund['redundant_correlation'] = round(value, 3) if other >= 0 else None
+    return int((pick >= 0).sum())
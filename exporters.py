@@ -0,0 +1,266 @@
+"""
+Pluggable exporters for the screener's analysis data
+Writes the screened funds plus run metadata as pretty or compact JSON, streaming
+NDJSON (optionally gzipped), or a columnar binary file (Parquet when pyarrow is
+installed, NumPy .npz otherwise) that supports reading single columns
+"""
+
+from collections import OrderedDict
+import gzip
+import json
+import os
+import time
+
+import numpy as np
+
+from config import EXPORT_CONFIG
+import fund_records
+
+META_COLUMN = '__meta__'
+# Suffix of the boolean array marking a column's None values in an .npz archive
+NULL_MASK = '__null__'
+
+
+def _json_default(value):
+    """Serialize fund records and NumPy scalars that slip into fund dicts"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return fund_records.json_default(value)
+
+
+def write_json(path, funds, meta):
+    """Legacy pretty-printed JSON document"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'screened_funds': list(funds), **meta}, f, indent=2, default=_json_default)
+
+
+def write_json_compact(path, funds, meta):
+    """Compact JSON document, written fund by fund without building the whole dict"""
+    dumps = json.JSONEncoder(separators=(',', ':'), default=_json_default).encode
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"screened_funds":[')
+        for i, text in enumerate(fund_records.encode_json(funds, dumps)):
+            if i:
+                f.write(',')
+            f.write(text)
+        f.write(']')
+        for key, value in meta.items():
+            f.write(f',{dumps(key)}:{dumps(value)}')
+        f.write('}')
+
+
+def _write_ndjson_lines(f, funds, meta):
+    dumps = json.JSONEncoder(separators=(',', ':'), default=_json_default).encode
+    f.write(dumps({META_COLUMN: meta}) + '\n')
+    for text in fund_records.encode_json(funds, dumps):
+        f.write(text + '\n')
+
+
+def write_ndjson(path, funds, meta):
+    """One JSON object per line: a metadata line first, then one line per fund"""
+    with open(path, 'w', encoding='utf-8') as f:
+        _write_ndjson_lines(f, funds, meta)
+
+
+def write_ndjson_gzip(path, funds, meta):
+    """Gzip-compressed NDJSON"""
+    with gzip.open(path, 'wt', encoding='utf-8', compresslevel=6) as f:
+        _write_ndjson_lines(f, funds, meta)
+
+
+def _columns(funds):
+    """Fund dicts to ordered column lists; keys missing from a fund become None"""
+    funds = list(funds)
+    names = OrderedDict()
+    for fund in funds:
+        for key in fund:
+            names[key] = None
+    return OrderedDict((name, [fund.get(name) for fund in funds]) for name in names)
+
+
+def write_npz(path, funds, meta):
+    """Columnar NumPy archive: one array per field, plus the metadata as a JSON string
+
+    Numeric columns are float64 (or int64 when complete) with NaN for missing values;
+    text columns are unicode arrays with '' for missing values. A column with missing
+    values also gets a boolean '<name>__null__' mask, so reading restores them as None.
+    """
+    arrays = {}
+    for name, values in _columns(funds).items():
+        present = [value for value in values if value is not None]
+        if len(present) < len(values):
+            arrays[name + NULL_MASK] = np.array([value is None for value in values])
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+            if len(present) == len(values) and all(isinstance(value, int) for value in present):
+                arrays[name] = np.array(values, dtype=np.int64)
+            else:
+                arrays[name] = np.array(values, dtype=np.float64)
+        else:
+            arrays[name] = np.array(['' if value is None else str(value) for value in values])
+    arrays[META_COLUMN] = np.array(json.dumps(meta, default=_json_default))
+
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+
+
+def write_parquet(path, funds, meta):
+    """Parquet table of funds with the metadata stored in the schema metadata"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pydict(dict(_columns(funds)))
+    table = table.replace_schema_metadata({META_COLUMN: json.dumps(meta, default=_json_default)})
+    pq.write_table(table, path, compression='zstd')
+
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    funds = data.pop('screened_funds')
+    return funds, data
+
+
+def _open_ndjson(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def read_ndjson(path):
+    with _open_ndjson(path) as f:
+        meta = json.loads(next(f))[META_COLUMN]
+        return [json.loads(line) for line in f], meta
+
+
+def _npz_column(archive, name):
+    """One column of an .npz archive as a list, with masked values restored to None"""
+    values = archive[name].tolist()
+    if name + NULL_MASK in archive.files:
+        for i in np.flatnonzero(archive[name + NULL_MASK]).tolist():
+            values[i] = None
+    return values
+
+
+def read_npz(path):
+    with np.load(path) as archive:
+        meta = json.loads(str(archive[META_COLUMN]))
+        columns = {name: _npz_column(archive, name) for name in archive.files
+                   if name != META_COLUMN and not name.endswith(NULL_MASK)}
+    count = len(next(iter(columns.values()))) if columns else 0
+    funds = [{name: values[i] for name, values in columns.items()} for i in range(count)]
+    return funds, meta
+
+
+def read_parquet(path):
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path)
+    meta = json.loads(table.schema.metadata[META_COLUMN.encode()])
+    return table.to_pylist(), meta
+
+
+def read_column_json(path, column):
+    funds, _ = read_json(path)
+    return [fund.get(column) for fund in funds]
+
+
+def read_column_ndjson(path, column):
+    """Stream the file line by line, keeping only one field per fund"""
+    with _open_ndjson(path) as f:
+        next(f)
+        return [json.loads(line).get(column) for line in f]
+
+
+def read_column_npz(path, column):
+    """Decompress only the requested column's array (and its null mask) from the archive"""
+    with np.load(path) as archive:
+        return _npz_column(archive, column)
+
+
+def read_column_parquet(path, column):
+    import pyarrow.parquet as pq
+
+    return pq.read_table(path, columns=[column]).column(column).to_pylist()
+
+
+def _pyarrow_available():
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# name -> (file extension, writer, reader, single-column reader, availability check)
+FORMATS = OrderedDict([
+    ('json', ('.json', write_json, read_json, read_column_json, None)),
+    ('json-compact', ('.json', write_json_compact, read_json, read_column_json, None)),
+    ('ndjson', ('.ndjson', write_ndjson, read_ndjson, read_column_ndjson, None)),
+    ('ndjson-gzip', ('.ndjson.gz', write_ndjson_gzip, read_ndjson, read_column_ndjson, None)),
+    ('npz', ('.npz', write_npz, read_npz, read_column_npz, None)),
+    ('parquet', ('.parquet', write_parquet, read_parquet, read_column_parquet, _pyarrow_available)),
+])
+
+
+def available_formats():
+    """Formats whose optional dependencies are installed"""
+    return [name for name, spec in FORMATS.items() if spec[4] is None or spec[4]()]
+
+
+def output_path(fmt, base_path=None):
+    """File name for a format, e.g. fund_analysis_data.ndjson.gz"""
+    base_path = base_path or EXPORT_CONFIG['base_path']
+    return base_path + FORMATS[fmt][0]
+
+
+def export(funds, meta, fmt=None, base_path=None):
+    """Write the analysis data in one format and return the file path"""
+    fmt = fmt or EXPORT_CONFIG['format']
+    if fmt not in available_formats():
+        raise ValueError(f"Export format '{fmt}' is not available; choose from {', '.join(available_formats())}")
+    path = output_path(fmt, base_path)
+    # Write beside the target and rename over it, so readers never see a partial file
+    root, ext = os.path.splitext(path)
+    tmp_path = f'{root}.tmp{ext}'
+    try:
+        FORMATS[fmt][1](tmp_path, funds, meta)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def load(path, fmt):
+    """Read back (funds, meta) from an exported file"""
+    return FORMATS[fmt][2](path)
+
+
+def read_column(path, fmt, column):
+    """Read a single fund field from an exported file"""
+    return FORMATS[fmt][3](path, column)
+
+
+def compare_formats(funds, meta, directory, column='momentum_score'):
+    """Size and serialize/deserialize/single-column timings for every available format"""
+    funds = list(funds)
+    results = []
+    for fmt in available_formats():
+        base_path = os.path.join(directory, f'export_{fmt}')
+
+        start = time.perf_counter()
+        path = export(funds, meta, fmt, base_path)
+        write_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        load(path, fmt)
+        read_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        read_column(path, fmt, column)
+        column_seconds = time.perf_counter() - start
+
+        results.append({'format': fmt, 'bytes': os.path.getsize(path), 'write_seconds': write_seconds,
+                        'read_seconds': read_seconds, 'column_read_seconds': column_seconds})
+    return results
@@ -0,0 +1,238 @@
+"""
+Compact screened-fund records
+A FundRecord holds its values in one list and shares an interned key layout with
+every record of the same shape, instead of each result carrying its own dict of
+repeated string keys. Records behave like the fund dicts they replace (item access,
+get, iteration in key order, equality with dicts) and convert back losslessly.
+"""
+
+from collections.abc import MutableMapping
+from functools import lru_cache
+import gc
+from json.encoder import encode_basestring_ascii
+import sys
+
+# Text fields drawn from a small set of values; one shared string object each
+CATEGORICAL_FIELDS = ('category', 'amc', 'fund_manager', 'beaten_down_level', 'recommendation')
+
+# Consecutive records of one layout that encode_json encodes a column at a time
+JSON_BATCH = 32
+# Types whose JSON text never holds a comma, so one encoded list of them splits cleanly
+JSON_SCALARS = {int, float, bool, type(None)}
+
+
+@lru_cache(maxsize=256)
+def layout(keys):
+    """Interned {key: position} for a tuple of keys; records of one shape share it"""
+    return {key: position for position, key in enumerate(keys)}
+
+
+def _intern(key, value):
+    if key in CATEGORICAL_FIELDS and type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+class FundRecord(MutableMapping):
+    """A fund's fields and computed metrics in key order, backed by a shared layout"""
+
+    __slots__ = ('_layout', '_values')
+
+    def __init__(self, keys, values):
+        self._layout = layout(tuple(keys))
+        self._values = [_intern(key, value) for key, value in zip(self._layout, values)]
+
+    @classmethod
+    def from_dict(cls, fund):
+        return cls(fund.keys(), fund.values())
+
+    def __getitem__(self, key):
+        return self._values[self._layout[key]]
+
+    def get(self, key, default=None):
+        try:
+            return self._values[self._layout[key]]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in self._layout
+
+    def __setitem__(self, key, value):
+        position = self._layout.get(key)
+        if position is None:
+            self._layout = layout(tuple(self._layout) + (key,))
+            self._values.append(_intern(key, value))
+        else:
+            self._values[position] = _intern(key, value)
+
+    def __delitem__(self, key):
+        position = self._layout[key]
+        self._layout = layout(tuple(k for k in self._layout if k != key))
+        del self._values[position]
+
+    def __iter__(self):
+        return iter(self._layout)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __eq__(self, other):
+        if isinstance(other, FundRecord):
+            other = other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'FundRecord({self.to_dict()!r})'
+
+    def __reduce__(self):
+        return FundRecord, (tuple(self._layout), self._values)
+
+    def to_dict(self):
+        """The equivalent fund dict, keys in the same order"""
+        return dict(zip(self._layout, self._values))
+
+
+def merge(funds, indices, columns):
+    """Records for funds[i], i in indices, with columns set on top, as {**fund, **computed} would give
+
+    columns is a list of (name, values) with values aligned with indices. Funds of
+    the same shape share one layout; their values are referenced, not copied, and
+    categorical computed labels are interned.
+    """
+    # Records hold no reference cycles; pausing the cyclic GC keeps it from rescanning
+    # every record built so far while a large batch is allocated
+    paused = gc.isenabled()
+    gc.disable()
+    try:
+        return _merge(funds, indices, columns)
+    finally:
+        if paused:
+            gc.enable()
+
+
+def _merge(funds, indices, columns):
+    names = tuple(name for name, _ in columns)
+    rows = list(zip(*[[sys.intern(value) if type(value) is str else value for value in values]
+                      if name in CATEGORICAL_FIELDS else values
+                      for name, values in columns]))
+    shapes = {}
+    keys = shape = None
+    records = []
+    for position, fund_index in enumerate(indices):
+        fund = funds[fund_index]
+        # Consecutive funds nearly always share a shape; comparing key tuples is cheaper than hashing them
+        fund_keys = tuple(fund)
+        if fund_keys != keys:
+            keys = fund_keys
+            shape = shapes.get(keys)
+            if shape is None:
+                merged = layout(tuple(dict.fromkeys(keys + names)))
+                slots = [merged[name] for name in names]
+                # Computed fields new to the fund are simply appended
+                appended = slots == list(range(len(keys), len(merged)))
+                shape = shapes[keys] = (merged, None if appended else slots)
+        merged, slots = shape
+
+        if slots is None:
+            values = [*fund.values(), *rows[position]]
+        else:
+            values = list(fund.values())
+            values.extend([None] * (len(merged) - len(values)))
+            for slot, value in zip(slots, rows[position]):
+                values[slot] = value
+
+        record = FundRecord.__new__(FundRecord)
+        record._layout = merged
+        record._values = values
+        records.append(record)
+    return records
+
+
+def _getter(keys, names):
+    """Function from the values of a layout to a list of the values of names, None where absent"""
+    positions = layout(keys)
+    picked = [positions.get(name) for name in names]
+    if None not in picked:
+        return lambda values: list(map(values.__getitem__, picked))
+    return lambda values: [None if position is None else values[position] for position in picked]
+
+
+def pick(funds, names):
+    """Yield a list of the values of names for each record or dict, None where a field is absent
+
+    Records are read straight from their values list, with one getter per layout
+    instead of a key lookup per field.
+    """
+    names = tuple(names)
+    getters = {}
+    for fund in funds:
+        if isinstance(fund, FundRecord):
+            getter = getters.get(id(fund._layout))
+            if getter is None:
+                getter = getters[id(fund._layout)] = _getter(tuple(fund._layout), names)
+            yield getter(fund._values)
+        else:
+            yield list(map(fund.get, names))
+
+
+@lru_cache(maxsize=256)
+def _json_template(keys):
+    """'{"key":%s,...}' for a layout, filled with one record's encoded values"""
+    return '{' + ','.join(encode_basestring_ascii(key).replace('%', '%%') + ':%s' for key in keys) + '}'
+
+
+def _json_column(values, dumps):
+    """JSON text of each value in a column, in as few encoder calls as the value types allow"""
+    kinds = set(map(type, values))
+    if kinds == {str}:
+        return list(map(encode_basestring_ascii, values))
+    if kinds <= JSON_SCALARS:
+        return dumps(values)[1:-1].split(',')
+    return list(map(dumps, values))
+
+
+def encode_json(funds, dumps):
+    """Yield the compact JSON object text of each record or dict, in order
+
+    Records are encoded from their layout and values, never through a dict: up to
+    JSON_BATCH consecutive records of one layout are encoded a column at a time and
+    poured into the layout's template. The text equals dumps(record.to_dict());
+    anything else goes through dumps.
+    """
+    batch = []
+    for fund in funds:
+        if batch and (not isinstance(fund, FundRecord) or fund._layout is not batch[0]._layout
+                      or len(batch) == JSON_BATCH):
+            yield from _encode_batch(batch, dumps)
+            batch = []
+        if isinstance(fund, FundRecord):
+            batch.append(fund)
+        else:
+            yield dumps(fund)
+    yield from _encode_batch(batch, dumps)
+
+
+def _encode_batch(records, dumps):
+    if not records:
+        return
+    template = _json_template(tuple(records[0]._layout))
+    columns = [_json_column(list(column), dumps) for column in zip(*[record._values for record in records])]
+    for row in zip(*columns):
+        yield template % row
+
+
+def to_dicts(records):
+    """Plain dicts for JSON or other code that needs real dicts"""
+    return [record.to_dict() if isinstance(record, FundRecord) else record for record in records]
+
+
+def json_default(value):
+    """json `default` hook that writes FundRecords as the objects they stand for"""
+    if isinstance(value, FundRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
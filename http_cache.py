@@ -0,0 +1,225 @@
+"""
+Shared HTTP layer for the Indian Mutual Fund Screener
+Pooled requests.Session plus an on-disk response cache that revalidates with
+ETag/Last-Modified and evicts by size and age
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import HTTP_CACHE_CONFIG
+
+
+class CachedResponse:
+    """A response body stored on disk; not_modified is True when the server answered 304"""
+
+    def __init__(self, url, status_code, path, not_modified, headers):
+        self.url = url
+        self.status_code = status_code
+        self.path = path
+        self.not_modified = not_modified
+        self.headers = headers
+
+    def open(self):
+        """Open the cached body as a binary file"""
+        return open(self.path, 'rb')
+
+    def iter_lines(self):
+        """Stream the cached body as decoded text lines"""
+        with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+            yield from f
+
+    @property
+    def text(self):
+        with open(self.path, 'rb') as f:
+            return f.read().decode('utf-8', errors='replace')
+
+
+class HttpCache:
+    """Conditional-GET cache shared by every data source"""
+
+    def __init__(self, cache_dir=None, max_bytes=None, max_age_seconds=None, pool_size=None, session=None):
+        self.cache_dir = cache_dir or HTTP_CACHE_CONFIG['cache_dir']
+        self.max_bytes = max_bytes if max_bytes is not None else HTTP_CACHE_CONFIG['max_bytes']
+        self.max_age_seconds = (max_age_seconds if max_age_seconds is not None
+                                else HTTP_CACHE_CONFIG['max_age_days'] * 86400)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        if session is None:
+            pool_size = pool_size or HTTP_CACHE_CONFIG['pool_size']
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.body', base + '.meta.json'
+
+    def _artifact_path(self, url, name):
+        body_path, _ = self._paths(url)
+        return body_path[:-len('.body')] + f'.artifact.{name}.json'
+
+    def _load_meta(self, url):
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(body_path) or meta.get('url') != url:
+            return None
+        if time.time() - meta['validated_at'] > self.max_age_seconds:
+            self._remove(url)
+            return None
+        return meta
+
+    def _write_meta(self, url, meta):
+        _, meta_path = self._paths(url)
+        _atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def _remove(self, url):
+        body_path, meta_path = self._paths(url)
+        artifact_prefix = os.path.basename(body_path)[:-len('.body')] + '.artifact.'
+        paths = [body_path, meta_path] + [
+            os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+            if name.startswith(artifact_prefix)
+        ]
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+        self.stats['evictions'] += 1
+
+    def get(self, url, timeout=30, chunk_size=64 * 1024):
+        """GET a URL, revalidating any cached copy; the body is streamed straight to disk"""
+        body_path, _ = self._paths(url)
+        meta = self._load_meta(url)
+
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        with self.session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304 and meta is not None:
+                self.stats['hits'] += 1
+                meta['validated_at'] = meta['accessed_at'] = time.time()
+                self._write_meta(url, meta)
+                return CachedResponse(url, 304, body_path, True, dict(response.headers))
+
+            response.raise_for_status()
+            self.stats['misses'] += 1
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.part')
+            size = 0
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, body_path)
+
+            now = time.time()
+            self._write_meta(url, {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'size': size,
+                'stored_at': now,
+                'validated_at': now,
+                'accessed_at': now,
+            })
+            self.stats['stores'] += 1
+            self.evict()
+            return CachedResponse(url, response.status_code, body_path, False, dict(response.headers))
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.meta.json'):
+                continue
+            try:
+                with open(os.path.join(self.cache_dir, name), 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if now - meta['validated_at'] > self.max_age_seconds:
+                self._remove(meta['url'])
+            else:
+                entries.append(meta)
+
+        total = sum(meta['size'] for meta in entries)
+        for meta in sorted(entries, key=lambda m: m['accessed_at']):
+            if total <= self.max_bytes:
+                break
+            self._remove(meta['url'])
+            total -= meta['size']
+
+    def save_artifact(self, url, name, data, key=None):
+        """Store a derived result (e.g. screened funds) tied to the cached body's validators
+
+        key identifies whatever else the result was computed from (config, code, other
+        inputs); load_artifact only returns it for the same key.
+        """
+        meta = self._load_meta(url)
+        if meta is None:
+            return
+        payload = {'validator': _validator(meta), 'key': key, 'data': data}
+        _atomic_write(self._artifact_path(url, name), json.dumps(payload).encode('utf-8'))
+
+    def load_artifact(self, url, name, key=None):
+        """Derived result for the currently cached body and key, or None if either has changed"""
+        meta = self._load_meta(url)
+        if meta is None:
+            return None
+        try:
+            with open(self._artifact_path(url, name), 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if payload['validator'] != _validator(meta) or payload.get('key') != key:
+            return None
+        return payload['data']
+
+    def stats_summary(self):
+        """One-line hit/miss summary for run logs"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        rate = self.stats['hits'] / lookups * 100 if lookups else 0.0
+        return (f"{self.stats['hits']} hits, {self.stats['misses']} misses ({rate:.0f}% hit rate), "
+                f"{self.stats['evictions']} evictions")
+
+
+def _validator(meta):
+    """Identity of a cached body: its validators plus when it was downloaded"""
+    return [meta.get('etag'), meta.get('last_modified'), meta['stored_at']]
+
+
+def _atomic_write(path, payload):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+_shared_cache = None
+
+
+def shared_cache():
+    """Process-wide cache so every source reuses one connection pool"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = HttpCache()
+    return _shared_cache
@@ -0,0 +1,143 @@
+"""
+Technical momentum indicators over a 2-D NAV array
+Computes 14-day RSI, 1/3/6-month rate of change, the MACD histogram and the maximum
+drawdown over a trailing window for every scheme at once, as of one day of a
+(schemes, days) NAV matrix that holds NaN before a scheme's launch
+"""
+
+import numpy as np
+
+INDICATOR_FIELDS = ['rsi_14', 'roc_1m', 'roc_3m', 'roc_6m', 'macd_hist_pct', 'max_drawdown_pct']
+
+RSI_DAYS = 14
+# Trading days per period
+ROC_DAYS = {'roc_1m': 21, 'roc_3m': 63, 'roc_6m': 126}
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+# Trading days the MACD EMAs run over before the reported day; the slowest EMA's
+# weight on values older than this is below 1e-8
+MACD_WARMUP_DAYS = 250
+DRAWDOWN_DAYS = 3 * 365
+
+# Rows per block, bounding the window copies to a few tens of MB
+BLOCK_ROWS = 8192
+
+
+def rsi(navs, days=RSI_DAYS):
+    """Cutler's RSI on the last `days` NAV changes of each row: 100 - 100 / (1 + avg gain / avg loss)
+
+    Uses simple averages of gains and losses rather than Wilder's smoothing, so the
+    value depends only on the window; NaN when the row lacks days + 1 NAVs.
+    """
+    changes = np.diff(navs[:, -(days + 1):], axis=1)
+    gains = np.clip(changes, 0, None).sum(axis=1) / days
+    losses = np.clip(-changes, 0, None).sum(axis=1) / days
+    with np.errstate(invalid='ignore', divide='ignore'):
+        value = 100 - 100 / (1 + gains / losses)
+    # No losses at all is maximum strength; a flat series is neutral
+    value = np.where((losses == 0) & (gains > 0), 100.0, value)
+    return np.where((losses == 0) & (gains == 0), 50.0, value)
+
+
+def rate_of_change(navs, days):
+    """Percentage change of the last NAV over `days` trading days"""
+    if navs.shape[1] <= days:
+        return np.full(len(navs), np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (navs[:, -1] / navs[:, -(days + 1)] - 1) * 100
+
+
+def _ema_step(ema, values, alpha):
+    """One EMA update per row, seeding rows whose EMA has not started yet"""
+    return np.where(np.isnan(ema), values, ema + alpha * (values - ema))
+
+
+def macd_histogram(navs, fast=MACD_FAST, slow=MACD_SLOW, signal=MACD_SIGNAL):
+    """MACD line minus its signal line on the last day, as a percentage of the NAV
+
+    The EMAs run across the window one day at a time, vectorized over rows; each
+    starts at the row's first NAV, so schemes launched inside the window still get
+    a value once the signal EMA has seen one MACD point.
+    """
+    fast_alpha, slow_alpha, signal_alpha = 2 / (fast + 1), 2 / (slow + 1), 2 / (signal + 1)
+    count = len(navs)
+    fast_ema = np.full(count, np.nan)
+    slow_ema = np.full(count, np.nan)
+    signal_ema = np.full(count, np.nan)
+
+    for day in range(navs.shape[1]):
+        values = navs[:, day]
+        fast_ema = _ema_step(fast_ema, values, fast_alpha)
+        slow_ema = _ema_step(slow_ema, values, slow_alpha)
+        signal_ema = _ema_step(signal_ema, fast_ema - slow_ema, signal_alpha)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (fast_ema - slow_ema - signal_ema) / navs[:, -1] * 100
+
+
+def max_drawdown(navs):
+    """Largest fall from a running peak within the window, as a positive percentage"""
+    # fmax/fmin skip the NaNs before launch, so no nan-aware copies are needed
+    peaks = np.fmax.accumulate(navs, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (1 - np.fmin.reduce(navs / peaks, axis=1)) * 100
+
+
+def drawdown_summary(navs):
+    """(peak, trough, lowest NAV-to-running-peak ratio) of each row, for combine_drawdowns"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = np.fmin.reduce(navs / np.fmax.accumulate(navs, axis=1), axis=1)
+    return np.fmax.reduce(navs, axis=1), np.fmin.reduce(navs, axis=1), ratio
+
+
+def combine_drawdowns(left, right):
+    """Summary of left's days followed by right's days
+
+    Falls from left's peak to right's trough are the only ones neither side saw, so
+    the result equals drawdown_summary over the joined days exactly.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bridge = right[1] / left[0]
+    return np.fmax(left[0], right[0]), np.fmin(left[1], right[1]), np.fmin(np.fmin(left[2], right[2]), bridge)
+
+
+def drawdown_pct(summary):
+    """max_drawdown of the days a summary covers"""
+    return (1 - summary[2]) * 100
+
+
+def drawdown_start(dates, end):
+    """Index of the first day in the trailing drawdown window ending at day index end"""
+    return int(np.searchsorted(dates, dates[end] - np.timedelta64(DRAWDOWN_DAYS, 'D'), side='right'))
+
+
+def compute(navs, dates, rows, end, drawdown=None):
+    """INDICATOR_FIELDS arrays for the given rows of a (schemes, days) NAV matrix as of day index end
+
+    A caller that tracks max_drawdown_pct itself passes it as drawdown, and then only
+    the short trailing window is read.
+    """
+    result = {field: np.full(len(rows), np.nan) for field in INDICATOR_FIELDS}
+    if end < 0 or not len(rows):
+        return result
+
+    trailing_start = max(0, end + 1 - max(MACD_WARMUP_DAYS, max(ROC_DAYS.values()) + 1, RSI_DAYS + 1))
+    if drawdown is None:
+        window_start = drawdown_start(dates, end)
+    else:
+        window_start = trailing_start
+        result['max_drawdown_pct'][:] = drawdown
+    start = min(window_start, trailing_start)
+
+    for block in range(0, len(rows), BLOCK_ROWS):
+        window = np.asarray(navs[rows[block:block + BLOCK_ROWS], start:end + 1], dtype=np.float64)
+        trailing = window[:, trailing_start - start:]
+        positions = slice(block, block + len(window))
+
+        result['rsi_14'][positions] = rsi(trailing)
+        for field, days in ROC_DAYS.items():
+            result[field][positions] = rate_of_change(trailing, days)
+        result['macd_hist_pct'][positions] = macd_histogram(trailing)
+        if drawdown is None:
+            result['max_drawdown_pct'][positions] = max_drawdown(window[:, window_start - start:])
+
+    return result
@@ -0,0 +1,124 @@
+"""
+Per-stage timing and memory instrumentation for the Indian Mutual Fund Screener
+Wraps pipeline stages in a context manager or decorator that records wall time, CPU
+time and tracemalloc peak, logs each record as a JSON line and can write them to a
+metrics file. Disabled instrumentation hands out a shared no-op context manager.
+"""
+
+import contextlib
+from datetime import datetime
+import functools
+import json
+import logging
+import threading
+import time
+import tracemalloc
+
+from config import INSTRUMENTATION_CONFIG
+
+logger = logging.getLogger('mutual_fund_screener.stages')
+
+_DISABLED = contextlib.nullcontext()
+
+
+class _Stage:
+    __slots__ = ('name', 'start_current', 'peak')
+
+    def __init__(self, name, start_current):
+        self.name = name
+        self.start_current = start_current
+        self.peak = start_current
+
+
+class Instrumentation:
+    """Collects one record per finished stage: name, wall_seconds, cpu_seconds, peak_bytes
+
+    CPU time is that of the thread running the stage, so fetch stages on worker
+    threads are measured separately. peak_bytes is the tracemalloc high-water mark
+    above the memory traced when the stage started; stages that overlap in time
+    (nested stages, concurrent fetches) each see the allocations of the others.
+    """
+
+    def __init__(self, enabled=False, trace_memory=True, metrics_file=None):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.metrics_file = metrics_file
+        self.started_at = datetime.now().isoformat()
+        self.records = []
+        self._open = []
+        self._lock = threading.Lock()
+        self._started_tracing = False
+
+    @classmethod
+    def from_config(cls, config=None):
+        config = INSTRUMENTATION_CONFIG if config is None else config
+        return cls(config.get('enabled', False), config.get('trace_memory', True), config.get('metrics_file'))
+
+    def stage(self, name):
+        """Context manager measuring one stage; a shared no-op when disabled"""
+        if not self.enabled:
+            return _DISABLED
+        return self._measure(name)
+
+    def _checkpoint(self):
+        """Fold the peak since the last checkpoint into every open stage, then reset it"""
+        current, peak = tracemalloc.get_traced_memory()
+        for stage in self._open:
+            stage.peak = max(stage.peak, peak)
+        tracemalloc.reset_peak()
+        return current
+
+    @contextlib.contextmanager
+    def _measure(self, name):
+        stage = None
+        if self.trace_memory:
+            with self._lock:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracing = True
+                stage = _Stage(name, self._checkpoint())
+                self._open.append(stage)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            record = {
+                'stage': name,
+                'wall_seconds': round(time.perf_counter() - wall_start, 6),
+                'cpu_seconds': round(time.thread_time() - cpu_start, 6),
+                'peak_bytes': None,
+            }
+            if stage is not None:
+                with self._lock:
+                    self._checkpoint()
+                    self._open.remove(stage)
+                    record['peak_bytes'] = stage.peak - stage.start_current
+                    if not self._open and self._started_tracing:
+                        tracemalloc.stop()
+                        self._started_tracing = False
+
+            with self._lock:
+                self.records.append(record)
+            logger.info(json.dumps({'event': 'stage', **record}))
+
+    def write_metrics(self, path=None):
+        """Write the run's stage records as JSON; returns the path, or None if there is nowhere to write"""
+        path = path or self.metrics_file
+        if not path or not self.enabled:
+            return None
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'started_at': self.started_at, 'stages': self.records}, f, indent=2)
+        return path
+
+
+def instrumented(name):
+    """Method decorator running the call inside self.instrumentation.stage(name)"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.instrumentation.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -5,25 +5,109 @@ Screens beaten-down mutual funds with momentum recovery potential
 Author: AI Financial Analyst
 """
 
-import pandas as pd
+from collections import namedtuple
+
 import numpy as np
-import requests
-from datetime import datetime, timedelta
-import json
-import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from datetime import datetime
+import os
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
+from config import (CORRELATION_CONFIG, DATA_SOURCES, INDICATOR_CONFIG, INSTRUMENTATION_CONFIG,
+                    NAME_MATCHING_CONFIG, NEWS_CONFIG, REPORT_CONFIG, RESULT_CACHE_CONFIG)
+from instrumentation import Instrumentation, instrumented
+from nav_store import HISTORY_FIELDS
+import amfi
+import correlation
+import exporters
+import fund_records
+import name_matching
+import nav_updates
+import ranking
+import report_shards
+import report_writer
+import result_cache
+import rules
+import scoring
+import screening
+
+# One fund fetch: the ingested funds, rejections counted while ingesting, a reused
+# screen when the NAV file was not modified, and the NAV file URL
+FundFetch = namedtuple('FundFetch', ['funds', 'rejected', 'reused_screen', 'source_url'])
+
+
 class IndianMutualFundScreener:
-    def __init__(self):
+    def __init__(self, nav_store=None, incremental=False, http=None, benchmarks=None, instrumentation=None,
+                 workers=None, result_cache=None, factsheets=None, news_feeds=None):
         self.funds_data = []
+        self.nav_store = nav_store
+        self.workers = INDICATOR_CONFIG['workers'] if workers is None else workers
+        self.http = http
+        self.benchmarks = benchmarks
+        self.fund_source_url = None
+        self.reused_screen = None
         self.market_data = {}
         self.news_data = []
         self.nifty_valuation = {}
-
-    def fetch_mutual_fund_data(self):
+        self.fetch_errors = {}
+        self.screen_filter = screening.compile_filter()
+        self.instrumentation = instrumentation or Instrumentation.from_config()
+        self.result_cache = result_cache
+        # Secondary records (AUM, expense ratio, manager) joined onto AMFI schemes by name
+        self.factsheets = factsheets
+        self.news_feeds = NEWS_CONFIG['feeds'] if news_feeds is None else news_feeds
+
+        # Incremental mode keeps rolling 52-week state next to the NAV store
+        self.rolling_state = None
+        if nav_store is not None and incremental:
+            self.rolling_state = nav_updates.RollingState.load(nav_store)
+
+    def fetch_mutual_fund_data(self, source=None):
         """Fetch mutual fund data from various sources"""
+        return self.apply_fund_fetch(self.load_mutual_fund_data(source))
+
+    def apply_fund_fetch(self, fetched):
+        """Make a FundFetch the screener's fund data, rejection counts and reusable screen"""
+        self.funds_data = fetched.funds
+        self.reused_screen = fetched.reused_screen
+        self.fund_source_url = fetched.source_url
+        self.screen_filter.reset()
+        self.screen_filter.rejected.update(fetched.rejected or {})
+        return fetched.funds
+
+    def load_mutual_fund_data(self, source=None):
+        """Fund data as a FundFetch; counts its own rejections and leaves the screener's state alone"""
         print("📊 Fetching mutual fund data...")
+        rejected = self.screen_filter.new_counts()
+
+        # Stream AMFI's NAVAll.txt when a URL, file path or open file is given
+        if source is not None:
+            source_url = None
+            if isinstance(source, str) and source.startswith(('http://', 'https://')):
+                source_url = source
+                response = self.http_client().get(source)
+
+                # A 304 means the NAV file is unchanged, so skip parsing and scoring entirely
+                if response.not_modified:
+                    screened = self.http_client().load_artifact(source, 'screened_funds', self.screen_fingerprint())
+                    if screened is not None:
+                        print("♻️  Fund data not modified since last run, reusing screened results")
+                        return FundFetch(screened, rejected, screened, source_url)
+
+                with response.open() as body:
+                    schemes = list(amfi.stream_schemes(body))
+            else:
+                schemes = list(amfi.stream_schemes(source))
+
+            if self.rolling_state is not None:
+                self.update_nav_history(schemes)
+
+            funds = (amfi.scheme_to_fund(scheme) for scheme in schemes)
+            if self.factsheets:
+                funds = name_matching.enrich(list(funds), self.factsheets, NAME_MATCHING_CONFIG['fields'])
+            return FundFetch(self.ingest_funds(funds, rejected), rejected, None, source_url)
 
         # Sample fund data - in real implementation, this would fetch from AMFI/MorningStar APIs
         sample_funds = [
@@ -149,11 +233,30 @@ class IndianMutualFundScreener:
             }
         ]
 
-        self.funds_data = sample_funds
-        return sample_funds
+        return FundFetch(self.ingest_funds(sample_funds, rejected), rejected, None, None)
+
+    def ingest_funds(self, funds, rejected=None):
+        """Keep only funds that can pass SCREENING_CONFIG, checking whatever fields the source carries"""
+        # Fields derived from NAV history are replaced before scoring, so judge them there
+        deferred = HISTORY_FIELDS if self.nav_store is not None else ()
+        return [fund for fund in funds if self.screen_filter.accepts(fund, deferred, rejected)]
+
+    def http_client(self):
+        """HTTP cache used for every remote source; shared process-wide unless injected"""
+        if self.http is None:
+            # Imported here so runs on local or sample data never load requests
+            import http_cache
+
+            self.http = http_cache.shared_cache()
+        return self.http
 
     def fetch_nifty_valuation_data(self):
         """Fetch current NIFTY valuation metrics"""
+        self.nifty_valuation = self.load_nifty_valuation_data()
+        return self.nifty_valuation
+
+    def load_nifty_valuation_data(self):
+        """Current NIFTY valuation metrics, returned without touching the screener's state"""
         print("📈 Fetching NIFTY valuation data...")
 
         # Sample NIFTY data - in real implementation, this would fetch from NSE APIs
@@ -172,133 +275,207 @@ class IndianMutualFundScreener:
             'dii_inflows_ytd': 125000   # in crores
         }
 
-        self.nifty_valuation = nifty_data
+        # Replace sample index levels with the latest cached/downloaded closes
+        if self.benchmarks is not None:
+            for name, level in self.benchmarks.load().latest_levels().items():
+                nifty_data[f'{name}_level'] = round(level)
+
         return nifty_data
 
     def fetch_market_news(self):
-        """Fetch current market news and scenarios"""
+        """Fetch the newest market news from the configured feeds, deduplicated and tagged"""
+        self.news_data = self.load_market_news()
+        return self.news_data
+
+    def load_market_news(self):
+        """Newest market news items, returned without touching the screener's state"""
         print("📰 Fetching market news...")
 
-        # Sample news data - in real implementation, this would fetch from news APIs
-        news_data = [
-            {
-                'headline': 'Indian Markets Navigate US Trade Tensions',
-                'summary': 'Markets remain resilient despite trade uncertainties. GST reforms expected to boost consumption.',
-                'impact': 'Mixed',
-                'date': '2025-09-12'
-            },
-            {
-                'headline': 'Fed Rate Cut Expected This Month',
-                'summary': 'US Fed likely to cut rates by 25bps, potentially boosting FII inflows to India.',
-                'impact': 'Positive',
-                'date': '2025-09-12'
-            },
-            {
-                'headline': 'India GDP Growth Remains Strong at 7.8%',
-                'summary': 'Q1 FY26 GDP growth beats estimates, supporting long-term investment thesis.',
-                'impact': 'Positive',
-                'date': '2025-09-10'
-            }
-        ]
+        news_data = []
+        if self.news_feeds:
+            # Imported here so runs without feeds never load lxml
+            import news
+
+            # Feeds are streamed item by item; only the newest NEWS_CONFIG["max_items"] are kept
+            news_data = news.fetch_news(self.news_feeds, self.http)
 
-        self.news_data = news_data
         return news_data
 
+    @instrumented('fetch')
+    def fetch_all_data(self, fund_source=None, deadlines=None):
+        """Fetch fund, valuation and news data concurrently with per-source deadlines"""
+        fetchers = {
+            'mutual_funds': lambda: self.load_mutual_fund_data(fund_source),
+            'market_data': self.load_nifty_valuation_data,
+            'news': self.load_market_news,
+        }
+        if deadlines is None:
+            deadlines = {source: DATA_SOURCES[source].get('deadline_seconds', 30) for source in fetchers}
+
+        self.fetch_errors = {}
+        executor = ThreadPoolExecutor(max_workers=len(fetchers), thread_name_prefix='fetch')
+        started = time.monotonic()
+        futures = {source: executor.submit(self.run_stage, f'fetch.{source}', fetch)
+                   for source, fetch in fetchers.items()}
+
+        # Deadlines are measured from the start of the stage, so sources overlap fully
+        results = {}
+        for source, future in futures.items():
+            remaining = max(0.0, deadlines[source] - (time.monotonic() - started))
+            try:
+                results[source] = future.result(timeout=remaining)
+            except FuturesTimeoutError:
+                self.fetch_errors[source] = f"no response within {deadlines[source]}s"
+            except Exception as e:
+                self.fetch_errors[source] = str(e) or type(e).__name__
+
+        # Late fetches are abandoned; their threads finish in the background, but only
+        # results collected above ever reach the screener
+        executor.shutdown(wait=False, cancel_futures=True)
+        self.apply_fund_fetch(results.get('mutual_funds', FundFetch([], None, None, None)))
+        self.nifty_valuation = results.get('market_data', {})
+        self.news_data = results.get('news', [])
+
+        for source, error in self.fetch_errors.items():
+            print(f"⚠️  {source} fetch failed: {error}")
+
+        return {'mutual_funds': self.funds_data, 'market_data': self.nifty_valuation, 'news': self.news_data}
+
+    def run_stage(self, name, fn, *args):
+        """Call fn inside an instrumented stage; used for work submitted to other threads"""
+        with self.instrumentation.stage(name):
+            return fn(*args)
+
     def calculate_momentum_indicators(self, fund_data):
         """Calculate technical momentum indicators for funds"""
 
+        # Derive NAV, 52-week range and return fields from real history when available
+        if self.nav_store is not None:
+            fund_data = {**fund_data, **(self.nav_store.fund_fields(fund_data['fund_code']) or {})}
+
         # Calculate drawdown from 52-week high
         current_nav = fund_data['current_nav']
         high_52w = fund_data['52w_high']
         low_52w = fund_data['52w_low']
 
         drawdown_from_high = ((high_52w - current_nav) / high_52w) * 100
-        recovery_potential = ((current_nav - low_52w) / (high_52w - low_52w)) * 100
-
-        # RSI-like momentum score based on recent performance vs long-term
-        short_term_return = fund_data['1y_return']
-        long_term_return = fund_data['5y_return']
-
-        momentum_score = 0
-
-        # Beaten down criteria (negative or low returns)
-        if short_term_return < -5:
-            momentum_score += 30  # Significantly beaten down
-        elif short_term_return < 0:
-            momentum_score += 20  # Moderately beaten down
-
-        # Recovery potential based on historical performance
-        if long_term_return > 15:
-            momentum_score += 25  # Strong historical performance
-        elif long_term_return > 10:
-            momentum_score += 15  # Good historical performance
-
-        # Current positioning vs 52-week range
-        if recovery_potential > 70:
-            momentum_score += 10  # Near highs (less attractive)
-        elif recovery_potential < 30:
-            momentum_score += 25  # Near lows (more attractive)
-        else:
-            momentum_score += 15  # Mid-range
+        # A flat 52-week range has no position within it, so the positioning is unknown
+        range_52w = high_52w - low_52w
+        recovery_potential = ((current_nav - low_52w) / range_52w) * 100 if range_52w else None
 
-        # Fund quality indicators
-        if fund_data['aum_cr'] > 10000:  # Large fund
-            momentum_score += 10
-        if fund_data['expense_ratio'] < 1.5:  # Reasonable expense ratio
-            momentum_score += 10
+        # Score with the same compiled rules the vectorized screen uses
+        rule_inputs = {**fund_data, 'drawdown_from_high': drawdown_from_high,
+                       'recovery_potential_pct': recovery_potential}
+        program = rules.default_program()
 
         return {
-            'momentum_score': min(momentum_score, 100),
+            'momentum_score': program.score_one(rule_inputs),
             'drawdown_from_high': round(drawdown_from_high, 2),
-            'recovery_potential_pct': round(recovery_potential, 2),
-            'beaten_down_level': 'High' if short_term_return < -10 else 'Medium' if short_term_return < -5 else 'Low'
+            'recovery_potential_pct': None if recovery_potential is None else round(recovery_potential, 2),
+            'beaten_down_level': program.beaten_down_level_one(rule_inputs)
         }
 
+    @instrumented('screen')
     def screen_beaten_down_funds(self):
         """Screen and rank beaten-down funds with recovery potential"""
         print("🔍 Screening beaten-down funds...")
 
-        screened_funds = []
+        if self.reused_screen is not None:
+            return self.reused_screen
 
-        for fund in self.funds_data:
-            # Calculate momentum indicators
-            momentum_data = self.calculate_momentum_indicators(fund)
+        funds = self.apply_nav_history(self.funds_data, self.screen_filter)
 
-            # Combine fund data with momentum analysis
-            fund_analysis = {
-                **fund,
-                **momentum_data,
-                'recommendation': self.get_recommendation(fund, momentum_data)
-            }
+        # Apply the screening predicates before scoring so only candidates are scored
+        fields = list(dict.fromkeys(scoring.input_fields() + self.screen_filter.fields))
+        columns = scoring.build_columns(funds, fields=fields)
+        keep = np.flatnonzero(self.screen_filter.mask(columns))
+        candidates = [funds[i] for i in keep]
 
-            # Filter for beaten-down funds (negative 1-year returns)
-            if fund['1y_return'] < 0:
-                screened_funds.append(fund_analysis)
+        # Calculate momentum indicators for the candidates in one vectorized pass
+        scored = scoring.score_columns({field: values[keep] for field, values in columns.items()})
 
-        # Sort by momentum score (highest first)
-        screened_funds.sort(key=lambda x: x['momentum_score'], reverse=True)
+        # Sort by momentum score (highest first), keeping input order for ties
+        order = ranking.order_by_score(scored['momentum_score'])
+
+        # Combine fund data with momentum analysis
+        screened_funds = scoring.to_records(candidates, scored, order)
+        self.flag_redundant(screened_funds)
+
+        # Keep the result next to the cached NAV file so a 304 next run can reuse it
+        if self.fund_source_url is not None:
+            self.http_client().save_artifact(self.fund_source_url, 'screened_funds', fund_records.to_dicts(screened_funds),
+                                             self.screen_fingerprint())
 
         return screened_funds
 
+    def flag_redundant(self, screened_funds):
+        """Mark ranked picks whose daily returns track a better-ranked pick (needs the NAV store)"""
+        if self.nav_store is None or not CORRELATION_CONFIG['enabled']:
+            return 0
+        redundant = correlation.flag_redundant(screened_funds, self.nav_store)
+        if redundant:
+            print(f"🔗 {redundant} picks move with a better-ranked pick (ρ ≥ {CORRELATION_CONFIG['threshold']})")
+        return redundant
+
+    def screen_fingerprint(self):
+        """Key of everything besides the NAV file a saved screen depends on: config, code, NAV store, factsheets"""
+        return result_cache.fingerprint({
+            'nav_store': result_cache.nav_store_state(self.nav_store),
+            'factsheets': self.factsheets,
+        })
+
+    def apply_nav_history(self, funds, screen_filter=None):
+        """Replace static NAV, 52-week range and return fields with values derived from history
+
+        With a screen_filter, funds whose derived values fail its predicates are dropped
+        (and counted) before anything is merged, so only survivors are copied.
+        """
+        if self.nav_store is None:
+            return funds
+
+        codes = [fund['fund_code'] for fund in funds]
+        if self.rolling_state is not None:
+            updates = self.rolling_state.fund_updates(self.nav_store, codes)
+        else:
+            updates = self.nav_store.fund_updates(codes, workers=self.workers)
+        if screen_filter is not None:
+            kept = [(fund, update) for fund, update in zip(funds, updates)
+                    if screen_filter.accepts(fund, updates=update)]
+            funds, updates = [fund for fund, _ in kept], [update for _, update in kept]
+        return [fund if update is None else {**fund, **update} for fund, update in zip(funds, updates)]
+
+    def leaderboard(self, screened_funds, k, per_category=False):
+        """Top k screened funds overall or per category, without sorting the whole list"""
+        return ranking.top_k(screened_funds, k, per_category)
+
+    def update_nav_history(self, schemes):
+        """Append only today's AMFI NAVs to the NAV store and roll the 52-week state forward"""
+        dated = [scheme for scheme in schemes if scheme.nav_date is not None]
+        if not dated:
+            return False
+
+        day = max(scheme.nav_date for scheme in dated)
+        nav_by_code = {scheme.scheme_code: scheme.nav for scheme in dated}
+        return nav_updates.append_day(self.nav_store, self.rolling_state, day, nav_by_code)
+
     def get_recommendation(self, fund_data, momentum_data):
         """Generate investment recommendation"""
-        momentum_score = momentum_data['momentum_score']
-
-        if momentum_score >= 80:
-            return 'Strong Buy'
-        elif momentum_score >= 65:
-            return 'Buy'
-        elif momentum_score >= 50:
-            return 'Hold'
-        else:
-            return 'Avoid'
+        return rules.default_program().recommend_one(momentum_data['momentum_score'])
 
-    def generate_html_report(self, screened_funds):
+    def generate_html_report(self, screened_funds, shard_dir=None):
         """Generate dynamic HTML report"""
         print("📄 Generating HTML report...")
 
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S IST")
 
+        # Sharded mode: inline only the top funds, the rest load lazily from JSON shards
+        if shard_dir is not None:
+            report_shards.write_shards(shard_dir, screened_funds, REPORT_CONFIG['shard_size'])
+            manifest_url = os.path.relpath(os.path.join(shard_dir, report_shards.MANIFEST_FILE)).replace(os.sep, '/')
+            browser = report_shards.render_browser_section(manifest_url, screened_funds)
+            top_funds = self.leaderboard(screened_funds, REPORT_CONFIG['top_n'])
+            return ''.join(self.iter_html_chunks(current_time, top_funds, after_table=browser))
+
         # Create HTML with proper escaping
         html_content = self.create_html_template(current_time, screened_funds)
 
@@ -306,277 +483,129 @@ class IndianMutualFundScreener:
 
     def create_html_template(self, current_time, screened_funds):
         """Create the HTML template"""
+        return ''.join(self.iter_html_chunks(current_time, screened_funds))
+
+    def iter_html_chunks(self, current_time, screened_funds, after_table=''):
+        """Yield the report as HTML chunks, one per fund row and news item"""
+        return report_writer.iter_report(
+            current_time, screened_funds, self.nifty_valuation, self.news_data, self.fetch_errors,
+            after_table=after_table, run_stats=self.run_stats()
+        )
+
+    def run_stats(self):
+        """Stage records finished so far, for the report footer; None when not shown"""
+        if not self.instrumentation.enabled or not INSTRUMENTATION_CONFIG.get('report_footer', True):
+            return None
+        return list(self.instrumentation.records)
+
+    def write_html_report(self, out, screened_funds):
+        """Stream the HTML report straight to an open file handle"""
+        print("📄 Generating HTML report...")
+
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S IST")
+        out.writelines(self.iter_html_chunks(current_time, screened_funds))
 
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Indian Mutual Fund Recovery Screener</title>
-    <style>
-        body {{
-            font-family: 'Arial', sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: #333;
-        }}
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 2.5em;
-            margin-bottom: 10px;
-        }}
-        .timestamp {{
-            font-size: 0.9em;
-            opacity: 0.8;
-        }}
-        .market-overview {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            padding: 30px;
-            background: #f8f9fa;
-        }}
-        .metric-card {{
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-            text-align: center;
-        }}
-        .metric-value {{
-            font-size: 1.8em;
-            font-weight: bold;
-            color: #2a5298;
-        }}
-        .metric-label {{
-            font-size: 0.9em;
-            color: #666;
-            margin-top: 5px;
-        }}
-        .funds-table {{
-            padding: 30px;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 20px;
-            background: white;
-            border-radius: 10px;
-            overflow: hidden;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-        }}
-        th {{
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: white;
-            padding: 15px;
-            text-align: left;
-            font-weight: 600;
-        }}
-        td {{
-            padding: 12px 15px;
-            border-bottom: 1px solid #eee;
-        }}
-        tr:hover {{
-            background: #f8f9fa;
-        }}
-        .recommendation {{
-            padding: 8px 12px;
-            border-radius: 20px;
-            font-weight: bold;
-            color: white;
-            text-align: center;
-        }}
-        .strong-buy {{ background: #28a745; }}
-        .buy {{ background: #007bff; }}
-        .hold {{ background: #ffc107; color: #333; }}
-        .avoid {{ background: #dc3545; }}
-        .beaten-down-high {{ color: #dc3545; font-weight: bold; }}
-        .beaten-down-medium {{ color: #fd7e14; font-weight: bold; }}
-        .beaten-down-low {{ color: #20c997; font-weight: bold; }}
-        .news-section {{
-            padding: 30px;
-            background: #f8f9fa;
-        }}
-        .news-item {{
-            background: white;
-            margin: 15px 0;
-            padding: 20px;
-            border-radius: 10px;
-            border-left: 5px solid #2a5298;
-        }}
-        .news-headline {{
-            font-weight: bold;
-            margin-bottom: 10px;
-            color: #1e3c72;
-        }}
-        .footer {{
-            text-align: center;
-            padding: 20px;
-            background: #1e3c72;
-            color: white;
-            font-size: 0.9em;
-        }}
-        .disclaimer {{
-            margin-top: 10px;
-            font-size: 0.8em;
-            opacity: 0.8;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🚀 Indian Mutual Fund Recovery Screener</h1>
-            <p>Identifying Beaten-Down Funds with Comeback Potential</p>
-            <div class="timestamp">Last Updated: {current_time}</div>
-        </div>
-
-        <div class="market-overview">
-            <div class="metric-card">
-                <div class="metric-value">{self.nifty_valuation['nifty_50_level']:,}</div>
-                <div class="metric-label">NIFTY 50 Level</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{self.nifty_valuation['nifty_50_pe']}</div>
-                <div class="metric-label">NIFTY 50 P/E</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{self.nifty_valuation['market_cap_to_gdp']}%</div>
-                <div class="metric-label">Market Cap/GDP</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{self.nifty_valuation['current_vs_historical']}</div>
-                <div class="metric-label">Market Valuation</div>
-            </div>
-        </div>
-
-        <div class="funds-table">
-            <h2>🎯 Top Beaten-Down Funds with Recovery Potential</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Fund Name</th>
-                        <th>Category</th>
-                        <th>AUM (₹Cr)</th>
-                        <th>1Y Return</th>
-                        <th>3Y Return</th>
-                        <th>5Y Return</th>
-                        <th>10Y Return</th>
-                        <th>Momentum Score</th>
-                        <th>Beaten Down Level</th>
-                        <th>Recovery Potential</th>
-                        <th>Recommendation</th>
-                    </tr>
-                </thead>
-                <tbody>"""
-
-        # Add fund rows
-        for fund in screened_funds:
-            recommendation_class = fund['recommendation'].lower().replace(' ', '-')
-            beaten_down_class = f"beaten-down-{fund['beaten_down_level'].lower()}"
-
-            html += f"""
-                    <tr>
-                        <td><strong>{fund['fund_name']}</strong><br>
-                            <small>Manager: {fund['fund_manager']}</small></td>
-                        <td>{fund['category']}</td>
-                        <td>₹{fund['aum_cr']:,}</td>
-                        <td style="color: red; font-weight: bold;">{fund['1y_return']:+.1f}%</td>
-                        <td>{fund['3y_return']:.1f}%</td>
-                        <td>{fund['5y_return']:.1f}%</td>
-                        <td>{fund['10y_return']:.1f}%</td>
-                        <td><strong>{fund['momentum_score']}/100</strong></td>
-                        <td class="{beaten_down_class}">{fund['beaten_down_level']}</td>
-                        <td>{fund['recovery_potential_pct']:.1f}%</td>
-                        <td><span class="recommendation {recommendation_class}">{fund['recommendation']}</span></td>
-                    </tr>"""
-
-        html += """
-                </tbody>
-            </table>
-        </div>
-
-        <div class="news-section">
-            <h2>📰 Market News & Scenarios</h2>"""
-
-        # Add news items
-        for news in self.news_data:
-            html += f"""
-            <div class="news-item">
-                <div class="news-headline">{news['headline']}</div>
-                <div>{news['summary']}</div>
-                <small style="color: #666;">Impact: {news['impact']} | Date: {news['date']}</small>
-            </div>"""
-
-        html += """
-        </div>
-
-        <div class="footer">
-            <p><strong>Indian Mutual Fund Recovery Screener</strong></p>
-            <p>Veteran Analyst's Algorithm for Identifying Comeback Opportunities</p>
-            <div class="disclaimer">
-                Disclaimer: This is for educational purposes only. Past performance does not guarantee future results. 
-                Please consult with a financial advisor before making investment decisions.
-            </div>
-        </div>
-    </div>
-</body>
-</html>"""
-
-        return html
-
-    def run_analysis(self):
-        """Run complete analysis and generate report"""
+    def run_analysis(self, fund_source=None, refresh=False):
+        """Run complete analysis and generate report
+
+        When the fetched inputs, config and code match a cached run, its screened funds
+        and output files are restored instead; refresh=True reruns and re-caches.
+        """
         print("🚀 Starting Indian Mutual Fund Recovery Analysis...")
         print("=" * 60)
 
-        # Fetch all data
-        self.fetch_mutual_fund_data()
-        self.fetch_nifty_valuation_data()
-        self.fetch_market_news()
+        # Fetch all data concurrently; the report renders with whatever arrived in time
+        self.fetch_all_data(fund_source)
+
+        cache = self.result_cache_client()
+        cache_key = cached = None
+        if cache is not None:
+            with self.instrumentation.stage('result_cache'):
+                cache_key = result_cache.fingerprint(self.result_inputs())
+                cached = None if refresh else cache.load(cache_key)
+
+        if cached is not None:
+            if REPORT_CONFIG['sharded']:
+                report_shards.clear_shards(REPORT_CONFIG['shard_dir'])
+            cache.restore(cache_key, cached)
+            screened_funds = cached['screened_funds']
+            data_path = cached['data_path']
+            self.screen_filter.rejected.clear()
+            self.screen_filter.rejected.update(cached['screening_rejections'])
+            print(f"♻️  Inputs unchanged: reused outputs of run {cache_key[:12]}")
+        else:
+            # Screen funds
+            screened_funds = self.screen_beaten_down_funds()
+            data_path = self.write_outputs(screened_funds)
+            if cache is not None:
+                cache.store(cache_key, self.output_files(data_path), screened_funds, {
+                    'data_path': data_path,
+                    'screening_rejections': dict(self.screen_filter.rejected),
+                })
+        metrics_path = self.instrumentation.write_metrics()
 
-        # Screen funds
-        screened_funds = self.screen_beaten_down_funds()
+        print("✅ Analysis Complete!")
+        print(f"📊 Screened {len(screened_funds)} beaten-down funds")
+        if self.screen_filter.summary():
+            print(f"🚫 Rejected by screening filters: {self.screen_filter.summary()}")
+        print("📄 Report generated: index.html")
+        print(f"📊 Data saved: {data_path}")
+        if self.http is not None:
+            print(f"🗄️  HTTP cache: {self.http.stats_summary()}")
+        if metrics_path:
+            print(f"⏱️  Stage metrics saved: {metrics_path}")
 
-        # Generate report
-        html_report = self.generate_html_report(screened_funds)
+        return screened_funds
 
-        # Save report
-        with open('index.html', 'w', encoding='utf-8') as f:
-            f.write(html_report)
+    def result_cache_client(self):
+        """Result cache for run_analysis, or None when disabled or the report shows per-run stats"""
+        if self.run_stats() is not None:
+            return None
+        if self.result_cache is None and RESULT_CACHE_CONFIG['enabled']:
+            self.result_cache = result_cache.ResultCache()
+        return self.result_cache
 
-        # Save data as JSON for reference
-        analysis_data = {
-            'screened_funds': screened_funds,
+    def result_inputs(self):
+        """Everything fetched that the screened funds and outputs are computed from"""
+        return {
+            'funds_data': self.funds_data,
             'nifty_valuation': self.nifty_valuation,
             'news_data': self.news_data,
-            'analysis_timestamp': datetime.now().isoformat()
+            'fetch_errors': self.fetch_errors,
+            'screening_rejections': dict(self.screen_filter.rejected),
+            'nav_store': result_cache.nav_store_state(self.nav_store),
         }
 
-        with open('fund_analysis_data.json', 'w', encoding='utf-8') as f:
-            json.dump(analysis_data, f, indent=2)
-
-        print("✅ Analysis Complete!")
-        print(f"📊 Screened {len(screened_funds)} beaten-down funds")
-        print("📄 Report generated: index.html")
-        print("📊 Data saved: fund_analysis_data.json")
-
-        return screened_funds
+    def output_files(self, data_path):
+        """Paths of every file write_outputs produced"""
+        files = ['index.html', data_path]
+        if REPORT_CONFIG['sharded']:
+            shard_dir = REPORT_CONFIG['shard_dir']
+            files += [os.path.join(shard_dir, name) for name in sorted(os.listdir(shard_dir))
+                      if name.endswith('.json')]
+        return files
+
+    def write_outputs(self, screened_funds):
+        """Write index.html and the analysis data export; returns the export path"""
+        # Generate and save report, streaming rows straight to disk
+        with self.instrumentation.stage('render'):
+            if REPORT_CONFIG['sharded']:
+                html_report = self.generate_html_report(screened_funds, shard_dir=REPORT_CONFIG['shard_dir'])
+                with open('index.html', 'w', encoding='utf-8') as f:
+                    f.write(html_report)
+            else:
+                with open('index.html', 'w', encoding='utf-8') as f:
+                    self.write_html_report(f, screened_funds)
+
+        # Save data for reference in the configured export format
+        with self.instrumentation.stage('export'):
+            data_path = exporters.export(screened_funds, {
+                'nifty_valuation': self.nifty_valuation,
+                'news_data': self.news_data,
+                'screening_rejections': dict(self.screen_filter.rejected),
+                'analysis_timestamp': datetime.now().isoformat()
+            })
+        return data_path
 
 if __name__ == "__main__":
     screener = IndianMutualFundScreener()
@@ -0,0 +1,227 @@
+"""
+Scheme-name matching across data sources
+AMFI, factsheet and expense-ratio sources spell the same scheme differently
+("Nippon India Small Cap Fund - Direct Plan - Growth" vs "Nippon India Small Cap Fund").
+Names are normalized, broken into character trigrams and looked up in an inverted
+index, so each query scores every candidate in one np.bincount instead of comparing
+strings pairwise. Matches are persisted with their confidence so repeat runs skip
+the search entirely.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+from config import NAME_MATCHING_CONFIG
+
+# Plan and payout words name share classes of one scheme, not different schemes; "fund"
+# and "scheme" appear in nearly every name and only dilute the similarity. Direct and
+# Regular plans do differ in cost, so enrich() keeps them apart for plan-level fields
+PLAN = re.compile(r'\b(direct|regular)\b')
+PLAN_WORDS = re.compile(r'\b(direct|regular|plan|option|growth|idcw|dividend|payout|reinvestment|'
+                        r'bonus|institutional|retail|fund|scheme)\b')
+# Whole-word spellings rewritten to one form after punctuation is stripped
+ABBREVIATIONS = {'smallcap': 'small cap', 'midcap': 'mid cap', 'largecap': 'large cap', 'multicap': 'multi cap',
+                 'flexicap': 'flexi cap', 'pru': 'prudential', 'absl': 'aditya birla sun life',
+                 'sl': 'sun life', 'tax saver': 'elss'}
+ABBREVIATION_WORDS = re.compile(r'\b(' + '|'.join(map(re.escape, ABBREVIATIONS)) + r')\b')
+NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_name(name):
+    """Lower-case scheme name without punctuation or plan/option words"""
+    name = NON_ALPHANUMERIC.sub(' ', (name or '').lower().replace('&', ' and '))
+    name = ABBREVIATION_WORDS.sub(lambda match: ABBREVIATIONS[match.group(1)], name)
+    return ' '.join(PLAN_WORDS.sub(' ', name).split())
+
+
+def plan_of(name):
+    """'direct' or 'regular' for a name that states its plan, '' otherwise"""
+    match = PLAN.search((name or '').lower())
+    return match.group(1) if match else ''
+
+
+def trigrams(normalized):
+    """Character trigrams of a normalized name, padded so word starts count"""
+    padded = f'  {normalized} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Inverted trigram index over candidate names, scored by trigram Jaccard similarity"""
+
+    def __init__(self, names):
+        self.names = [normalize_name(name) for name in names]
+        vocabulary = {}
+        postings = []
+        self.sizes = np.empty(len(self.names), dtype=np.float64)
+        for position, name in enumerate(self.names):
+            grams = trigrams(name)
+            self.sizes[position] = len(grams)
+            for gram in grams:
+                gram_id = vocabulary.setdefault(gram, len(vocabulary))
+                postings.append((gram_id, position))
+
+        # CSR layout: the candidates holding trigram t are indices[offsets[t]:offsets[t + 1]]
+        self.vocabulary = vocabulary
+        pairs = np.array(postings, dtype=np.int64).reshape(-1, 2)
+        pairs = pairs[np.argsort(pairs[:, 0], kind='stable')]
+        self.indices = pairs[:, 1].astype(np.intp)
+        self.offsets = np.searchsorted(pairs[:, 0], np.arange(len(vocabulary) + 1))
+
+    def scores(self, name):
+        """Similarity of name to every candidate, as an array aligned with the index"""
+        grams = trigrams(normalize_name(name))
+        ids = [self.vocabulary[gram] for gram in grams if gram in self.vocabulary]
+        if not ids:
+            return np.zeros(len(self.names))
+        hits = np.concatenate([self.indices[self.offsets[i]:self.offsets[i + 1]] for i in ids])
+        shared = np.bincount(hits, minlength=len(self.names))
+        return shared / (len(grams) + self.sizes - shared)
+
+    def best(self, name):
+        """(candidate position, score) of the closest candidate; ties go to the earliest"""
+        scores = self.scores(name)
+        if not len(scores):
+            return None, 0.0
+        position = int(np.argmax(scores))
+        return position, float(scores[position])
+
+
+class MappingCache:
+    """Persisted {normalized query name: (normalized candidate name, score)} from earlier runs"""
+
+    def __init__(self, path=None):
+        self.path = path or NAME_MATCHING_CONFIG['cache_file']
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self.mappings = data.get('mappings', {})
+        # Misses only hold for the candidate set they were searched against
+        self.unmatched = data.get('unmatched', {})
+        self.dirty = False
+
+    def get(self, query, candidates, candidates_digest):
+        """Cached (normalized candidate, score), ('', 0.0) for a cached miss, or None if unknown"""
+        mapped = self.mappings.get(query)
+        if mapped is not None and mapped[0] in candidates:
+            return tuple(mapped)
+        if self.unmatched.get(query) == candidates_digest:
+            return '', 0.0
+        return None
+
+    def put(self, query, candidate, score, candidates_digest):
+        if candidate:
+            self.mappings[query] = [candidate, score]
+            self.unmatched.pop(query, None)
+        else:
+            self.unmatched[query] = candidates_digest
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'mappings': self.mappings, 'unmatched': self.unmatched}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def match_names(queries, candidates, min_score=None, cache=None):
+    """[(candidate position or None, score)] aligned with queries, in one pass over a trigram index
+
+    Queries whose best candidate scores below min_score are unmatched. With a
+    MappingCache, previously matched names are answered without building the index.
+    """
+    min_score = NAME_MATCHING_CONFIG['min_score'] if min_score is None else min_score
+    normalized = [normalize_name(name) for name in candidates]
+    positions = {}
+    for position, name in enumerate(normalized):
+        positions.setdefault(name, position)
+    digest = hashlib.sha256('\n'.join(sorted(positions)).encode('utf-8')).hexdigest()[:16]
+
+    index = None
+    results = []
+    searched = {}
+    for query in queries:
+        key = normalize_name(query)
+        found = searched.get(key)
+        if found is None and cache is not None:
+            found = cache.get(key, positions, digest)
+        if found is None:
+            if index is None:
+                index = TrigramIndex(candidates)
+            position, score = index.best(query)
+            matched = position is not None and score >= min_score
+            found = (normalized[position] if matched else '', round(score, 4))
+            if cache is not None:
+                cache.put(key, found[0], found[1], digest)
+        searched[key] = found
+        candidate, score = found
+        results.append((positions[candidate] if candidate else None, score))
+
+    if cache is not None:
+        cache.save()
+    return results
+
+
+def enrich(funds, records, fields, min_score=None, cache_path=None, plan_fields=None):
+    """Copy fields from name-matched secondary records into fund dicts that lack them
+
+    Names are matched at scheme level, but plan_fields (expense ratio) only come from a
+    record of the fund's own plan, or one that states no plan; a Regular plan never
+    gets the Direct plan's value. Every fund gets name_match_score, the confidence of
+    its match (0 when unmatched). Values the fund already carries win over the
+    secondary source. cache_path=False disables the persisted mapping cache.
+    """
+    plan_fields = NAME_MATCHING_CONFIG['plan_fields'] if plan_fields is None else plan_fields
+    cache = MappingCache(cache_path) if cache_path is not False else None
+    names = [record.get('fund_name') for record in records]
+    matches = match_names([fund.get('fund_name') for fund in funds], names, min_score, cache)
+
+    # {normalized scheme name: {plan: first record position}}
+    plans = {}
+    for position, name in enumerate(names):
+        plans.setdefault(normalize_name(name), {}).setdefault(plan_of(name), position)
+
+    enriched = []
+    for fund, (position, score) in zip(funds, matches):
+        fund = dict(fund)
+        if position is not None:
+            scheme = plans[normalize_name(names[position])]
+            same_plan = scheme.get(plan_of(fund.get('fund_name')), scheme.get(''))
+            for field in fields:
+                source = same_plan if field in plan_fields else position
+                if source is not None and fund.get(field) is None and records[source].get(field) is not None:
+                    fund[field] = records[source][field]
+        fund['name_match_score'] = score if position is not None else 0.0
+        enriched.append(fund)
+    return enriched
+
+
+def load_records(path):
+    """Secondary-source records from a JSON list or a CSV file with a header row"""
+    if path.endswith('.csv'):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return [{key: _csv_value(value) for key, value in row.items()} for row in csv.DictReader(f)]
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _csv_value(value):
+    """CSV cells as numbers where they parse, None when empty"""
+    if value is None or value.strip() == '':
+        return None
+    try:
+        return float(value.replace(',', ''))
+    except ValueError:
+        return value.strip()
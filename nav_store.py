@@ -0,0 +1,234 @@
+"""
+Memory-mapped historical NAV store keyed by scheme code
+One shared date axis plus one dense float64 row per scheme, opened with numpy.memmap
+"""
+
+from datetime import timedelta
+import json
+import os
+import warnings
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+import indicators
+
+META_FILE = 'meta.json'
+DATES_FILE = 'dates.npy'
+NAVS_FILE = 'navs.npy'
+
+# Trailing return periods in years; 1Y is absolute, longer periods are annualized (CAGR)
+RETURN_PERIODS = {'1y_return': 1, '3y_return': 3, '5y_return': 5, '10y_return': 10}
+RANGE_DAYS = 365
+
+HISTORY_FIELDS = ['current_nav', '52w_high', '52w_low'] + list(RETURN_PERIODS) + indicators.INDICATOR_FIELDS
+
+# Bytes of NAV rows copied at a time when the store is rewritten at a larger capacity
+GROW_CHUNK_BYTES = 64 * 2 ** 20
+
+
+class NavStore:
+    """Columnar NAV history: navs[row, day] with NaN before a scheme's launch"""
+
+    def __init__(self, path, meta, dates, navs):
+        self.path = path
+        self.meta = meta
+        self.dates = dates
+        self.navs = navs
+        self.scheme_codes = meta['scheme_codes']
+        self.rows = {code: row for row, code in enumerate(self.scheme_codes)}
+
+    @classmethod
+    def create(cls, path, scheme_codes, start_date, capacity):
+        """Create an empty store with room for `capacity` days from start_date onward"""
+        os.makedirs(path, exist_ok=True)
+        scheme_codes = [str(code) for code in scheme_codes]
+
+        navs = open_memmap(os.path.join(path, NAVS_FILE), mode='w+',
+                           dtype=np.float64, shape=(len(scheme_codes), capacity))
+        navs[:] = np.nan
+        dates = open_memmap(os.path.join(path, DATES_FILE), mode='w+',
+                            dtype='datetime64[D]', shape=(capacity,))
+        dates[:] = np.datetime64('NaT')
+
+        meta = {'scheme_codes': scheme_codes, 'length': 0, 'capacity': capacity,
+                'start_date': str(start_date)}
+        store = cls(path, meta, dates, navs)
+        store.flush()
+        return store
+
+    @classmethod
+    def open(cls, path, mode='r'):
+        """Open an existing store; arrays are memory-mapped, nothing is read up front"""
+        with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        dates = np.load(os.path.join(path, DATES_FILE), mmap_mode=mode)
+        navs = np.load(os.path.join(path, NAVS_FILE), mmap_mode=mode)
+        return cls(path, meta, dates, navs)
+
+    @property
+    def length(self):
+        return self.meta['length']
+
+    def flush(self):
+        """Persist array pages and the metadata file"""
+        if isinstance(self.navs, np.memmap) and self.navs.mode != 'r':
+            self.navs.flush()
+            self.dates.flush()
+        with open(os.path.join(self.path, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f)
+
+    def write_days(self, dates, navs):
+        """Append a block of days: dates has shape (days,), navs has shape (schemes, days)"""
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        start = self.length
+        end = start + len(dates)
+        if end > self.meta['capacity']:
+            self.grow(max(end, 2 * self.meta['capacity']))
+        if start and dates[0] <= self.dates[start - 1]:
+            raise ValueError("NAV store days must be appended in increasing date order")
+
+        self.dates[start:end] = dates
+        self.navs[:, start:end] = navs
+        self.meta['length'] = end
+
+    def grow(self, capacity):
+        """Rewrite the arrays with room for `capacity` days, keeping every stored day
+
+        Rows are copied a chunk at a time into new files that then replace the old
+        ones, so growing needs no more memory than GROW_CHUNK_BYTES. Doubling on each
+        overflow keeps the cost of daily appends amortized O(1).
+        """
+        if capacity <= self.meta['capacity']:
+            return
+        length = self.length
+        dates_path = os.path.join(self.path, DATES_FILE)
+        navs_path = os.path.join(self.path, NAVS_FILE)
+
+        dates = open_memmap(dates_path + '.tmp', mode='w+', dtype='datetime64[D]', shape=(capacity,))
+        dates[:length] = self.dates[:length]
+        dates[length:] = np.datetime64('NaT')
+        navs = open_memmap(navs_path + '.tmp', mode='w+', dtype=np.float64, shape=(len(self.scheme_codes), capacity))
+        step = max(1, GROW_CHUNK_BYTES // (capacity * navs.itemsize))
+        for start in range(0, len(navs), step):
+            navs[start:start + step, :length] = self.navs[start:start + step, :length]
+            navs[start:start + step, length:] = np.nan
+        dates.flush()
+        navs.flush()
+        del dates, navs
+
+        self.dates = self.navs = None
+        os.replace(dates_path + '.tmp', dates_path)
+        os.replace(navs_path + '.tmp', navs_path)
+        self.dates = np.load(dates_path, mmap_mode='r+')
+        self.navs = np.load(navs_path, mmap_mode='r+')
+        self.meta['capacity'] = capacity
+        self.flush()
+
+    def history(self, code):
+        """Dates and NAVs of one scheme as zero-copy views"""
+        row = self.rows[str(code)]
+        return self.dates[:self.length], self.navs[row, :self.length]
+
+    def day_index(self, as_of=None):
+        """Index of the last stored day on or before as_of (the latest day by default)"""
+        if as_of is None:
+            return self.length - 1
+        return int(np.searchsorted(self.dates[:self.length], np.datetime64(as_of, 'D'), side='right')) - 1
+
+    def derive_fields(self, codes, as_of=None, workers=1):
+        """Current NAV, 52-week range and trailing returns for many schemes at once
+
+        Returns float arrays aligned with codes; unknown codes and periods without
+        history are NaN. With workers other than 1 the rows are split across a process
+        pool (0 means one worker per CPU); see parallel_indicators.
+        """
+        rows = np.array([self.rows.get(str(code), -1) for code in codes], dtype=np.intp)
+        known = rows >= 0
+        result = {field: np.full(len(rows), np.nan) for field in HISTORY_FIELDS}
+
+        end = self.day_index(as_of)
+        if end < 0 or not known.any():
+            return result
+
+        if workers != 1:
+            import parallel_indicators
+
+            derived = parallel_indicators.derive_rows_parallel(self, rows[known], end, workers)
+        else:
+            derived = derive_rows(self.navs, self.dates[:self.length], rows[known], end)
+
+        for field, values in derived.items():
+            result[field][known] = values
+        return result
+
+    def fund_updates(self, codes, as_of=None, workers=1):
+        """History-derived fields per code as dicts ready to merge into fund dicts"""
+        return to_fund_updates(codes, self.derive_fields(codes, as_of, workers), self.rows)
+
+    def fund_fields(self, code, as_of=None):
+        """History-derived fields for one scheme as a dict, or None if it is not stored"""
+        return self.fund_updates([code], as_of)[0]
+
+
+def derive_rows(navs, dates, rows, end):
+    """HISTORY_FIELDS arrays for the given rows of a (schemes, days) NAV matrix as of day index end"""
+    end_date = dates[end]
+    current = navs[rows, end]
+    start = int(np.searchsorted(dates, end_date - np.timedelta64(RANGE_DAYS, 'D'), side='right'))
+    window = navs[rows, start:end + 1]
+    result = {field: np.full(len(rows), np.nan) for field in HISTORY_FIELDS}
+
+    # All-NaN windows (schemes launched after the window start) are expected
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        result['current_nav'] = np.array(current, dtype=np.float64)
+        result['52w_high'] = np.nanmax(window, axis=1)
+        result['52w_low'] = np.nanmin(window, axis=1)
+
+        for field, years in RETURN_PERIODS.items():
+            past = int(np.searchsorted(dates, end_date - np.timedelta64(RANGE_DAYS * years, 'D'), side='right')) - 1
+            if past >= 0:
+                result[field] = trailing_return(current, navs[rows, past], years)
+
+    result.update(indicators.compute(navs, dates, rows, end))
+    return result
+
+
+def trailing_return(current, past, years):
+    """Percentage return over `years`; absolute for one year, annualized beyond"""
+    growth = current / past
+    if years == 1:
+        return (growth - 1) * 100
+    return (growth ** (1 / years) - 1) * 100
+
+
+def to_fund_updates(codes, derived, rows):
+    """Turn derived field arrays into per-code dicts ready to merge into fund dicts
+
+    Codes that are not stored map to None; periods without history become None.
+    """
+    values = {field: np.round(column, 4).tolist() for field, column in derived.items()}
+
+    updates = []
+    for i, code in enumerate(codes):
+        if str(code) not in rows:
+            updates.append(None)
+            continue
+        updates.append({
+            field: None if column[i] != column[i] else column[i]
+            for field, column in values.items()
+        })
+    return updates
+
+
+def business_days(start, count):
+    """Weekday dates starting at start, as used for synthetic or backfilled histories"""
+    days = []
+    current = start
+    while len(days) < count:
+        if current.weekday() < 5:
+            days.append(current)
+        current += timedelta(days=1)
+    return days
+
@@ -0,0 +1,229 @@
+"""
+Incremental daily NAV updates for the Indian Mutual Fund Screener
+Keeps persisted rolling state so each new day updates the 52-week range, trailing
+returns and 3-year drawdown in amortized O(1) per scheme instead of rescanning history
+"""
+
+from collections import deque
+from functools import reduce
+import os
+import pickle
+
+import numpy as np
+
+import indicators
+from nav_store import HISTORY_FIELDS, RANGE_DAYS, RETURN_PERIODS, to_fund_updates, trailing_return
+
+STATE_FILE = 'rolling_state.pkl'
+STATE_VERSION = 2
+# Stored days per drawdown summary; derive_fields reads at most this many days of the window
+DRAWDOWN_BLOCK_DAYS = 64
+
+
+class RollingState:
+    """Monotonic max/min deques of (day ordinal, NAV) per scheme, trailing-return pointers and
+    drawdown summaries of fixed blocks of stored days
+
+    blocks maps a block number to the indicators.drawdown_summary of its days for every
+    scheme; block is the running summary of the block that holds the last stored day.
+    """
+
+    def __init__(self, scheme_count):
+        self.highs = [deque() for _ in range(scheme_count)]
+        self.lows = [deque() for _ in range(scheme_count)]
+        self.end = -1
+        self.past = {field: -1 for field in RETURN_PERIODS}
+        self.blocks = {}
+        self.block = None
+
+    @classmethod
+    def rebuild(cls, store):
+        """Build the state from a store's last 52 weeks of history in one vectorized pass, and
+        the drawdown summaries from the blocks its 3-year drawdown window touches"""
+        state = cls(len(store.scheme_codes))
+        end = store.length - 1
+        if end < 0:
+            return state
+
+        dates = store.dates[:store.length]
+        ordinals = _ordinals(dates)
+        start = int(np.searchsorted(ordinals, ordinals[end] - RANGE_DAYS, side='right'))
+        window = np.asarray(store.navs[:, start:end + 1])
+
+        # A value stays in the max deque only while nothing newer is at least as large
+        keep_high = _beats_all_later(np.where(np.isnan(window), -np.inf, window))
+        keep_low = _beats_all_later(np.where(np.isnan(window), -np.inf, -window))
+        window_days = ordinals[start:end + 1].tolist()
+        for row in range(window.shape[0]):
+            values = window[row].tolist()
+            state.highs[row].extend((window_days[i], values[i]) for i in np.flatnonzero(keep_high[row]))
+            state.lows[row].extend((window_days[i], values[i]) for i in np.flatnonzero(keep_low[row]))
+
+        state.end = end
+        for field, years in RETURN_PERIODS.items():
+            state.past[field] = int(np.searchsorted(ordinals, ordinals[end] - RANGE_DAYS * years, side='right')) - 1
+
+        last = end // DRAWDOWN_BLOCK_DAYS
+        for number in range(indicators.drawdown_start(dates, end) // DRAWDOWN_BLOCK_DAYS, last + 1):
+            first = number * DRAWDOWN_BLOCK_DAYS
+            summary = indicators.drawdown_summary(
+                np.asarray(store.navs[:, first:min(first + DRAWDOWN_BLOCK_DAYS, end + 1)]))
+            if number < last:
+                state.blocks[number] = summary
+            else:
+                state.block = summary
+        return state
+
+    def push_day(self, day, navs, dates):
+        """Roll the state forward by one stored day; dates is the store's date axis"""
+        expiry = day - RANGE_DAYS
+
+        for row, nav in enumerate(navs.tolist()):
+            highs = self.highs[row]
+            lows = self.lows[row]
+            if nav == nav:
+                while highs and highs[-1][1] <= nav:
+                    highs.pop()
+                highs.append((day, nav))
+                while lows and lows[-1][1] >= nav:
+                    lows.pop()
+                lows.append((day, nav))
+            while highs and highs[0][0] <= expiry:
+                highs.popleft()
+            while lows and lows[0][0] <= expiry:
+                lows.popleft()
+
+        # Each pointer only ever moves forward, one stored day at a time
+        self.end += 1
+        for field, years in RETURN_PERIODS.items():
+            target = day - RANGE_DAYS * years
+            past = self.past[field]
+            while past + 1 <= self.end and _ordinal(dates[past + 1]) <= target:
+                past += 1
+            self.past[field] = past
+
+        summary = indicators.drawdown_summary(navs[:, None])
+        if self.end % DRAWDOWN_BLOCK_DAYS:
+            self.block = indicators.combine_drawdowns(self.block, summary)
+        else:
+            if self.block is not None:
+                self.blocks[self.end // DRAWDOWN_BLOCK_DAYS - 1] = self.block
+            self.block = summary
+        # Blocks that ended before the drawdown window are never read again
+        start = indicators.drawdown_start(dates[:self.end + 1], self.end)
+        for number in [number for number in self.blocks if (number + 1) * DRAWDOWN_BLOCK_DAYS <= start]:
+            del self.blocks[number]
+
+    def derive_fields(self, store):
+        """Same fields as NavStore.derive_fields for every stored scheme, from the rolling state"""
+        count = len(self.highs)
+        result = {field: np.full(count, np.nan) for field in HISTORY_FIELDS}
+        if self.end < 0:
+            return result
+
+        current = np.asarray(store.navs[:, self.end])
+        result['current_nav'] = current.copy()
+        result['52w_high'] = np.array([highs[0][1] if highs else np.nan for highs in self.highs])
+        result['52w_low'] = np.array([lows[0][1] if lows else np.nan for lows in self.lows])
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for field, years in RETURN_PERIODS.items():
+                if self.past[field] >= 0:
+                    result[field] = trailing_return(current, np.asarray(store.navs[:, self.past[field]]), years)
+
+        # The drawdown comes from the block summaries; the other indicators only read a
+        # bounded trailing window, so they are recomputed each day
+        dates = store.dates[:store.length]
+        result.update(indicators.compute(store.navs, dates, np.arange(count), self.end,
+                                         drawdown=indicators.drawdown_pct(self._drawdown_summary(store, dates))))
+        return result
+
+    def _drawdown_summary(self, store, dates):
+        """Drawdown summary of the trailing window: a partial first block read from the
+        store, then stored block summaries and the running one"""
+        start = indicators.drawdown_start(dates, self.end)
+        last = self.end // DRAWDOWN_BLOCK_DAYS
+        first = -(-start // DRAWDOWN_BLOCK_DAYS)
+        if first > last:
+            return indicators.drawdown_summary(np.asarray(store.navs[:, start:self.end + 1]))
+        parts = [self.blocks[number] for number in range(first, last)] + [self.block]
+        if start < first * DRAWDOWN_BLOCK_DAYS:
+            parts.insert(0, indicators.drawdown_summary(np.asarray(store.navs[:, start:first * DRAWDOWN_BLOCK_DAYS])))
+        return reduce(indicators.combine_drawdowns, parts)
+
+    def fund_updates(self, store, codes):
+        """History-derived fields per code as dicts ready to merge into fund dicts"""
+        derived = self.derive_fields(store)
+        rows = np.array([store.rows.get(str(code), -1) for code in codes], dtype=np.intp)
+        aligned = {field: np.where(rows >= 0, column[rows], np.nan) for field, column in derived.items()}
+        return to_fund_updates(codes, aligned, store.rows)
+
+    def save(self, path):
+        """Persist the state next to its NAV store"""
+        tmp_path = os.path.join(path, STATE_FILE + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': STATE_VERSION, 'highs': self.highs, 'lows': self.lows,
+                         'end': self.end, 'past': self.past, 'blocks': self.blocks, 'block': self.block},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, os.path.join(path, STATE_FILE))
+
+    @classmethod
+    def load(cls, store):
+        """Load the persisted state of a store, rebuilding it if missing or out of date"""
+        state_path = os.path.join(store.path, STATE_FILE)
+        if os.path.exists(state_path):
+            with open(state_path, 'rb') as f:
+                saved = pickle.load(f)
+            if saved.get('version') == STATE_VERSION and saved['end'] == store.length - 1:
+                state = cls(0)
+                state.highs = saved['highs']
+                state.lows = saved['lows']
+                state.end = saved['end']
+                state.past = saved['past']
+                state.blocks = saved['blocks']
+                state.block = saved['block']
+                return state
+        return cls.rebuild(store)
+
+
+def append_day(store, state, day, nav_by_code):
+    """Append one day of NAVs to the store and roll the state forward
+
+    Schemes without a NAV for the day carry their previous NAV forward. Returns False
+    when the day is already stored (e.g. AMFI republished a holiday file).
+    """
+    day = np.datetime64(day, 'D')
+    if store.length and day <= store.dates[store.length - 1]:
+        return False
+
+    if store.length:
+        column = np.array(store.navs[:, store.length - 1])
+    else:
+        column = np.full(len(store.scheme_codes), np.nan)
+    for code, nav in nav_by_code.items():
+        row = store.rows.get(str(code))
+        if row is not None and nav is not None:
+            column[row] = nav
+
+    store.write_days([day], column[:, None])
+    state.push_day(_ordinal(day), column, store.dates)
+    store.flush()
+    state.save(store.path)
+    return True
+
+
+def _beats_all_later(values):
+    """Mask of elements strictly greater than every later element along axis 1"""
+    later_max = np.maximum.accumulate(values[:, ::-1], axis=1)[:, ::-1]
+    later_max = np.concatenate([later_max[:, 1:], np.full((values.shape[0], 1), -np.inf)], axis=1)
+    return (values > later_max) & np.isfinite(values)
+
+
+def _ordinals(dates):
+    """Day numbers of a datetime64[D] array"""
+    return np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+
+
+def _ordinal(day):
+    """Day number of one datetime64[D] value"""
+    return int(np.datetime64(day, 'D').astype(np.int64))
@@ -0,0 +1,279 @@
+"""
+Streaming market-news ingestion
+Parses RSS, Atom and HTML article listings item by item with lxml.etree.iterparse,
+freeing each element once read, so feeds of any size run in flat memory. Items are
+deduplicated by a hash of their normalized text in a bounded LRU set and tagged with
+fund categories, AMCs and an impact in one pass of a precompiled word-level
+Aho-Corasick automaton.
+"""
+
+from collections import OrderedDict, deque
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+import hashlib
+import heapq
+import html
+import re
+
+from lxml import etree
+
+from config import NEWS_CONFIG
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+FEED_TAGS = ('item', f'{ATOM}entry', 'article')
+HTML_MARKERS = (b'<!doctype html', b'<html')
+
+# Phrases after an AMC name that mean the fund house rather than, say, its bank
+AMC_SUFFIXES = ('mutual fund', 'mf', 'amc', 'asset management', 'fund house')
+
+TOKEN = re.compile(r'[a-z0-9&]+')
+TAG = re.compile(r'<[^>]*>')
+WHITESPACE = re.compile(r'\s+')
+
+
+def tokens(text):
+    """Lower-case word tokens; keywords and item text are both matched on these"""
+    return TOKEN.findall(text.lower())
+
+
+class KeywordMatcher:
+    """Word-level Aho-Corasick automaton over keyword phrases, built once and reused
+
+    Every phrase maps to a label; find() walks an item's tokens once and reports the
+    label of every phrase occurrence, however many phrases there are.
+    """
+
+    def __init__(self, phrases):
+        self.goto = [{}]
+        self.outputs = [[]]
+        for phrase, label in phrases.items():
+            node = 0
+            for token in tokens(phrase):
+                if token not in self.goto[node]:
+                    self.goto.append({})
+                    self.outputs.append([])
+                    self.goto[node][token] = len(self.goto) - 1
+                node = self.goto[node][token]
+            if node:
+                self.outputs[node].append(label)
+
+        # Failure links, breadth first: the longest proper suffix that is also a trie path
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self.goto[node].items():
+                fallback = self.fail[node]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+                queue.append(child)
+
+    def find(self, text):
+        """Labels of every phrase occurring in text, in order of occurrence"""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        found = []
+        node = 0
+        for token in tokens(text):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if outputs[node]:
+                found.extend(outputs[node])
+        return found
+
+
+def keyword_phrases(categories=None, amcs=None, impact=None):
+    """{phrase: (kind, name)} for category aliases, AMC names and impact words"""
+    categories = NEWS_CONFIG['categories'] if categories is None else categories
+    amcs = NEWS_CONFIG['amcs'] if amcs is None else amcs
+    impact = NEWS_CONFIG['impact'] if impact is None else impact
+
+    phrases = {}
+    for name, words in impact.items():
+        phrases.update((word, ('impact', name)) for word in words)
+    for name, aliases in categories.items():
+        phrases.update((alias, ('category', name)) for alias in [name, *aliases])
+    for amc in amcs:
+        phrases.update((f'{amc} {suffix}', ('amc', amc)) for suffix in AMC_SUFFIXES)
+        # "SBI Small Cap Fund" names the fund house too
+        for name, aliases in categories.items():
+            phrases.update((f'{amc} {alias}', ('amc', amc)) for alias in [name, *aliases])
+    return phrases
+
+
+@lru_cache(maxsize=None)
+def default_matcher():
+    """Matcher over NEWS_CONFIG keywords, compiled once per process"""
+    return KeywordMatcher(keyword_phrases())
+
+
+def tag(item, matcher=None):
+    """Set categories, amcs and impact on a news item from its headline and summary"""
+    matcher = matcher or default_matcher()
+    categories, amcs, impact = {}, {}, {}
+    for kind, name in matcher.find(f"{item['headline']} . {item['summary']}"):
+        if kind == 'category':
+            categories[name] = True
+        elif kind == 'amc':
+            amcs[name] = True
+        else:
+            impact[name] = impact.get(name, 0) + 1
+
+    positive, negative = impact.get('Positive', 0), impact.get('Negative', 0)
+    item['categories'] = list(categories)
+    item['amcs'] = list(amcs)
+    item['impact'] = 'Positive' if positive > negative else 'Negative' if negative > positive else \
+        'Mixed' if positive else 'Neutral'
+    return item
+
+
+class SeenHashes:
+    """Bounded LRU set of content hashes; the oldest are forgotten beyond max_entries"""
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or NEWS_CONFIG['seen_max_entries']
+        self._hashes = OrderedDict()
+
+    def add(self, digest):
+        """True if digest is new, False if it was seen (and is now the most recent)"""
+        if digest in self._hashes:
+            self._hashes.move_to_end(digest)
+            return False
+        self._hashes[digest] = None
+        if len(self._hashes) > self.max_entries:
+            self._hashes.popitem(last=False)
+        return True
+
+    def __len__(self):
+        return len(self._hashes)
+
+
+def content_hash(item):
+    """Hash of an item's headline and summary, ignoring case, punctuation and spacing"""
+    text = ' '.join(tokens(item['headline'])) + '\n' + ' '.join(tokens(item['summary']))
+    return hashlib.sha1(text.encode('utf-8')).digest()
+
+
+def _clean(text, limit=None):
+    """Plain text from feed markup: tags stripped, entities decoded, whitespace collapsed"""
+    text = WHITESPACE.sub(' ', html.unescape(TAG.sub(' ', text or ''))).strip()
+    if limit and len(text) > limit:
+        text = text[:limit].rsplit(' ', 1)[0] + '…'
+    return text
+
+
+def _date(text):
+    """ISO date from an RFC 822 (RSS) or ISO 8601 (Atom/HTML) timestamp, '' when unparseable"""
+    text = (text or '').strip()
+    if not text:
+        return ''
+    try:
+        return datetime.fromisoformat(text[:10]).date().isoformat()
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(text).date().isoformat()
+    except (TypeError, ValueError, IndexError):
+        return ''
+
+
+def _child_text(element, *names):
+    for name in names:
+        child = element.find(name)
+        if child is not None:
+            return ''.join(child.itertext())
+    return ''
+
+
+def _item(element, source):
+    """News item dict from one <item>, Atom <entry> or HTML <article> element"""
+    summary_chars = NEWS_CONFIG['summary_chars']
+    if element.tag == 'item':
+        headline = element.findtext('title')
+        summary = element.findtext('description')
+        date = element.findtext('pubDate')
+        link = element.findtext('link')
+    elif element.tag == f'{ATOM}entry':
+        headline = _child_text(element, f'{ATOM}title')
+        summary = _child_text(element, f'{ATOM}summary', f'{ATOM}content')
+        date = element.findtext(f'{ATOM}published') or element.findtext(f'{ATOM}updated')
+        link_element = element.find(f'{ATOM}link')
+        link = link_element.get('href') if link_element is not None else ''
+    else:
+        headline = _child_text(element, './/h1', './/h2', './/h3', './/a')
+        summary = _child_text(element, './/p')
+        time_element = element.find('.//time')
+        date = (time_element.get('datetime') or ''.join(time_element.itertext())) if time_element is not None else ''
+        link_element = element.find('.//a[@href]')
+        link = link_element.get('href') if link_element is not None else ''
+
+    return {
+        'headline': _clean(headline),
+        'summary': _clean(summary, summary_chars),
+        'date': _date(date),
+        'link': (link or '').strip(),
+        'source': source,
+    }
+
+
+def parse_feed(stream, source=''):
+    """Yield news items from an open binary RSS, Atom or HTML stream, one element at a time"""
+    head = stream.peek(512)[:512] if hasattr(stream, 'peek') else b''
+    is_html = any(marker in head.lower() for marker in HTML_MARKERS)
+    events = etree.iterparse(stream, events=('end',), tag=FEED_TAGS, html=is_html, recover=True,
+                             huge_tree=True, resolve_entities=False, no_network=True)
+    for _, element in events:
+        item = _item(element, source)
+        # Free the element and every sibling already read, so memory stays flat
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+        if item['headline']:
+            yield item
+
+
+def _open_feed(source, http=None):
+    """Binary stream for a feed URL (through the HTTP cache) or a local file path"""
+    if source.startswith(('http://', 'https://')):
+        if http is None:
+            import http_cache
+
+            http = http_cache.shared_cache()
+        return http.get(source).open()
+    return open(source, 'rb')
+
+
+def iter_news(sources, http=None, seen=None, errors=None):
+    """Yield tagged, deduplicated items from every feed in sources
+
+    A feed that cannot be fetched or parsed is skipped, with its error recorded in
+    errors ({source: message}) when given.
+    """
+    seen = seen if seen is not None else SeenHashes()
+    matcher = default_matcher()
+    for source in sources:
+        try:
+            with _open_feed(source, http) as stream:
+                for item in parse_feed(stream, source):
+                    if seen.add(content_hash(item)):
+                        yield tag(item, matcher)
+        except Exception as e:
+            if errors is None:
+                raise
+            errors[source] = str(e) or type(e).__name__
+
+
+def fetch_news(sources, http=None, max_items=None):
+    """The newest max_items unique items across sources; raises if every feed failed"""
+    max_items = NEWS_CONFIG['max_items'] if max_items is None else max_items
+    errors = {}
+    newest = heapq.nlargest(max_items, iter_news(sources, http, errors=errors), key=lambda item: item['date'])
+    if sources and len(errors) == len(sources):
+        source, error = next(iter(errors.items()))
+        raise RuntimeError(f"all news feeds failed ({source}: {error})")
+    for source, error in errors.items():
+        print(f"⚠️  News feed {source} skipped: {error}")
+    return newest
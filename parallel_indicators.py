@@ -0,0 +1,102 @@
+"""
+Process-pool indicator computation over a shared NAV matrix
+Splits scheme rows into contiguous ranges, one per worker process. Workers map the
+NAV matrix instead of receiving it: a file-backed NavStore is mapped from its .npy
+file, any other matrix is copied once into multiprocessing.shared_memory. Each
+worker writes its slice of one shared result array, so no per-fund arrays are pickled.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+import sys
+
+import numpy as np
+
+from config import INDICATOR_CONFIG
+from nav_store import HISTORY_FIELDS, derive_rows
+
+
+def resolve_workers(workers, count):
+    """Worker processes to use for count schemes: 0 means one per CPU, capped by min_schemes_per_worker"""
+    workers = workers or os.cpu_count() or 1
+    per_worker = max(1, INDICATOR_CONFIG.get('min_schemes_per_worker', 1))
+    return max(1, min(workers, -(-count // per_worker)))
+
+
+def _attach(name):
+    """Attach to a shared memory block owned (and unlinked) by the creating process
+
+    Pool workers share their parent's resource tracker, so before Python 3.13, where
+    attaching cannot opt out of tracking, the duplicate registration is harmless.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def _open_source(source):
+    """(NAV matrix view, shared memory block or None) described by a source tuple"""
+    kind, location, shape, dtype, offset = source
+    if kind == 'file':
+        return np.memmap(location, dtype=dtype, mode='r', shape=shape, offset=offset), None
+    block = _attach(location)
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf), block
+
+
+def _derive_range(source, dates, rows, end, result_name, result_shape, start):
+    """Worker: derive fields for one range of rows, written to result columns start onward"""
+    navs, navs_block = _open_source(source)
+    result_block = _attach(result_name)
+    try:
+        result = np.ndarray(result_shape, dtype=np.float64, buffer=result_block.buf)
+        derived = derive_rows(navs, dates, rows, end)
+        for i, field in enumerate(HISTORY_FIELDS):
+            result[i, start:start + len(rows)] = derived[field]
+        del result, navs
+    finally:
+        result_block.close()
+        if navs_block is not None:
+            navs_block.close()
+    return len(rows)
+
+
+def _share_navs(navs):
+    """(source tuple for workers, shared memory block to release or None)"""
+    if isinstance(navs, np.memmap) and navs.filename and navs.base is not None:
+        return ('file', navs.filename, navs.shape, navs.dtype.str, navs.offset), None
+
+    block = shared_memory.SharedMemory(create=True, size=max(1, navs.nbytes))
+    np.ndarray(navs.shape, dtype=navs.dtype, buffer=block.buf)[:] = navs
+    return ('shm', block.name, navs.shape, navs.dtype.str, 0), block
+
+
+def derive_rows_parallel(store, rows, end, workers=0):
+    """nav_store.derive_rows for a NavStore's rows, computed by a pool of worker processes"""
+    workers = resolve_workers(workers, len(rows))
+    dates = np.asarray(store.dates[:store.length])
+    if workers == 1:
+        return derive_rows(store.navs, dates, rows, end)
+
+    source, navs_block = _share_navs(store.navs)
+    shape = (len(HISTORY_FIELDS), len(rows))
+    result_block = shared_memory.SharedMemory(create=True, size=max(1, 8 * shape[0] * shape[1]))
+    try:
+        bounds = np.linspace(0, len(rows), workers + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_derive_range, source, dates, rows[start:stop], end, result_block.name, shape,
+                                   int(start))
+                       for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+            for future in futures:
+                future.result()
+
+        result = np.ndarray(shape, dtype=np.float64, buffer=result_block.buf)
+        gathered = {field: result[i].copy() for i, field in enumerate(HISTORY_FIELDS)}
+        del result
+        return gathered
+    finally:
+        result_block.close()
+        result_block.unlink()
+        if navs_block is not None:
+            navs_block.close()
+            navs_block.unlink()
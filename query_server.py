@@ -0,0 +1,285 @@
+"""
+Query server for the screened fund universe
+Loads the analysis data export once, indexes it on category, fund manager, AUM bucket
+and recommendation, and answers filter/sort/paginate queries over HTTP from memory.
+Responses carry ETags; when a new run rewrites the export, the dataset is rebuilt in
+the background and swapped in atomically. Everything else is served as static files.
+
+    GET /api/funds?category=Small%20Cap&min_aum_cr=20000&min_momentum_score=80&sort=-aum_cr&page=1
+    GET /api/facets
+    GET /api/health
+"""
+
+from functools import partial
+import hashlib
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from config import EXPORT_CONFIG, QUERY_SERVER_CONFIG
+import exporters
+
+logger = logging.getLogger('mutual_fund_screener.query_server')
+
+INDEXED_FIELDS = ['category', 'fund_manager', 'aum_bucket', 'recommendation']
+DEFAULT_SORT = '-momentum_score'
+UNKNOWN = 'unknown'
+
+
+class QueryError(ValueError):
+    """A query the dataset cannot answer; reported to the client as 400"""
+
+
+def aum_bucket(aum_cr, bounds=None):
+    """Label of the AUM range holding aum_cr, e.g. '5000-20000' or '50000+' (crores)"""
+    bounds = bounds or QUERY_SERVER_CONFIG['aum_buckets_cr']
+    if aum_cr is None or aum_cr != aum_cr:
+        return UNKNOWN
+    if aum_cr < bounds[0]:
+        return f'<{bounds[0]}'
+    for low, high in zip(bounds, bounds[1:]):
+        if aum_cr < high:
+            return f'{low}-{high}'
+    return f'{bounds[-1]}+'
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class FundDataset:
+    """One immutable, indexed snapshot of the screened funds"""
+
+    def __init__(self, funds, version):
+        self.version = version
+        self.loaded_at = time.time()
+        self.count = len(funds)
+        # Rows are encoded once; a page response only joins bytes
+        self.encoded = [json.dumps(fund, separators=(',', ':')).encode('utf-8') for fund in funds]
+
+        self.indexes = {}
+        for field in INDEXED_FIELDS:
+            if field == 'aum_bucket':
+                values = [aum_bucket(fund.get('aum_cr')) for fund in funds]
+            else:
+                values = [fund.get(field) or UNKNOWN for fund in funds]
+            rows = {}
+            for row, value in enumerate(values):
+                rows.setdefault(str(value), []).append(row)
+            self.indexes[field] = {value: np.array(ids, dtype=np.intp) for value, ids in rows.items()}
+
+        names = dict.fromkeys(key for fund in funds for key in fund)
+        self.numeric = {}
+        for name in names:
+            values = [fund.get(name) for fund in funds]
+            if any(_is_number(value) for value in values) and all(value is None or _is_number(value)
+                                                                   for value in values):
+                self.numeric[name] = np.array([np.nan if value is None else value for value in values],
+                                              dtype=np.float64)
+        self.text = {name: [fund.get(name) for fund in funds] for name in names if name not in self.numeric}
+        self._orders = {}
+        self._orders_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, fmt=None):
+        """Dataset from an exported analysis file; its version is a hash of the file"""
+        with open(path, 'rb') as f:
+            version = hashlib.sha256(f.read()).hexdigest()[:16]
+        funds, _ = exporters.load(path, fmt or EXPORT_CONFIG['format'])
+        return cls(funds, version)
+
+    def order(self, sort):
+        """Row order for a sort key like '-aum_cr'; missing values last, ties in export order"""
+        with self._orders_lock:
+            if sort not in self._orders:
+                field = sort.lstrip('-')
+                descending = sort.startswith('-')
+                if field in self.numeric:
+                    values = self.numeric[field]
+                    keys = np.where(np.isnan(values), np.inf, -values if descending else values)
+                    order = np.argsort(keys, kind='stable')
+                elif field in self.text:
+                    present = [row for row, value in enumerate(self.text[field]) if value is not None]
+                    present.sort(key=lambda row: str(self.text[field][row]), reverse=descending)
+                    missing = [row for row, value in enumerate(self.text[field]) if value is None]
+                    order = np.array(present + missing, dtype=np.intp)
+                else:
+                    raise QueryError(f"Unknown sort field '{field}'")
+                self._orders[sort] = order
+            return self._orders[sort]
+
+    def facets(self):
+        """{indexed field: {value: count}}"""
+        return {field: {value: len(rows) for value, rows in index.items()} for field, index in self.indexes.items()}
+
+    def query(self, params):
+        """(total matches, page rows) for parsed query parameters ({name: [values]})"""
+        params = dict(params)
+        sort = params.pop('sort', [DEFAULT_SORT])[-1]
+        page = _positive_int(params.pop('page', ['1'])[-1], 'page')
+        page_size = _positive_int(params.pop('page_size', [str(QUERY_SERVER_CONFIG['page_size'])])[-1],
+                                  'page_size')
+        if page_size > QUERY_SERVER_CONFIG['max_page_size']:
+            raise QueryError(f"page_size may not exceed {QUERY_SERVER_CONFIG['max_page_size']}")
+
+        mask = np.ones(self.count, dtype=bool)
+        for name, values in params.items():
+            if name in self.indexes:
+                selected = np.zeros(self.count, dtype=bool)
+                for value in values:
+                    rows = self.indexes[name].get(value)
+                    if rows is not None:
+                        selected[rows] = True
+                mask &= selected
+            elif name.startswith(('min_', 'max_')) and name[4:] in self.numeric:
+                try:
+                    bound = float(values[-1])
+                except ValueError:
+                    raise QueryError(f"{name} must be a number") from None
+                column = self.numeric[name[4:]]
+                with np.errstate(invalid='ignore'):
+                    mask &= column >= bound if name.startswith('min_') else column <= bound
+            else:
+                raise QueryError(f"Unknown filter '{name}'")
+
+        order = self.order(sort)
+        matched = order[mask[order]]
+        start = (page - 1) * page_size
+        return len(matched), matched[start:start + page_size]
+
+    def page_body(self, total, rows, params):
+        funds = b','.join(self.encoded[row] for row in rows.tolist())
+        head = json.dumps({'total': total, 'version': self.version, 'query': params}, separators=(',', ':'))
+        return head[:-1].encode('utf-8') + b',"funds":[' + funds + b']}'
+
+
+def _positive_int(value, name):
+    try:
+        number = int(value)
+    except ValueError:
+        raise QueryError(f"{name} must be an integer") from None
+    if number < 1:
+        raise QueryError(f"{name} must be at least 1")
+    return number
+
+
+class QueryHandler(SimpleHTTPRequestHandler):
+    """API routes under /api/, static files from the server's directory otherwise"""
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        routes = {'/api/funds': self.funds, '/api/facets': self.facets, '/api/health': self.health}
+        route = routes.get(url.path.rstrip('/'))
+        if route is None:
+            return super().do_GET()
+
+        # One snapshot per request, so a swap mid-request cannot mix datasets
+        dataset = self.server.dataset
+        params = parse_qs(url.query, keep_blank_values=True)
+        try:
+            route(dataset, params)
+        except QueryError as e:
+            self.send_json(400, json.dumps({'error': str(e)}).encode('utf-8'))
+
+    def funds(self, dataset, params):
+        canonical = json.dumps(sorted(params.items()), separators=(',', ':'))
+        etag = f'"{dataset.version}-{hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]}"'
+        if etag in (self.headers.get('If-None-Match') or ''):
+            return self.send_json(304, b'', etag)
+        total, rows = dataset.query(params)
+        self.send_json(200, dataset.page_body(total, rows, params), etag)
+
+    def facets(self, dataset, params):
+        etag = f'"{dataset.version}-facets"'
+        if etag in (self.headers.get('If-None-Match') or ''):
+            return self.send_json(304, b'', etag)
+        self.send_json(200, json.dumps(dataset.facets(), separators=(',', ':')).encode('utf-8'), etag)
+
+    def health(self, dataset, params):
+        body = {'version': dataset.version, 'funds': dataset.count, 'loaded_at': dataset.loaded_at}
+        self.send_json(200, json.dumps(body).encode('utf-8'))
+
+    def send_json(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        if status != 304:
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+
+class QueryServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the current dataset; swap() replaces it atomically"""
+
+    daemon_threads = True
+
+    def __init__(self, address, data_path, fmt=None, directory='.', reload_seconds=None, verbose=False):
+        self.data_path = data_path
+        self.fmt = fmt
+        self.verbose = verbose
+        self.dataset = FundDataset.load(data_path, fmt)
+        self._stamp = _file_stamp(data_path)
+        self._stop = threading.Event()
+        super().__init__(address, partial(QueryHandler, directory=directory))
+
+        reload_seconds = QUERY_SERVER_CONFIG['reload_seconds'] if reload_seconds is None else reload_seconds
+        self._watcher = None
+        if reload_seconds:
+            self._watcher = threading.Thread(target=self._watch, args=(reload_seconds,), daemon=True,
+                                             name='dataset-watcher')
+            self._watcher.start()
+
+    def swap(self, dataset):
+        """Serve dataset from the next request on; requests in flight keep their snapshot"""
+        self.dataset = dataset
+
+    def reload_if_changed(self):
+        """Rebuild and swap in the dataset when the export file changed; True if swapped"""
+        stamp = _file_stamp(self.data_path)
+        if stamp is None or stamp == self._stamp:
+            return False
+        try:
+            dataset = FundDataset.load(self.data_path, self.fmt)
+        except Exception:
+            # Truncated or foreign file; keep serving the old snapshot until the file changes again
+            logger.warning('Could not reload %s; keeping the current dataset', self.data_path, exc_info=True)
+            self._stamp = stamp
+            return False
+        self._stamp = stamp
+        if dataset.version == self.dataset.version:
+            return False
+        self.swap(dataset)
+        return True
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.reload_if_changed()
+            except Exception:
+                logger.exception('Dataset reload failed; keeping the current dataset')
+
+    def server_close(self):
+        self._stop.set()
+        super().server_close()
+
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,109 @@
+"""
+Ranking for screened funds
+Orders the full screen by momentum score, and selects the best K funds overall or
+per category with heapq / np.partition instead of sorting the whole screened list
+
+The full screen keeps input order for equal scores, as the original per-fund sort
+did. Leaderboard ties are broken deterministically: higher momentum score, then
+deeper drawdown from the 52-week high, then larger AUM, then lower expense ratio,
+then fund code.
+"""
+
+import heapq
+import math
+
+import numpy as np
+
+
+def _descending(value):
+    """Sort key for a field where larger is better; missing values rank last"""
+    if value is None or value != value:
+        return math.inf
+    return -value
+
+
+def _ascending(value):
+    """Sort key for a field where smaller is better; missing values rank last"""
+    if value is None or value != value:
+        return math.inf
+    return value
+
+
+def order_by_score(scores):
+    """Indices that order scores highest first, keeping input order for equal scores
+
+    Integer scores that fit in int16 (the capped momentum score always does) are
+    radix sorted by NumPy's stable sort in O(n); others fall back to a merge sort.
+    """
+    scores = np.asarray(scores)
+    if scores.dtype.kind in 'iu' and len(scores) and -2 ** 15 < scores.min() and scores.max() < 2 ** 15:
+        scores = scores.astype(np.int16)
+    return np.argsort(-scores, kind='stable')
+
+
+def rank_key(fund):
+    """Full multi-key ordering of a fund dict, smallest first"""
+    return (
+        _descending(fund.get('momentum_score')),
+        _descending(fund.get('drawdown_from_high')),
+        _descending(fund.get('aum_cr')),
+        _ascending(fund.get('expense_ratio')),
+        str(fund.get('fund_code', '')),
+    )
+
+
+def top_k(funds, k, per_category=False):
+    """Best k fund dicts overall, or a {category: [funds]} dict of the best k per category"""
+    if not per_category:
+        return heapq.nsmallest(k, funds, key=rank_key)
+
+    by_category = {}
+    for fund in funds:
+        by_category.setdefault(fund.get('category'), []).append(fund)
+    return {category: heapq.nsmallest(k, members, key=rank_key) for category, members in by_category.items()}
+
+
+def _sort_keys(columns, index):
+    """np.lexsort keys for the rows in index, least significant first"""
+    def descending(name):
+        values = -np.asarray(columns[name], dtype=np.float64)[index]
+        return np.where(np.isnan(values), np.inf, values)
+
+    expense = np.asarray(columns['expense_ratio'], dtype=np.float64)[index]
+    return (
+        np.asarray(columns['fund_code'])[index],
+        np.where(np.isnan(expense), np.inf, expense),
+        descending('aum_cr'),
+        descending('drawdown_from_high'),
+        descending('momentum_score'),
+    )
+
+
+def top_k_indices(columns, k, index=None):
+    """Row indices of the best k funds in column arrays, best first
+
+    columns maps momentum_score, drawdown_from_high, aum_cr, expense_ratio and
+    fund_code to equal-length arrays. Only rows scoring at least the k-th best
+    score are ordered, so the cost is O(n + c log c) for c such candidates.
+    """
+    index = np.arange(len(columns['momentum_score'])) if index is None else np.asarray(index)
+    if k <= 0 or not len(index):
+        return index[:0]
+
+    score = -np.asarray(columns['momentum_score'], dtype=np.float64)[index]
+    score = np.where(np.isnan(score), np.inf, score)
+    if k < len(index):
+        threshold = np.partition(score, k - 1)[k - 1]
+        index = index[score <= threshold]
+
+    order = np.lexsort(_sort_keys(columns, index))
+    return index[order[:k]]
+
+
+def top_k_indices_per_category(columns, k):
+    """{category: row indices of its best k funds} from column arrays"""
+    categories = np.asarray(columns['category'])
+    result = {}
+    for category in dict.fromkeys(categories.tolist()):
+        result[category] = top_k_indices(columns, k, np.flatnonzero(categories == category))
+    return result
@@ -0,0 +1,206 @@
+"""
+Sharded static report output for the Indian Mutual Fund Screener
+Writes paginated per-category JSON shards that a small index page fetches lazily
+as the user scrolls or filters, instead of embedding every fund row inline
+"""
+
+from html import escape
+import json
+import os
+import re
+
+# Row layout of every shard; kept short because it is repeated for every fund
+SHARD_COLUMNS = [
+    'fund_name', 'fund_manager', 'category', 'aum_cr', '1y_return', '3y_return', '5y_return',
+    '10y_return', 'momentum_score', 'beaten_down_level', 'recovery_potential_pct', 'recommendation',
+    'redundant_with', 'redundant_correlation'
+]
+
+MANIFEST_FILE = 'manifest.json'
+
+BROWSER_SECTION = """
+        <div class="funds-table">
+            <h2>🔎 All Screened Funds</h2>
+            <div class="market-overview">{summary_cards}
+            </div>
+            <label for="category-filter">Category: </label>
+            <select id="category-filter"><option value="all">All categories</option></select>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Fund Name</th>
+                        <th>Category</th>
+                        <th>AUM (₹Cr)</th>
+                        <th>1Y Return</th>
+                        <th>3Y Return</th>
+                        <th>5Y Return</th>
+                        <th>10Y Return</th>
+                        <th>Momentum Score</th>
+                        <th>Beaten Down Level</th>
+                        <th>Recovery Potential</th>
+                        <th>Recommendation</th>
+                    </tr>
+                </thead>
+                <tbody id="all-funds-body"></tbody>
+            </table>
+            <div id="shard-sentinel" style="height: 1px;"></div>
+        </div>
+        <script>
+        (function () {{
+            var manifestUrl = {manifest_url};
+            var baseUrl = manifestUrl.slice(0, manifestUrl.lastIndexOf('/') + 1);
+            var select = document.getElementById('category-filter');
+            var body = document.getElementById('all-funds-body');
+            var sentinel = document.getElementById('shard-sentinel');
+            var manifest = null, queue = [], loading = false, generation = 0;
+
+            function number(value, digits, sign) {{
+                if (value === null) return 'N/A';
+                return (sign && value >= 0 ? '+' : '') + value.toFixed(digits) + '%';
+            }}
+            function cell(row, text, className, style) {{
+                var td = document.createElement('td');
+                if (className) td.className = className;
+                if (style) td.setAttribute('style', style);
+                td.textContent = text;
+                row.appendChild(td);
+                return td;
+            }}
+            function addRow(values) {{
+                var f = {{}};
+                manifest.columns.forEach(function (name, i) {{ f[name] = values[i]; }});
+                var tr = document.createElement('tr');
+                var name = cell(tr, '');
+                var strong = document.createElement('strong');
+                strong.textContent = f.fund_name;
+                var small = document.createElement('small');
+                small.textContent = 'Manager: ' + (f.fund_manager === null ? 'N/A' : f.fund_manager);
+                name.appendChild(strong);
+                name.appendChild(document.createElement('br'));
+                name.appendChild(small);
+                if (f.redundant_with) {{
+                    var redundant = document.createElement('small');
+                    redundant.className = 'redundant';
+                    redundant.textContent = 'Moves with ' + f.redundant_with +
+                        ' (ρ ' + f.redundant_correlation.toFixed(2) + ')';
+                    name.appendChild(document.createElement('br'));
+                    name.appendChild(redundant);
+                }}
+                cell(tr, f.category === null ? 'N/A' : f.category);
+                cell(tr, f.aum_cr === null ? 'N/A' : '₹' + f.aum_cr.toLocaleString('en-US'));
+                cell(tr, number(f['1y_return'], 1, true), '', 'color: red; font-weight: bold;');
+                cell(tr, number(f['3y_return'], 1));
+                cell(tr, number(f['5y_return'], 1));
+                cell(tr, number(f['10y_return'], 1));
+                cell(tr, f.momentum_score + '/100').style.fontWeight = 'bold';
+                cell(tr, f.beaten_down_level, 'beaten-down-' + f.beaten_down_level.toLowerCase());
+                cell(tr, number(f.recovery_potential_pct, 1));
+                var badge = document.createElement('span');
+                badge.className = 'recommendation ' + f.recommendation.toLowerCase().replace(/ /g, '-');
+                badge.textContent = f.recommendation;
+                cell(tr, '').appendChild(badge);
+                body.appendChild(tr);
+            }}
+            function sentinelVisible() {{
+                return sentinel.getBoundingClientRect().top < window.innerHeight + 200;
+            }}
+            function loadNext() {{
+                if (loading || !queue.length) return;
+                loading = true;
+                var current = generation;
+                fetch(baseUrl + queue.shift()).then(function (r) {{ return r.json(); }}).then(function (rows) {{
+                    if (current === generation) rows.forEach(addRow);
+                }}).finally(function () {{
+                    if (current !== generation) return;
+                    loading = false;
+                    if (sentinelVisible()) loadNext();
+                }});
+            }}
+            function show(slug) {{
+                generation += 1;
+                loading = false;
+                body.textContent = '';
+                queue = [];
+                Object.keys(manifest.categories).forEach(function (key) {{
+                    if (slug === 'all' || slug === key) queue = queue.concat(manifest.categories[key].shards);
+                }});
+                loadNext();
+            }}
+            fetch(manifestUrl).then(function (r) {{ return r.json(); }}).then(function (m) {{
+                manifest = m;
+                Object.keys(m.categories).forEach(function (key) {{
+                    var option = document.createElement('option');
+                    option.value = key;
+                    option.textContent = m.categories[key].name + ' (' + m.categories[key].count + ')';
+                    select.appendChild(option);
+                }});
+                select.addEventListener('change', function () {{ show(select.value); }});
+                new IntersectionObserver(function (entries) {{
+                    if (entries[0].isIntersecting) loadNext();
+                }}).observe(sentinel);
+                show(select.value);
+            }});
+        }})();
+        </script>
+"""
+
+SUMMARY_CARD = """
+                <div class="metric-card">
+                    <div class="metric-value">{value}</div>
+                    <div class="metric-label">{label}</div>
+                </div>"""
+
+
+def category_slug(category):
+    """File-name-safe key for a category, e.g. 'Large & Mid Cap' -> 'large-mid-cap'"""
+    slug = re.sub(r'[^a-z0-9]+', '-', str(category or 'uncategorized').lower()).strip('-')
+    return slug or 'uncategorized'
+
+
+def clear_shards(shard_dir):
+    """Create shard_dir, removing the shards and manifest of any previous run"""
+    os.makedirs(shard_dir, exist_ok=True)
+    for name in os.listdir(shard_dir):
+        if name.endswith('.json'):
+            os.remove(os.path.join(shard_dir, name))
+
+
+def write_shards(shard_dir, screened_funds, shard_size):
+    """Write per-category JSON shards of at most shard_size funds plus a manifest"""
+    clear_shards(shard_dir)
+
+    by_category = {}
+    for fund in screened_funds:
+        by_category.setdefault(fund.get('category'), []).append(fund)
+
+    categories = {}
+    for category, funds in by_category.items():
+        slug = category_slug(category)
+        while slug in categories:
+            slug += '-x'
+        shards = []
+        for page, start in enumerate(range(0, len(funds), shard_size)):
+            file_name = f'{slug}-{page}.json'
+            rows = [[fund.get(column) for column in SHARD_COLUMNS] for fund in funds[start:start + shard_size]]
+            with open(os.path.join(shard_dir, file_name), 'w', encoding='utf-8') as f:
+                json.dump(rows, f, separators=(',', ':'))
+            shards.append(file_name)
+        categories[slug] = {'name': category, 'count': len(funds), 'shards': shards}
+
+    manifest = {'columns': SHARD_COLUMNS, 'shard_size': shard_size, 'categories': categories}
+    with open(os.path.join(shard_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    return manifest
+
+
+def render_browser_section(manifest_url, screened_funds):
+    """Summary cards plus the lazily filled, filterable table of every screened fund"""
+    counts = {}
+    for fund in screened_funds:
+        counts[fund['recommendation']] = counts.get(fund['recommendation'], 0) + 1
+
+    cards = [SUMMARY_CARD.format(value=f"{len(screened_funds):,}", label='Funds Screened')]
+    for recommendation in ('Strong Buy', 'Buy', 'Hold', 'Avoid'):
+        cards.append(SUMMARY_CARD.format(value=f"{counts.get(recommendation, 0):,}", label=escape(recommendation)))
+
+    return BROWSER_SECTION.format(summary_cards=''.join(cards), manifest_url=json.dumps(manifest_url))
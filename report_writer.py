@@ -0,0 +1,366 @@
+"""
+Streaming HTML report writer for the Indian Mutual Fund Screener
+Renders the report as a sequence of chunks from pre-built templates so it can be
+written straight to a file handle without building the whole page in memory
+"""
+
+from html import escape
+
+import fund_records
+
+PAGE_HEADER = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Indian Mutual Fund Recovery Screener</title>
+    <style>
+        body {{
+            font-family: 'Arial', sans-serif;
+            margin: 0;
+            padding: 20px;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: #333;
+        }}
+        .container {{
+            max-width: 1400px;
+            margin: 0 auto;
+            background: white;
+            border-radius: 15px;
+            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
+            overflow: hidden;
+        }}
+        .header {{
+            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+            color: white;
+            padding: 30px;
+            text-align: center;
+        }}
+        .header h1 {{
+            margin: 0;
+            font-size: 2.5em;
+            margin-bottom: 10px;
+        }}
+        .timestamp {{
+            font-size: 0.9em;
+            opacity: 0.8;
+        }}
+        .market-overview {{
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            padding: 30px;
+            background: #f8f9fa;
+        }}
+        .metric-card {{
+            background: white;
+            padding: 20px;
+            border-radius: 10px;
+            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+            text-align: center;
+        }}
+        .metric-value {{
+            font-size: 1.8em;
+            font-weight: bold;
+            color: #2a5298;
+        }}
+        .metric-label {{
+            font-size: 0.9em;
+            color: #666;
+            margin-top: 5px;
+        }}
+        .funds-table {{
+            padding: 30px;
+        }}
+        table {{
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 20px;
+            background: white;
+            border-radius: 10px;
+            overflow: hidden;
+            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+        }}
+        th {{
+            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+            color: white;
+            padding: 15px;
+            text-align: left;
+            font-weight: 600;
+        }}
+        td {{
+            padding: 12px 15px;
+            border-bottom: 1px solid #eee;
+        }}
+        tr:hover {{
+            background: #f8f9fa;
+        }}
+        .recommendation {{
+            padding: 8px 12px;
+            border-radius: 20px;
+            font-weight: bold;
+            color: white;
+            text-align: center;
+        }}
+        .strong-buy {{ background: #28a745; }}
+        .buy {{ background: #007bff; }}
+        .hold {{ background: #ffc107; color: #333; }}
+        .avoid {{ background: #dc3545; }}
+        .beaten-down-high {{ color: #dc3545; font-weight: bold; }}
+        .beaten-down-medium {{ color: #fd7e14; font-weight: bold; }}
+        .beaten-down-low {{ color: #20c997; font-weight: bold; }}
+        .redundant {{ color: #fd7e14; }}
+        .news-section {{
+            padding: 30px;
+            background: #f8f9fa;
+        }}
+        .news-item {{
+            background: white;
+            margin: 15px 0;
+            padding: 20px;
+            border-radius: 10px;
+            border-left: 5px solid #2a5298;
+        }}
+        .news-headline {{
+            font-weight: bold;
+            margin-bottom: 10px;
+            color: #1e3c72;
+        }}
+        .footer {{
+            text-align: center;
+            padding: 20px;
+            background: #1e3c72;
+            color: white;
+            font-size: 0.9em;
+        }}
+        .disclaimer {{
+            margin-top: 10px;
+            font-size: 0.8em;
+            opacity: 0.8;
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🚀 Indian Mutual Fund Recovery Screener</h1>
+            <p>Identifying Beaten-Down Funds with Comeback Potential</p>
+            <div class="timestamp">Last Updated: {current_time}</div>{fetch_notice}
+        </div>
+
+        <div class="market-overview">
+            <div class="metric-card">
+                <div class="metric-value">{nifty_level}</div>
+                <div class="metric-label">NIFTY 50 Level</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{nifty_pe}</div>
+                <div class="metric-label">NIFTY 50 P/E</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{market_cap_to_gdp}</div>
+                <div class="metric-label">Market Cap/GDP</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{market_valuation}</div>
+                <div class="metric-label">Market Valuation</div>
+            </div>
+        </div>
+
+        <div class="funds-table">
+            <h2>🎯 Top Beaten-Down Funds with Recovery Potential</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Fund Name</th>
+                        <th>Category</th>
+                        <th>AUM (₹Cr)</th>
+                        <th>1Y Return</th>
+                        <th>3Y Return</th>
+                        <th>5Y Return</th>
+                        <th>10Y Return</th>
+                        <th>Momentum Score</th>
+                        <th>Beaten Down Level</th>
+                        <th>Recovery Potential</th>
+                        <th>Recommendation</th>
+                    </tr>
+                </thead>
+                <tbody>"""
+
+FUND_ROW = """
+                    <tr>
+                        <td><strong>{fund_name}</strong><br>
+                            <small>Manager: {fund_manager}</small>{redundancy}</td>
+                        <td>{category}</td>
+                        <td>{aum}</td>
+                        <td style="color: red; font-weight: bold;">{return_1y}</td>
+                        <td>{return_3y}</td>
+                        <td>{return_5y}</td>
+                        <td>{return_10y}</td>
+                        <td><strong>{momentum_score}/100</strong></td>
+                        <td class="{beaten_down_class}">{beaten_down_level}</td>
+                        <td>{recovery_potential}</td>
+                        <td><span class="recommendation {recommendation_class}">{recommendation}</span></td>
+                    </tr>"""
+
+TABLE_FOOTER = """
+                </tbody>
+            </table>
+        </div>
+"""
+
+NEWS_HEADER = """
+        <div class="news-section">
+            <h2>📰 Market News & Scenarios</h2>"""
+
+NEWS_ITEM = """
+            <div class="news-item">
+                <div class="news-headline">{headline}</div>
+                <div>{summary}</div>
+                <small style="color: #666;">Impact: {impact} | Date: {date}{tags}</small>
+            </div>"""
+
+PAGE_FOOTER = """
+        </div>
+
+        <div class="footer">
+            <p><strong>Indian Mutual Fund Recovery Screener</strong></p>
+            <p>Veteran Analyst's Algorithm for Identifying Comeback Opportunities</p>
+            <div class="disclaimer">
+                Disclaimer: This is for educational purposes only. Past performance does not guarantee future results. 
+                Please consult with a financial advisor before making investment decisions.
+            </div>{run_stats}
+        </div>
+    </div>
+</body>
+</html>"""
+
+RUN_STATS = """
+            <div class="disclaimer">
+                Run stats: {stages}
+            </div>"""
+
+
+def _number(value, spec, prefix='', suffix=''):
+    """Format a numeric field, showing N/A when the value is missing"""
+    if value is None:
+        return 'N/A'
+    return f"{prefix}{format(value, spec)}{suffix}"
+
+
+def _text(value):
+    """Escape a text field for HTML, showing N/A when the value is missing"""
+    return 'N/A' if value is None else escape(str(value))
+
+
+def render_header(current_time, nifty_valuation, fetch_errors=None):
+    """Page head, market overview cards and the fund table header"""
+    valuation = nifty_valuation
+    fetch_notice = ''
+    if fetch_errors:
+        fetch_notice = f"""
+            <div class="timestamp">⚠️ Partial data: {escape(', '.join(sorted(fetch_errors)))} unavailable for this run</div>"""
+
+    return PAGE_HEADER.format(
+        current_time=escape(current_time),
+        fetch_notice=fetch_notice,
+        nifty_level=_number(valuation.get('nifty_50_level'), ','),
+        nifty_pe=_text(valuation.get('nifty_50_pe')),
+        market_cap_to_gdp=_number(valuation.get('market_cap_to_gdp'), '', suffix='%'),
+        market_valuation=_text(valuation.get('current_vs_historical')),
+    )
+
+
+# Fields a fund table row shows, in the order _render_row takes them
+ROW_FIELDS = ('fund_name', 'fund_manager', 'category', 'aum_cr', '1y_return', '3y_return', '5y_return',
+              '10y_return', 'momentum_score', 'beaten_down_level', 'recovery_potential_pct', 'recommendation',
+              'redundant_with', 'redundant_correlation')
+
+
+def render_fund_row(fund):
+    """One fund table row, noting the better-ranked pick it moves with when it is redundant"""
+    return _render_row(*next(fund_records.pick([fund], ROW_FIELDS)))
+
+
+def _render_row(fund_name, fund_manager, category, aum_cr, return_1y, return_3y, return_5y, return_10y,
+                momentum_score, beaten_down_level, recovery_potential_pct, recommendation, redundant_with,
+                redundant_correlation):
+    redundancy = ''
+    if redundant_with:
+        redundancy = (f'<br>\n                            <small class="redundant">Moves with '
+                      f'{_text(redundant_with)} (ρ {redundant_correlation:.2f})</small>')
+
+    return FUND_ROW.format(
+        fund_name=_text(fund_name),
+        fund_manager=_text(fund_manager),
+        redundancy=redundancy,
+        category=_text(category),
+        aum=_number(aum_cr, ',', prefix='₹'),
+        return_1y=_number(return_1y, '+.1f', suffix='%'),
+        return_3y=_number(return_3y, '.1f', suffix='%'),
+        return_5y=_number(return_5y, '.1f', suffix='%'),
+        return_10y=_number(return_10y, '.1f', suffix='%'),
+        momentum_score=momentum_score,
+        beaten_down_class=escape(f"beaten-down-{beaten_down_level.lower()}"),
+        beaten_down_level=_text(beaten_down_level),
+        recovery_potential=_number(recovery_potential_pct, '.1f', suffix='%'),
+        recommendation_class=escape(recommendation.lower().replace(' ', '-')),
+        recommendation=_text(recommendation),
+    )
+
+
+def render_news_item(news):
+    """One market news block, linked to the story and tagged with its categories and AMCs"""
+    headline = _text(news.get('headline'))
+    if (news.get('link') or '').startswith(('http://', 'https://')):
+        headline = f'<a href="{escape(news["link"])}" rel="noopener">{headline}</a>'
+    tags = [*news.get('categories', []), *news.get('amcs', [])]
+    return NEWS_ITEM.format(
+        headline=headline,
+        summary=_text(news.get('summary')),
+        impact=_text(news.get('impact')),
+        date=_text(news.get('date')),
+        tags=f" | Tags: {escape(', '.join(tags))}" if tags else '',
+    )
+
+
+def render_run_stats(records):
+    """Footer block listing each instrumented stage's wall time, CPU time and memory peak"""
+    stages = []
+    for record in records:
+        text = f"{record['stage']} {record['wall_seconds']:.2f}s wall / {record['cpu_seconds']:.2f}s CPU"
+        if record.get('peak_bytes') is not None:
+            text += f" / {record['peak_bytes'] / 2 ** 20:.1f} MiB peak"
+        stages.append(escape(text))
+    return RUN_STATS.format(stages=' · '.join(stages))
+
+
+def render_footer(run_stats=None):
+    """Close the news section and write the page footer, with run stats when given"""
+    return PAGE_FOOTER.format(run_stats=render_run_stats(run_stats) if run_stats else '')
+
+
+def iter_report(current_time, screened_funds, nifty_valuation, news_data, fetch_errors=None,
+                after_table='', run_stats=None):
+    """Yield the report as HTML chunks: header, one chunk per fund row and news item, footer"""
+    yield render_header(current_time, nifty_valuation, fetch_errors)
+
+    for row in fund_records.pick(screened_funds, ROW_FIELDS):
+        yield _render_row(*row)
+
+    yield TABLE_FOOTER
+    if after_table:
+        yield after_table
+    yield NEWS_HEADER
+
+    for news in news_data:
+        yield render_news_item(news)
+
+    yield render_footer(run_stats)
+
+
+def write_report(out, current_time, screened_funds, nifty_valuation, news_data, fetch_errors=None,
+                 run_stats=None):
+    """Stream the report to an open text file handle"""
+    out.writelines(iter_report(current_time, screened_funds, nifty_valuation, news_data, fetch_errors,
+                               run_stats=run_stats))
@@ -0,0 +1,144 @@
+"""
+Content-addressed cache of finished runs
+Keys each run by a hash of its fetched inputs, the screening/scoring/report config and
+the code version, and keeps the screened funds plus the files the run wrote. A run
+whose inputs are unchanged (a market holiday, a re-triggered job) restores those files
+byte-for-byte instead of screening and rendering again.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import config
+import fund_records
+
+MANIFEST_FILE = 'manifest.json'
+FILES_DIR = 'files'
+
+# Config blocks that change what a run writes
+OUTPUT_CONFIG = ['SCREENING_CONFIG', 'SCORING_WEIGHTS', 'SCORING_RULES', 'RECOMMENDATION_THRESHOLDS',
+                 'RECOMMENDATION_LABELS', 'BEATEN_DOWN_LEVELS', 'CORRELATION_CONFIG', 'EXPORT_CONFIG', 'REPORT_CONFIG']
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_code_version = None
+
+
+def code_version():
+    """Hash of the pipeline's own modules (tests excluded), computed once per process"""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        for path in sorted(glob.glob(os.path.join(SOURCE_DIR, '*.py'))):
+            if os.path.basename(path).startswith('test_'):
+                continue
+            digest.update(os.path.basename(path).encode('utf-8'))
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+
+def fingerprint(inputs):
+    """Cache key for a run over inputs (a JSON-serializable dict) with the current config and code"""
+    digest = hashlib.sha256()
+    payload = {
+        'inputs': inputs,
+        'config': {name: getattr(config, name) for name in OUTPUT_CONFIG},
+        'code_version': code_version(),
+    }
+    digest.update(json.dumps(payload, sort_keys=True, separators=(',', ':'),
+                             default=fund_records.json_default).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def nav_store_state(store):
+    """Identity of a NAV store's contents as of its latest day, for inclusion in the inputs"""
+    if store is None:
+        return None
+    latest = store.navs[:, store.length - 1] if store.length else b''
+    return {
+        'schemes': len(store.scheme_codes),
+        'days': int(store.length),
+        'last_date': str(store.dates[store.length - 1]) if store.length else None,
+        'latest_navs': hashlib.sha256(bytes(memoryview(latest))).hexdigest() if store.length else None,
+    }
+
+
+class ResultCache:
+    """Screened funds and output files of recent runs, one directory per fingerprint"""
+
+    def __init__(self, cache_dir=None, max_entries=None):
+        self.cache_dir = cache_dir or config.RESULT_CACHE_CONFIG['cache_dir']
+        self.max_entries = max_entries if max_entries is not None else config.RESULT_CACHE_CONFIG['max_entries']
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key):
+        """The stored manifest for key ({'files': [...], 'screened_funds': [...], ...}) or None"""
+        manifest_path = os.path.join(self._entry(key), MANIFEST_FILE)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not all(os.path.exists(os.path.join(self._entry(key), FILES_DIR, path)) for path in manifest['files']):
+            return None
+        # Recently used entries survive eviction
+        os.utime(manifest_path)
+        return manifest
+
+    def restore(self, key, manifest, root='.'):
+        """Copy the stored files of an entry back over their original paths under root"""
+        for path in manifest['files']:
+            target = os.path.join(root, path)
+            if os.path.dirname(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp_path = target + '.tmp'
+            shutil.copyfile(os.path.join(self._entry(key), FILES_DIR, path), tmp_path)
+            os.replace(tmp_path, target)
+
+    def store(self, key, files, screened_funds, extra=None, root='.'):
+        """Save a run's output files (paths relative to root) and screened funds under key"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=key[:12] + '.', dir=self.cache_dir)
+        try:
+            relative = []
+            for path in files:
+                path = os.path.relpath(os.path.join(root, path), root)
+                if path.startswith(os.pardir):
+                    raise ValueError(f"Result file {path} is outside {root}")
+                stored = os.path.join(staging, FILES_DIR, path)
+                os.makedirs(os.path.dirname(stored), exist_ok=True)
+                shutil.copyfile(os.path.join(root, path), stored)
+                relative.append(path.replace(os.sep, '/'))
+
+            manifest = {'files': relative, 'screened_funds': screened_funds, 'stored_at': time.time(),
+                        **(extra or {})}
+            with open(os.path.join(staging, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, separators=(',', ':'), default=fund_records.json_default)
+
+            entry = self._entry(key)
+            if os.path.exists(entry):
+                shutil.rmtree(entry)
+            os.replace(staging, entry)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Drop the least recently used entries beyond max_entries"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            manifest_path = os.path.join(self.cache_dir, name, MANIFEST_FILE)
+            if os.path.exists(manifest_path):
+                entries.append((os.path.getmtime(manifest_path), name))
+        for _, name in sorted(entries, reverse=True)[self.max_entries:]:
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
@@ -0,0 +1,141 @@
+"""
+Declarative scoring rules for the Indian Mutual Fund Screener
+Compiles SCORING_RULES, RECOMMENDATION_THRESHOLDS and BEATEN_DOWN_LEVELS from config.py
+once into vectorized NumPy expressions, with a matching scalar path for single funds
+"""
+
+import operator
+
+import numpy as np
+
+import config
+
+OPERATORS = {
+    '<': (np.less, operator.lt),
+    '<=': (np.less_equal, operator.le),
+    '>': (np.greater, operator.gt),
+    '>=': (np.greater_equal, operator.ge),
+    '==': (np.equal, operator.eq),
+}
+
+
+def _compile_bands(bands, where):
+    """Validate (operator, threshold, value) bands and bind their comparison functions"""
+    if not bands:
+        raise ValueError(f"{where}: at least one band is required")
+    compiled = []
+    for op, threshold, value in bands:
+        if op not in OPERATORS:
+            raise ValueError(f"{where}: unknown operator '{op}', expected one of {', '.join(OPERATORS)}")
+        vector_op, scalar_op = OPERATORS[op]
+        compiled.append((vector_op, scalar_op, threshold, value))
+    return compiled
+
+
+def _as_number(value):
+    return np.nan if value is None else value
+
+
+class RuleProgram:
+    """Compiled scoring, recommendation and beaten-down-level rules"""
+
+    def __init__(self, rules, weights, thresholds, labels, levels):
+        self.max_score = sum(weights.values())
+        self.rules = []
+        factor_points = {}
+
+        for rule in rules:
+            factor = rule['factor']
+            if factor not in weights:
+                raise ValueError(f"Scoring rule factor '{factor}' has no entry in SCORING_WEIGHTS")
+            where = f"scoring rule {factor}/{rule['field']}"
+            bands = _compile_bands(rule['bands'], where)
+            otherwise = rule.get('otherwise', 0)
+            self.rules.append((rule['field'], bands, otherwise))
+            factor_points[factor] = factor_points.get(factor, 0) + max([otherwise] + [b[3] for b in bands])
+
+        for factor, points in factor_points.items():
+            if points > weights[factor]:
+                raise ValueError(f"Scoring factor '{factor}' can award {points} points, "
+                                 f"above its SCORING_WEIGHTS cap of {weights[factor]}")
+
+        # Highest threshold first; the lowest one is the fallback recommendation
+        ordered = sorted(thresholds.items(), key=lambda item: item[1], reverse=True)
+        self.recommendation_bands = [(threshold, labels[name]) for name, threshold in ordered[:-1]]
+        self.recommendation_default = labels[ordered[-1][0]]
+
+        self.level_field = levels['field']
+        self.level_bands = _compile_bands(levels['bands'], 'beaten-down levels')
+        self.level_default = levels['otherwise']
+
+        self.fields = list(dict.fromkeys([field for field, _, _ in self.rules] + [self.level_field]))
+
+    def score(self, columns):
+        """Momentum score for every fund from a dict of column arrays"""
+        total = 0
+        for field, bands, otherwise in self.rules:
+            values = columns[field]
+            total = total + np.select([op(values, threshold) for op, _, threshold, _ in bands],
+                                      [points for _, _, _, points in bands], otherwise)
+        return np.minimum(total, self.max_score)
+
+    def recommend(self, scores):
+        """Recommendation label for every score"""
+        return np.select([scores >= threshold for threshold, _ in self.recommendation_bands],
+                         [label for _, label in self.recommendation_bands], self.recommendation_default)
+
+    def beaten_down_level(self, columns):
+        """Beaten-down level label for every fund"""
+        values = columns[self.level_field]
+        return np.select([op(values, threshold) for op, _, threshold, _ in self.level_bands],
+                         [label for _, _, _, label in self.level_bands], self.level_default)
+
+    def score_one(self, values):
+        """Momentum score of one fund from a dict of field values"""
+        total = 0
+        for field, bands, otherwise in self.rules:
+            value = _as_number(values.get(field))
+            points = otherwise
+            for _, op, threshold, band_points in bands:
+                if op(value, threshold):
+                    points = band_points
+                    break
+            total += points
+        return min(total, self.max_score)
+
+    def recommend_one(self, score):
+        """Recommendation label of one score"""
+        for threshold, label in self.recommendation_bands:
+            if score >= threshold:
+                return label
+        return self.recommendation_default
+
+    def beaten_down_level_one(self, values):
+        """Beaten-down level label of one fund"""
+        value = _as_number(values.get(self.level_field))
+        for _, op, threshold, label in self.level_bands:
+            if op(value, threshold):
+                return label
+        return self.level_default
+
+
+def compile_rules(rules=None, weights=None, thresholds=None, labels=None, levels=None):
+    """Compile rule definitions, defaulting to the ones in config.py"""
+    return RuleProgram(
+        config.SCORING_RULES if rules is None else rules,
+        config.SCORING_WEIGHTS if weights is None else weights,
+        config.RECOMMENDATION_THRESHOLDS if thresholds is None else thresholds,
+        config.RECOMMENDATION_LABELS if labels is None else labels,
+        config.BEATEN_DOWN_LEVELS if levels is None else levels,
+    )
+
+
+_default_program = None
+
+
+def default_program():
+    """Rule program compiled from config.py on first use and reused afterwards"""
+    global _default_program
+    if _default_program is None:
+        _default_program = compile_rules()
+    return _default_program
@@ -0,0 +1,97 @@
+"""
+Vectorized scoring engine for the Indian Mutual Fund Screener
+Computes momentum indicators and recommendations for a whole fund universe in one pass,
+using the rule program compiled from config.py
+"""
+
+import numpy as np
+
+import fund_records
+import rules
+
+# Fund fields needed for the 52-week positioning plus the ones the default rules read
+SCORE_FIELDS = ['current_nav', '52w_high', '52w_low', '1y_return', '5y_return', 'aum_cr', 'expense_ratio']
+
+# Fields computed before the rules run, so rules may reference them
+DERIVED_FIELDS = ['drawdown_from_high', 'recovery_potential_pct']
+
+# Computed fields, in the order the per-fund path adds them to a fund dict
+OUTPUT_FIELDS = ['momentum_score', 'drawdown_from_high', 'recovery_potential_pct', 'beaten_down_level', 'recommendation']
+
+
+def input_fields(program=None):
+    """Fund fields the scoring pass reads: the 52-week positioning inputs plus rule fields"""
+    program = program or rules.default_program()
+    fields = dict.fromkeys(SCORE_FIELDS)
+    fields.update((field, None) for field in program.fields if field not in DERIVED_FIELDS)
+    return list(fields)
+
+
+def build_columns(funds, program=None, fields=None):
+    """Pack the scoring inputs of a list of fund dicts into float64 column arrays
+
+    Missing or None values become NaN, which compares false against every threshold.
+    Pass fields to pack other numeric fields as well.
+    """
+    fields = input_fields(program) if fields is None else fields
+    return {
+        field: np.array([fund.get(field) for fund in funds], dtype=np.float64)
+        for field in fields
+    }
+
+
+def round_like_python(values, ndigits=2):
+    """Round an array exactly as the builtin round() does for each element"""
+    rounded = np.round(values, ndigits)
+
+    # np.round scales by 10**ndigits first, which can tip values sitting right on a
+    # half-way point to the other side; redo those few with the builtin
+    scaled = values * 10 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), ndigits)
+
+    return rounded
+
+
+def unknown_as_none(values):
+    """Object array of values with NaN replaced by None, so unknowns export as null and render as N/A"""
+    return np.where(np.isnan(values), None, values)
+
+
+def score_columns(columns, program=None):
+    """Calculate momentum indicators and recommendations for every fund at once"""
+    program = program or rules.default_program()
+    current_nav = columns['current_nav']
+    high_52w = columns['52w_high']
+    low_52w = columns['52w_low']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown_from_high = ((high_52w - current_nav) / high_52w) * 100
+        # A flat 52-week range has no position within it, so the positioning is unknown
+        range_52w = high_52w - low_52w
+        recovery_potential = np.where(range_52w != 0, ((current_nav - low_52w) / range_52w) * 100, np.nan)
+
+    # Rules see the unrounded positioning, exactly like the per-fund path
+    inputs = {**columns, 'drawdown_from_high': drawdown_from_high, 'recovery_potential_pct': recovery_potential}
+    momentum_score = program.score(inputs)
+
+    return {
+        'momentum_score': momentum_score,
+        'drawdown_from_high': round_like_python(drawdown_from_high),
+        'recovery_potential_pct': round_like_python(recovery_potential),
+        'beaten_down_level': program.beaten_down_level(inputs),
+        'recommendation': program.recommend(momentum_score),
+    }
+
+
+def to_records(funds, scored, indices):
+    """FundRecords of the funds merged with their computed fields, in the order given by indices"""
+    indices = np.asarray(indices, dtype=np.intp)
+    columns = []
+    for name in OUTPUT_FIELDS:
+        values = scored[name][indices]
+        if values.dtype.kind == 'f':
+            values = unknown_as_none(values)
+        columns.append((name, values.tolist()))
+    return fund_records.merge(funds, indices.tolist(), columns)
@@ -0,0 +1,135 @@
+"""
+Screening predicates compiled from SCREENING_CONFIG
+Rejects non-candidate funds while they are ingested and before they are scored,
+counting how many rows each predicate rejected
+"""
+
+from collections import namedtuple, OrderedDict
+
+import numpy as np
+
+from config import SCREENING_CONFIG
+from nav_store import RETURN_PERIODS
+from rules import OPERATORS
+
+# op is a key of rules.OPERATORS, or None for "the field must be known";
+# keep_missing decides whether an unknown value passes
+Predicate = namedtuple('Predicate', ['name', 'field', 'op', 'threshold', 'keep_missing'])
+
+
+def _track_record_field(years):
+    """Shortest trailing-return field that proves at least this many years of history"""
+    periods = sorted((period, field) for field, period in RETURN_PERIODS.items() if period >= years)
+    if not periods:
+        raise ValueError(f"min_track_record_years={years} is longer than any return period")
+    return periods[0][1]
+
+
+def compile_predicates(screening_config=None):
+    """Predicates for a SCREENING_CONFIG-shaped dict, cheapest and most selective first
+
+    AUM and expense ratio are not published in every source (AMFI's NAV file has
+    neither), so funds missing them are kept; a missing 1Y return is rejected since
+    the fund cannot be scored.
+    """
+    screening_config = SCREENING_CONFIG if screening_config is None else screening_config
+    predicates = []
+
+    if screening_config.get('min_negative_1y_return') is not None:
+        threshold = screening_config['min_negative_1y_return']
+        predicates.append(Predicate(f'1y_return < {threshold}', '1y_return', '<', threshold, False))
+    if screening_config.get('min_aum_crores') is not None:
+        threshold = screening_config['min_aum_crores']
+        predicates.append(Predicate(f'aum_cr >= {threshold}', 'aum_cr', '>=', threshold, True))
+    if screening_config.get('max_expense_ratio') is not None:
+        threshold = screening_config['max_expense_ratio']
+        predicates.append(Predicate(f'expense_ratio <= {threshold}', 'expense_ratio', '<=', threshold, True))
+    if screening_config.get('min_track_record_years'):
+        field = _track_record_field(screening_config['min_track_record_years'])
+        predicates.append(Predicate(f'{field} known', field, None, None, False))
+
+    return predicates
+
+
+class ScreenFilter:
+    """Compiled screening predicates plus per-predicate rejection counts
+
+    A row is charged to the first predicate it fails, so the counts add up to the
+    number of rejected rows whichever path (per-record or columnar) rejected them.
+    """
+
+    def __init__(self, predicates):
+        self.predicates = list(predicates)
+        self.rejected = OrderedDict((predicate.name, 0) for predicate in self.predicates)
+
+    @property
+    def fields(self):
+        return list(dict.fromkeys(predicate.field for predicate in self.predicates))
+
+    def reset(self):
+        for name in self.rejected:
+            self.rejected[name] = 0
+
+    def new_counts(self):
+        """Zeroed rejection counts, for a caller that must not share self.rejected"""
+        return OrderedDict((name, 0) for name in self.rejected)
+
+    def accepts(self, fund, deferred_fields=(), rejected=None, updates=None):
+        """Check one fund dict during ingestion
+
+        Predicates on fields the record does not carry, or on deferred_fields (values
+        that NAV history will replace later), are left for mask(). Fields in updates
+        are read from it instead of fund, as if it had been merged in. Rejections are
+        counted in rejected when given, self.rejected otherwise.
+        """
+        rejected = self.rejected if rejected is None else rejected
+        for predicate in self.predicates:
+            if predicate.field in deferred_fields:
+                continue
+            if updates is not None and predicate.field in updates:
+                value = updates[predicate.field]
+            elif predicate.field in fund:
+                value = fund[predicate.field]
+            else:
+                continue
+            if value is None or value != value:
+                passed = predicate.keep_missing
+            elif predicate.op is None:
+                passed = True
+            else:
+                passed = OPERATORS[predicate.op][1](value, predicate.threshold)
+            if not passed:
+                rejected[predicate.name] += 1
+                return False
+        return True
+
+    def mask(self, columns):
+        """Boolean mask of the rows in float64 column arrays that pass every predicate"""
+        keep = None
+        for predicate in self.predicates:
+            values = columns[predicate.field]
+            missing = np.isnan(values)
+            if predicate.op is None:
+                passed = ~missing
+            else:
+                with np.errstate(invalid='ignore'):
+                    passed = OPERATORS[predicate.op][0](values, predicate.threshold)
+                passed = np.where(missing, predicate.keep_missing, passed)
+
+            if keep is None:
+                keep = np.ones(len(values), dtype=bool)
+            self.rejected[predicate.name] += int(np.count_nonzero(keep & ~passed))
+            keep &= passed
+
+        if keep is None:
+            count = len(next(iter(columns.values()))) if columns else 0
+            keep = np.ones(count, dtype=bool)
+        return keep
+
+    def summary(self):
+        """'predicate: count' pairs of the predicates that rejected anything"""
+        return ', '.join(f'{name}: {count:,}' for name, count in self.rejected.items() if count)
+
+
+def compile_filter(screening_config=None):
+    return ScreenFilter(compile_predicates(screening_config))
@@ -0,0 +1,148 @@
+"""
+Deterministic synthetic data shared by the tests and the benchmarks
+Fund dicts before and after screening, a NAVAll.txt plus NAV store universe of any
+size, and RSS feeds with repeated stories; every generator is seeded, so repeat runs
+produce identical data
+"""
+
+from datetime import date
+import os
+import random
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from nav_store import NavStore, business_days
+
+CATEGORIES = ['Small Cap', 'Mid Cap', 'Large Cap', 'Flexi Cap', 'ELSS', 'Large & Mid Cap']
+AMCS = ['HDFC', 'SBI', 'Axis', 'Nippon India', 'Kotak', 'Tata', 'Motilal Oswal', 'Franklin India']
+
+
+def synthetic_funds(count, seed=7):
+    """Random fund universe that also lands on every scoring threshold"""
+    rng = random.Random(seed)
+    funds = []
+
+    for i in range(count):
+        low = rng.uniform(5, 500)
+        high = low * rng.uniform(1.01, 1.8)
+        funds.append({
+            'fund_name': f'Synthetic Fund {i}',
+            'fund_code': f'SYN_{i}',
+            'category': rng.choice(['Small Cap', 'Mid Cap', 'Large Cap']),
+            'aum_cr': rng.choice([10000, rng.randint(100, 90000)]),
+            '1y_return': rng.choice([-10, -5, 0, round(rng.uniform(-25, 15), 1)]),
+            '3y_return': round(rng.uniform(-5, 30), 1),
+            '5y_return': rng.choice([10, 15, round(rng.uniform(-5, 30), 1)]),
+            '10y_return': round(rng.uniform(0, 25), 1),
+            'current_nav': rng.uniform(low, high),
+            '52w_high': high,
+            '52w_low': low,
+            'expense_ratio': rng.choice([1.5, round(rng.uniform(0.2, 2.5), 2)]),
+            'fund_manager': 'Synthetic Manager'
+        })
+
+    # Exactly on the 30% and 70% positioning boundaries
+    funds[0].update({'52w_low': 100.0, '52w_high': 200.0, 'current_nav': 130.0})
+    funds[1].update({'52w_low': 100.0, '52w_high': 200.0, 'current_nav': 170.0})
+    return funds
+
+
+def synthetic_screened_funds(count, seed=42):
+    """Screened-fund dicts shaped like screen_beaten_down_funds output"""
+    rng = random.Random(seed)
+    funds = []
+    for i in range(count):
+        score = rng.randint(20, 100)
+        funds.append({
+            'fund_name': f'Synthetic Small & Mid Cap Fund {i}',
+            'fund_manager': f'Manager {i % 300}',
+            'category': rng.choice(['Small Cap', 'Mid Cap', 'Large Cap']),
+            'aum_cr': rng.randint(100, 90000),
+            '1y_return': round(rng.uniform(-25, -0.1), 1),
+            '3y_return': round(rng.uniform(-5, 30), 1),
+            '5y_return': round(rng.uniform(-5, 30), 1),
+            '10y_return': round(rng.uniform(0, 25), 1),
+            'momentum_score': score,
+            'beaten_down_level': rng.choice(['High', 'Medium', 'Low']),
+            'recovery_potential_pct': round(rng.uniform(0, 100), 2),
+            'recommendation': 'Strong Buy' if score >= 80 else 'Buy' if score >= 65 else 'Hold' if score >= 50 else 'Avoid',
+        })
+    return funds
+
+
+def synthetic_universe(count, years, directory, seed=2024):
+    """Write a NAVAll.txt and a NAV store for count schemes; return (navall path, store, static fields)
+
+    NAVs are geometric random walks with per-scheme drift and volatility; about one
+    scheme in six launches part-way through the history.
+    """
+    rng = np.random.default_rng(seed)
+    codes = np.arange(100000, 100000 + count)
+    days = business_days(date(2016, 1, 4), years * 261)
+
+    store = NavStore.create(os.path.join(directory, 'nav_store'), codes.tolist(), days[0], len(days))
+    drift = rng.normal(0.0003, 0.0004, count)[:, None]
+    volatility = rng.uniform(0.004, 0.018, count)[:, None]
+    launch = np.where(rng.random(count) < 1 / 6, rng.integers(0, len(days), count), 0)[:, None]
+    level = np.log(rng.uniform(10, 500, count))[:, None]
+
+    # One year of days at a time keeps generation memory at count x 261 floats
+    for start in range(0, len(days), 261):
+        block = days[start:start + 261]
+        steps = drift + volatility * rng.standard_normal((count, len(block)))
+        log_navs = level + np.cumsum(steps, axis=1)
+        level = log_navs[:, -1:]
+        navs = np.exp(log_navs)
+        navs[np.arange(start, start + len(block))[None, :] < launch] = np.nan
+        store.write_days(block, navs)
+    store.flush()
+
+    categories = rng.integers(0, len(CATEGORIES), count)
+    amcs = rng.integers(0, len(AMCS), count)
+    static = {}
+    for i, code in enumerate(codes.tolist()):
+        static[code] = {
+            'aum_cr': int(rng.integers(100, 90000)),
+            'expense_ratio': round(float(rng.uniform(0.2, 2.5)), 2),
+            'fund_manager': f'Manager {i % 500}',
+        }
+
+    navall = os.path.join(directory, 'NAVAll.txt')
+    last = store.navs[:, store.length - 1]
+    as_of = days[-1].strftime('%d-%b-%Y')
+    with open(navall, 'w', encoding='utf-8') as f:
+        f.write('Scheme Code;ISIN Div Payout/ ISIN Growth;ISIN Div Reinvestment;Scheme Name;Net Asset Value;Date\n')
+        for c, category in enumerate(CATEGORIES):
+            f.write(f'\nOpen Ended Schemes(Equity Scheme - {category} Fund)\n\n')
+            for a, amc in enumerate(AMCS):
+                rows = np.flatnonzero((categories == c) & (amcs == a))
+                if not len(rows):
+                    continue
+                f.write(f'{amc} Mutual Fund\n\n')
+                for row in rows.tolist():
+                    nav = 'N.A.' if np.isnan(last[row]) else f'{last[row]:.4f}'
+                    f.write(f'{codes[row]};INF{codes[row]:09d};-;{amc} {category} Fund {row} - Direct Plan - Growth;'
+                            f'{nav};{as_of}\n')
+    return navall, store, static
+
+
+HEADLINES = [
+    ('SBI Small Cap Fund stops lump-sum inflows after rally', 'Small caps surge for a fifth week.'),
+    ('Midcap stocks slump as FIIs sell', 'The selloff hit mid-cap funds hardest; HDFC Mutual Fund saw outflows.'),
+    ('RBI holds rates', 'No change in the repo rate.'),
+]
+
+
+def rss_feed(count, duplicate_every=3):
+    """RSS 2.0 feed of count items; every duplicate_every-th item repeats an earlier story"""
+    items = []
+    for i in range(count):
+        story = i - 1 if i % duplicate_every == duplicate_every - 1 else i
+        headline, summary = HEADLINES[story % len(HEADLINES)]
+        items.append(f"""<item><title>{escape(headline)} #{story}</title>
+<description>&lt;p&gt;{escape(summary)}&lt;/p&gt;</description>
+<link>https://news.example.com/{i}</link>
+<pubDate>{['Mon', 'Tue', 'Wed'][i % 3]}, {1 + i % 28:02d} Sep 2026 09:30:00 +0530</pubDate></item>""")
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel><title>Markets</title>'
+            + '\n'.join(items) + '</channel></rss>')
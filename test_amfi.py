@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming AMFI NAVAll.txt parser
+Runs against a generated fixture file and a local HTTP stand-in for amfiindia.com
+"""
+
+from datetime import date
+import time
+
+import amfi
+from http_cache import HttpCache
+from mutual_fund_screener import IndianMutualFundScreener
+
+SAMPLE = """Scheme Code;ISIN Div Payout/ ISIN Growth;ISIN Div Reinvestment;Scheme Name;Net Asset Value;Date\r
+ \r
+Open Ended Schemes(Equity Scheme - Small Cap Fund)\r
+ \r
+Nippon India Mutual Fund\r
+ \r
+118778;INF204K01K15;-;Nippon India Small Cap Fund - Direct Plan - Growth Plan - Growth Option;178.9123;16-Oct-2026\r
+118779;-;-;Nippon India Small Cap Fund - Direct Plan - IDCW Option;N.A.;16-Oct-2026\r
+ \r
+SBI Mutual Fund\r
+ \r
+125497;INF200K01T51;INF200K01T69;SBI Small Cap Fund - Direct Plan - Growth;1,118.90;15-Oct-2026\r
+ \r
+Open Ended Schemes(Equity Scheme - Mid Cap Fund)\r
+ \r
+HDFC Mutual Fund\r
+ \r
+118989;INF179K01XQ0;-;HDFC Mid Cap Opportunities Fund - Growth Option - Direct Plan;165.20;16-Oct-2026\r
+"""
+
+
+def write_universe(path, schemes_per_amc=500, amcs=30):
+    """Write a NAVAll.txt-shaped fixture of roughly amcs * schemes_per_amc rows"""
+    code = 100000
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('Scheme Code;ISIN Div Payout/ ISIN Growth;ISIN Div Reinvestment;Scheme Name;Net Asset Value;Date\r\n')
+        for amc in range(amcs):
+            f.write(f' \r\nOpen Ended Schemes(Equity Scheme - Category {amc % 7})\r\n \r\nAMC {amc} Mutual Fund\r\n \r\n')
+            for _ in range(schemes_per_amc):
+                code += 1
+                f.write(f'{code};INF{code:09d};-;AMC {amc} Scheme {code} - Direct Plan - Growth;{code / 1000:.4f};16-Oct-2026\r\n')
+    return code - 100000
+
+
+def test_parses_sections_and_typed_fields(tmp_path):
+    path = tmp_path / 'NAVAll.txt'
+    path.write_text(SAMPLE, encoding='utf-8', newline='')
+
+    schemes = list(amfi.stream_schemes(str(path)))
+
+    assert [s.scheme_code for s in schemes] == [118778, 118779, 125497, 118989]
+    assert schemes[0].amc == 'Nippon India Mutual Fund'
+    assert schemes[0].scheme_type == 'Open Ended Schemes'
+    assert schemes[0].category == 'Equity Scheme - Small Cap Fund'
+    assert schemes[0].nav == 178.9123
+    assert schemes[0].nav_date == date(2026, 10, 16)
+    assert schemes[0].isin_reinvestment is None
+    assert schemes[1].nav is None and schemes[1].isin_growth is None
+    assert schemes[2].amc == 'SBI Mutual Fund' and schemes[2].nav == 1118.90
+    assert schemes[3].amc == 'HDFC Mutual Fund'
+    assert amfi.short_category(schemes[3].category) == 'Mid Cap'
+
+
+def test_streams_from_local_http_stand_in(tmp_path, stand_in):
+    amfi_site = stand_in(SAMPLE)
+
+    screener = IndianMutualFundScreener(http=HttpCache(cache_dir=str(tmp_path / 'cache')))
+    funds = screener.fetch_mutual_fund_data(source=amfi_site.url + 'NAVAll.txt')
+
+    assert len(funds) == 4
+    assert screener.funds_data is funds
+    assert funds[2] == {
+        'fund_name': 'SBI Small Cap Fund - Direct Plan - Growth',
+        'fund_code': '125497',
+        'category': 'Small Cap',
+        'amc': 'SBI Mutual Fund',
+        'isin': 'INF200K01T51',
+        'current_nav': 1118.90,
+        'nav_date': '2026-10-15'
+    }
+
+
+def test_full_universe_parses_quickly(tmp_path):
+    path = tmp_path / 'NAVAll.txt'
+    expected = write_universe(path)
+
+    start = time.perf_counter()
+    count = sum(1 for _ in amfi.stream_schemes(str(path)))
+    elapsed = time.perf_counter() - start
+
+    assert count == expected == 15000
+    assert elapsed < 1.0
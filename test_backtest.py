@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized backtest
+Recommendations replayed across all rebalance dates at once must match screening
+and scoring the fields NavStore.derive_fields gives on each of those dates
+"""
+
+import numpy as np
+import pytest
+
+import backtest
+from synthetic_data import synthetic_universe
+import scoring
+import screening
+
+
+@pytest.fixture
+def universe(tmp_path):
+    _, store, static = synthetic_universe(150, 3, str(tmp_path))
+    fields = {
+        field: np.array([static.get(int(code), {}).get(field, np.nan) for code in store.scheme_codes], dtype=np.float64)
+        for field in ('aum_cr', 'expense_ratio')
+    }
+    return store, fields
+
+
+def live_recommendations(store, static, as_of):
+    """What the screener pipeline recommends for every stored scheme on one day"""
+    columns = store.derive_fields(store.scheme_codes, as_of)
+    columns.update(static)
+    screen_filter = screening.compile_filter()
+    keep = screen_filter.mask(columns)
+    return np.where(keep, scoring.score_columns(columns)['recommendation'], '')
+
+
+def test_rebalance_days_are_last_day_of_each_week_after_one_year():
+    dates = np.arange(np.datetime64('2020-01-01'), np.datetime64('2021-03-01'))
+    dates = dates[(dates.astype('datetime64[D]').view('int64') - 4) % 7 < 5]  # weekdays
+
+    days = backtest.rebalance_days(dates)
+
+    assert all(dates[day].astype(object).weekday() == 4 for day in days)
+    assert dates[days[0]] - np.timedelta64(365, 'D') >= dates[0]
+    monthly = backtest.rebalance_days(dates, 'monthly')
+    assert dates[monthly].astype(str).tolist() == ['2020-12-31', '2021-01-29', '2021-02-26']
+    with pytest.raises(ValueError):
+        backtest.rebalance_days(dates, 'daily')
+
+
+def test_rolling_extreme_matches_window_loop():
+    navs = np.random.default_rng(5).normal(size=(4, 50))
+    navs[1, :20] = np.nan
+
+    rolled = backtest._rolling_extreme(navs, 7, np.fmax)
+
+    for i in range(50):
+        window = navs[:, i:i + 7]
+        expected = [np.nan if np.isnan(row).all() else np.nanmax(row) for row in window]
+        np.testing.assert_array_equal(rolled[:, i], expected)
+
+
+def test_history_columns_match_nav_store(universe):
+    store, _ = universe
+    dates = np.asarray(store.dates[:store.length])
+    ends = backtest.rebalance_days(dates)[::10]
+
+    columns = backtest.history_columns(np.asarray(store.navs[:, :store.length]), dates, ends)
+
+    for i, end in enumerate(ends):
+        derived = store.derive_fields(store.scheme_codes, dates[end])
+        for field, values in columns.items():
+            np.testing.assert_allclose(values[:, i], derived[field], rtol=1e-12, equal_nan=True, err_msg=field)
+
+
+def test_recommendations_match_live_pipeline(universe):
+    store, static = universe
+    dates = np.asarray(store.dates[:store.length])
+    ends = backtest.rebalance_days(dates)[::7]
+
+    labels = backtest.recommendations(np.asarray(store.navs[:, :store.length]), dates, ends, static)
+
+    for i, end in enumerate(ends):
+        np.testing.assert_array_equal(labels[:, i], live_recommendations(store, static, dates[end]))
+
+
+def test_run_backtest_reports_every_bucket(universe, monkeypatch):
+    store, static = universe
+    monkeypatch.setattr(backtest, 'BLOCK_ROWS', 64)
+
+    result = backtest.run_backtest(store, static)
+
+    buckets = result['buckets']
+    assert list(buckets) == ['Strong Buy', 'Buy', 'Hold', 'Avoid', backtest.ALL_FUNDS]
+    for horizon in backtest.HORIZONS:
+        assert sum(buckets[label][horizon]['count'] for label in list(buckets)[:-1]) <= \
+            buckets[backtest.ALL_FUNDS][horizon]['count']
+        stats = buckets[backtest.ALL_FUNDS][horizon]
+        assert 0 <= stats['hit_rate'] <= 1
+    # Later horizons run out of future NAVs sooner
+    assert buckets[backtest.ALL_FUNDS]['12m']['count'] < buckets[backtest.ALL_FUNDS]['3m']['count']
+    assert 'Strong Buy' in backtest.format_report(result)
+
+
+def test_static_fields_follow_store_rows():
+    funds = [{'fund_code': '7', 'aum_cr': 5000, 'expense_ratio': 0.8}, {'fund_code': 'OTHER', 'aum_cr': 1}]
+
+    fields = backtest.static_fields(funds, ['9', '7'])
+
+    np.testing.assert_array_equal(fields['aum_cr'], [np.nan, 5000])
+    np.testing.assert_array_equal(fields['expense_ratio'], [np.nan, 0.8])
+    assert '1y_return' not in fields
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the batched, cached benchmark index loader
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from benchmark_indices import BenchmarkLoader
+from mutual_fund_screener import IndianMutualFundScreener
+
+INDICES = {'nifty_50': '^NSEI', 'nifty_500': '^CRSLDX'}
+
+
+class FakeDownloader:
+    """Stands in for yf.download; returns a (Price, Ticker) frame like yfinance does"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, tickers, start, end):
+        self.calls.append((list(tickers), start, end))
+        days = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1))
+        closes = {ticker: 20000.0 + (i + 1) * np.arange(len(days)) for i, ticker in enumerate(tickers)}
+        columns = pd.MultiIndex.from_product([['Close', 'Open'], tickers], names=['Price', 'Ticker'])
+        values = np.column_stack([closes[t] for t in tickers] * 2)
+        return pd.DataFrame(values, index=days, columns=columns)
+
+
+def test_single_batched_download_then_only_missing_range(tmp_path):
+    cache = str(tmp_path / 'benchmarks.npz')
+    downloader = FakeDownloader()
+
+    first = BenchmarkLoader(cache, INDICES, downloader, today=date(2026, 10, 9)).load()
+    assert len(downloader.calls) == 1
+    assert downloader.calls[0][0] == ['^NSEI', '^CRSLDX']
+    assert first.dates[-1] == np.datetime64('2026-10-09')
+
+    # The last stored day is downloaded again, replacing a possibly provisional close
+    later = BenchmarkLoader(cache, INDICES, downloader, today=date(2026, 10, 16)).load()
+    assert downloader.calls[1][1:] == ('2026-10-09', '2026-10-17')
+    assert len(later.dates) == len(first.dates) + 5
+    assert np.all(np.diff(later.dates.astype(np.int64)) > 0)
+    assert later.closes[0, len(first.dates) - 1] == 20000.0
+
+    # Same day again: only that day is downloaded
+    again = BenchmarkLoader(cache, INDICES, downloader, today=date(2026, 10, 16)).load()
+    assert downloader.calls[2][1:] == ('2026-10-16', '2026-10-17')
+    np.testing.assert_array_equal(again.dates, later.dates)
+
+
+def test_screener_uses_latest_levels(tmp_path):
+    loader = BenchmarkLoader(str(tmp_path / 'b.npz'), INDICES, FakeDownloader(), today=date(2026, 10, 16))
+    screener = IndianMutualFundScreener(benchmarks=loader)
+
+    valuation = screener.fetch_nifty_valuation_data()
+    dates, closes = loader.history('nifty_50')
+    assert valuation['nifty_50_level'] == round(float(closes[-1]))
+    assert valuation['nifty_500_level'] == round(loader.latest_levels()['nifty_500'])
+    assert valuation['nifty_50_pe'] == 22.0
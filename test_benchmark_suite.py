@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-stage benchmark suite
+Runs a tiny synthetic universe end to end and checks the regression check
+"""
+
+from benchmarks import suite
+
+
+def test_tiny_universe_runs_every_stage(tmp_path):
+    results = suite.run_size(200, 2, 1, str(tmp_path))
+
+    assert list(results) == ['ingest', 'indicators', 'scoring', 'ranking', 'html_render', 'json_export']
+    assert all(metrics['seconds'] > 0 and metrics['peak_bytes'] >= 0 for metrics in results.values())
+    assert (tmp_path / 'out' / 'index.html').exists()
+
+
+def test_synthetic_universe_is_deterministic(tmp_path):
+    first = suite.synthetic_universe(50, 1, str(tmp_path / 'a'))
+    second = suite.synthetic_universe(50, 1, str(tmp_path / 'b'))
+
+    assert (tmp_path / 'a' / 'NAVAll.txt').read_text() == (tmp_path / 'b' / 'NAVAll.txt').read_text()
+    assert first[2] == second[2]
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = {'1000': {'scoring': {'seconds': 0.1, 'peak_bytes': 1000},
+                         'ranking': {'seconds': 0.001, 'peak_bytes': 1000}}}
+    results = {'1000': {'scoring': {'seconds': 0.14, 'peak_bytes': 1100},
+                        'ranking': {'seconds': 0.004, 'peak_bytes': 1000}}}
+
+    assert suite.compare(results, baseline, tolerance=0.25) == [
+        '1000 schemes / scoring: 140.0 ms vs baseline 100.0 ms'
+    ]
+    assert suite.compare(results, baseline, tolerance=0.5) == []
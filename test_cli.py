@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the command-line entry point
+"""
+
+import json
+
+import pytest
+
+from benchmarks import bench_startup
+import cli
+import config
+
+
+def test_help_imports_no_heavy_dependencies():
+    _, heavy = bench_startup.summarize(bench_startup.import_profile())
+
+    assert heavy == []
+
+
+def test_fetch_screen_render_matches_run(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    work_dir = str(tmp_path / 'work')
+
+    cli.main(['--work-dir', work_dir, 'fetch'])
+    cli.main(['--work-dir', work_dir, 'screen'])
+    cli.main(['--work-dir', work_dir, 'render'])
+    staged = (tmp_path / 'index.html').read_text(encoding='utf-8')
+    staged_data = json.loads((tmp_path / 'fund_analysis_data.json').read_text())
+
+    cli.main(['run'])
+    single = (tmp_path / 'index.html').read_text(encoding='utf-8')
+    single_data = json.loads((tmp_path / 'fund_analysis_data.json').read_text())
+
+    def without_timestamp(html):
+        return [line for line in html.splitlines() if 'Last Updated' not in line]
+
+    assert without_timestamp(staged) == without_timestamp(single)
+    assert staged_data['screened_funds'] == single_data['screened_funds']
+    assert 'Screened 8 beaten-down funds' in capsys.readouterr().out
+
+
+def test_fetch_time_rejections_reach_render(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(config.SCREENING_CONFIG, 'max_expense_ratio', 1.3)
+    work_dir = str(tmp_path / 'work')
+
+    for step in ('fetch', 'screen', 'render'):
+        cli.main(['--work-dir', work_dir, step])
+    staged = json.loads((tmp_path / 'fund_analysis_data.json').read_text())['screening_rejections']
+    cli.main(['run'])
+    single = json.loads((tmp_path / 'fund_analysis_data.json').read_text())['screening_rejections']
+
+    assert staged['expense_ratio <= 1.3'] > 0
+    assert staged == single
+
+
+def test_screen_before_fetch_explains_what_to_run(tmp_path):
+    with pytest.raises(SystemExit, match='run `fetch` first'):
+        cli.main(['--work-dir', str(tmp_path), 'screen'])
+
+
+def test_backtest_prints_bucket_table(tmp_path, capsys):
+    from synthetic_data import synthetic_universe
+
+    _, store, _ = synthetic_universe(40, 2, str(tmp_path / 'store'))
+    output = tmp_path / 'backtest.json'
+
+    cli.main(['--work-dir', str(tmp_path / 'work'), 'backtest', '--nav-store', store.path, '--output', str(output)])
+
+    assert 'weekly rebalance dates' in capsys.readouterr().out
+    assert 'All funds' in json.loads(output.read_text())['buckets']
+
+
+def test_correlate_lists_pairs_and_writes_matrix(tmp_path, capsys):
+    import numpy as np
+
+    from synthetic_data import synthetic_universe
+
+    _, store, _ = synthetic_universe(30, 2, str(tmp_path / 'store'))
+    output = tmp_path / 'corr.npy'
+
+    cli.main(['correlate', '--nav-store', store.path, '--threshold', '-1', '--top', '3',
+              '--max-memory-mb', '1', '--output', str(output)])
+
+    out = capsys.readouterr().out
+    assert 'scheme pairs with correlation' in out and len(out.splitlines()) == 5
+    assert np.load(output).shape == (30, 30)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for blocked return correlation
+Blocks computed under a small memory cap must match np.corrcoef on the full matrix
+"""
+
+from datetime import date
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import correlation
+from mutual_fund_screener import IndianMutualFundScreener
+from nav_store import NavStore, business_days
+import report_writer
+
+
+def navs_from_returns(returns):
+    """NAV rows starting at 100 whose daily returns are the given rows"""
+    return 100 * np.cumprod(1 + np.hstack([np.zeros((len(returns), 1)), returns]), axis=1)
+
+
+def clustered_returns(count, days, seed=7):
+    """Daily returns in groups of four near-identical schemes, like several funds tracking one index"""
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.01, (count // 4 + 1, days))
+    return np.repeat(factors, 4, axis=0)[:count] + rng.normal(0, 0.002, (count, days))
+
+
+def cap_for(z, rows):
+    """Memory cap that fits z plus blocks of the given number of rows"""
+    return int((z.nbytes + rows * len(z) * 5) / (1 - correlation.HEADROOM)) + 1
+
+
+def test_blocks_match_corrcoef_under_small_cap():
+    navs = navs_from_returns(clustered_returns(60, 300))
+    navs[5, :250] = np.nan   # launched too recently to correlate
+    navs[7, :] = 100.0       # flat NAV, no variation
+
+    z, usable = correlation.standardized_returns(navs, None, navs.shape[1] - 1, days=200, min_observations=100)
+    # Blocks share one buffer, so each is copied before the next is computed
+    blocks = [block.copy() for _, _, block in correlation.iter_blocks(z, usable, max_bytes=cap_for(z, 8))]
+
+    assert len(blocks) == 8
+    matrix = np.vstack(blocks)
+    with np.errstate(invalid='ignore'):
+        full = np.corrcoef(np.diff(navs[:, -201:], axis=1) / navs[:, -201:-1])
+    keep = np.flatnonzero(usable)
+    assert usable.sum() == 58 and not usable[5] and not usable[7]
+    np.testing.assert_allclose(matrix[np.ix_(keep, keep)], full[np.ix_(keep, keep)], atol=1e-5)
+    assert np.isnan(matrix[5]).all() and np.isnan(matrix[:, 7]).all()
+
+
+def test_partial_history_is_mean_filled():
+    returns = clustered_returns(8, 300)
+    navs = navs_from_returns(returns)
+    navs[1, :100] = np.nan
+
+    z, usable = correlation.standardized_returns(navs, [0, 1], navs.shape[1] - 1, days=300, min_observations=150)
+    (_, _, block), = correlation.iter_blocks(z, usable)
+
+    assert usable.all()
+    overlap = np.corrcoef(returns[0, 100:], returns[1, 100:])[0, 1]
+    # Missing days count as average days, shrinking the correlation by about sqrt(overlap share)
+    assert block[0, 1] == pytest.approx(overlap * np.sqrt(200 / 300), abs=0.05)
+
+
+def test_matrix_streams_to_disk(tmp_path):
+    navs = navs_from_returns(clustered_returns(50, 260))
+    z, usable = correlation.standardized_returns(navs, None, navs.shape[1] - 1)
+    path = str(tmp_path / 'corr.npy')
+
+    correlation.write_matrix(path, z, usable, max_bytes=cap_for(z, 20))
+
+    matrix = np.load(path, mmap_mode='r')
+    assert matrix.shape == (50, 50) and matrix.dtype == np.float32
+    np.testing.assert_allclose(matrix, matrix.T, atol=1e-6)
+    np.testing.assert_allclose(np.diag(matrix), 1.0, atol=1e-5)
+
+
+def test_pairs_and_redundant_picks():
+    returns = clustered_returns(12, 260)
+    navs = navs_from_returns(returns)
+    z, usable = correlation.standardized_returns(navs, None, navs.shape[1] - 1)
+
+    count, pairs = correlation.correlated_pairs(z, usable, threshold=0.9, max_bytes=cap_for(z, 5))
+
+    assert {(i, j) for i, j, _ in pairs} == {(i, j) for i in range(12) for j in range(i + 1, 12) if i // 4 == j // 4}
+    assert count == len(pairs) == 18
+    assert [value for _, _, value in pairs] == sorted((value for _, _, value in pairs), reverse=True)
+    assert correlation.correlated_pairs(z, usable, threshold=0.9, max_bytes=cap_for(z, 5), top=4) == (18, pairs[:4])
+
+    pick, strength = correlation.redundant_picks(z, usable, threshold=0.9, max_bytes=cap_for(z, 5))
+    np.testing.assert_array_equal(pick, [-1, 0, 0, 0, -1, 4, 4, 4, -1, 8, 8, 8])
+    assert np.all(strength[pick >= 0] > 0.9) and np.isnan(strength[pick < 0]).all()
+
+
+def test_memory_stays_under_cap_for_large_universe():
+    days = 250
+    z, usable = correlation.standardized_returns(navs_from_returns(clustered_returns(3000, days)), None, days)
+    cap = 16 * 2 ** 20
+    assert 3000 * 3000 * 4 > 2 * cap  # the full matrix alone would not fit
+
+    tracemalloc.start()
+    try:
+        count, pairs = correlation.correlated_pairs(z, usable, threshold=0.9, max_bytes=cap, top=20)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak + z.nbytes < cap
+    assert count == 750 * 6 and len(pairs) == 20
+    with pytest.raises(ValueError, match='memory cap'):
+        correlation.block_rows(3000, days, max_bytes=z.nbytes)
+
+
+def test_flag_redundant_marks_lower_ranked_clones(tmp_path):
+    returns = clustered_returns(8, 300)
+    navs = navs_from_returns(returns)
+    days = business_days(date(2025, 1, 1), navs.shape[1])
+    store = NavStore.create(str(tmp_path / 'store'), [f'{100 + i}' for i in range(8)], days[0], len(days))
+    store.write_days(days, navs)
+    # Ranked best first; 'OTHER' has no stored history
+    funds = [{'fund_code': code, 'fund_name': f'Fund {code}'} for code in ['104', '100', 'OTHER', '101', '105']]
+
+    flagged = correlation.flag_redundant(funds, store, threshold=0.9)
+
+    assert flagged == 2
+    assert [fund['redundant_with'] for fund in funds] == [None, None, None, 'Fund 100', 'Fund 104']
+    assert funds[3]['redundant_correlation'] > 0.9 and funds[2]['redundant_correlation'] is None
+    row = report_writer.render_fund_row({**funds[3], 'recommendation': 'Buy', 'beaten_down_level': 'Low',
+                                         'momentum_score': 70})
+    assert 'Moves with Fund 100 (ρ 0.9' in row
+
+
+def test_screener_flags_small_caps_moving_together(tmp_path):
+    screener = IndianMutualFundScreener()
+    funds = screener.fetch_mutual_fund_data()
+    codes = [fund['fund_code'] for fund in funds]
+    small_caps = [i for i, fund in enumerate(funds) if fund['category'] == 'Small Cap']
+    rng = np.random.default_rng(11)
+    returns = rng.normal(-0.0004, 0.01, (len(codes), 4 * 261))
+    returns[small_caps] = rng.normal(-0.0008, 0.01, 4 * 261) + rng.normal(0, 0.001, (len(small_caps), 4 * 261))
+    days = business_days(date(2022, 1, 3), returns.shape[1] + 1)
+    store = NavStore.create(str(tmp_path / 'store'), codes, days[0], len(days))
+    store.write_days(days, navs_from_returns(returns))
+
+    screener.nav_store = store
+    screened = screener.screen_beaten_down_funds()
+
+    small = [fund for fund in screened if fund['category'] == 'Small Cap']
+    assert len(small) > 2
+    assert small[0]['redundant_with'] is None
+    assert all(fund['redundant_with'] == small[0]['fund_name'] for fund in small[1:])
+    assert all(fund['redundant_with'] is None for fund in screened if fund['category'] != 'Small Cap')
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Round-trip tests for the analysis data exporters
+"""
+
+import json
+import os
+
+import pytest
+
+import exporters
+from synthetic_data import synthetic_screened_funds
+
+META = {'nifty_valuation': {'nifty_50_level': 25125}, 'news_data': [], 'analysis_timestamp': '2026-10-16T09:30:00'}
+
+
+@pytest.mark.parametrize('fmt', ['json', 'json-compact', 'ndjson', 'ndjson-gzip'])
+def test_json_family_round_trips(tmp_path, fmt):
+    funds = synthetic_screened_funds(200)
+    path = exporters.export(funds, META, fmt, str(tmp_path / 'data'))
+
+    assert exporters.load(path, fmt) == (funds, META)
+    assert exporters.read_column(path, fmt, 'aum_cr') == [fund['aum_cr'] for fund in funds]
+
+
+def test_compact_json_matches_legacy_document(tmp_path):
+    funds = synthetic_screened_funds(50)
+    pretty = exporters.export(funds, META, 'json', str(tmp_path / 'pretty'))
+    compact = exporters.export(funds, META, 'json-compact', str(tmp_path / 'compact'))
+
+    with open(pretty, encoding='utf-8') as f, open(compact, encoding='utf-8') as g:
+        assert json.load(f) == json.load(g)
+
+
+@pytest.mark.parametrize('fmt', ['npz', 'parquet'])
+def test_columnar_formats_read_single_columns(tmp_path, fmt):
+    if fmt not in exporters.available_formats():
+        pytest.skip(f'{fmt} dependencies not installed')
+    funds = synthetic_screened_funds(300)
+    funds[3]['3y_return'] = None
+    funds[4]['fund_manager'] = None
+    path = exporters.export(funds, META, fmt, str(tmp_path / 'data'))
+
+    assert exporters.read_column(path, fmt, 'fund_name') == [fund['fund_name'] for fund in funds]
+    assert exporters.read_column(path, fmt, 'momentum_score') == [fund['momentum_score'] for fund in funds]
+    assert exporters.read_column(path, fmt, '3y_return')[3] is None
+    loaded, meta = exporters.load(path, fmt)
+    assert meta == META and loaded == funds
+
+
+def test_unavailable_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        exporters.export([], META, 'xml', str(tmp_path / 'data'))
+
+
+@pytest.mark.parametrize('fmt', ['ndjson-gzip', 'npz'])
+def test_failed_export_leaves_previous_file_in_place(tmp_path, fmt):
+    funds = synthetic_screened_funds(20)
+    path = exporters.export(funds, META, fmt, str(tmp_path / 'data'))
+
+    def failing():
+        yield from funds[:5]
+        raise RuntimeError('disk full')
+
+    with pytest.raises(RuntimeError):
+        exporters.export(failing(), META, fmt, str(tmp_path / 'data'))
+
+    assert exporters.load(path, fmt) == (funds, META)
+    assert [entry.name for entry in tmp_path.iterdir()] == [os.path.basename(path)]
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent data-fetch stage
+Each source is served by a local stand-in server with injected latency
+"""
+
+import json
+import time
+
+import requests
+
+from http_cache import HttpCache
+from mutual_fund_screener import IndianMutualFundScreener
+from test_amfi import SAMPLE
+
+
+class StandInScreener(IndianMutualFundScreener):
+    """Screener whose valuation and news fetches hit local stand-in servers"""
+
+    def __init__(self, valuation_url, news_url, http=None):
+        super().__init__(http=http)
+        self.valuation_url = valuation_url
+        self.news_url = news_url
+
+    def load_nifty_valuation_data(self):
+        return requests.get(self.valuation_url, timeout=10).json()
+
+    def load_market_news(self):
+        response = requests.get(self.news_url, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+
+def test_sources_overlap_and_slow_source_is_dropped(tmp_path, stand_in):
+    valuation = {'nifty_50_level': 25125, 'nifty_50_pe': 22.0, 'market_cap_to_gdp': 120.0,
+                 'current_vs_historical': 'Overvalued'}
+    funds = stand_in(SAMPLE, delay=0.3)
+    market = stand_in(json.dumps(valuation), delay=0.3)
+    news = stand_in(json.dumps([]), delay=3.0)
+
+    screener = StandInScreener(market.url, news.url, http=HttpCache(cache_dir=str(tmp_path)))
+    started = time.monotonic()
+    results = screener.fetch_all_data(funds.url, deadlines={'mutual_funds': 1.0, 'market_data': 1.0, 'news': 1.0})
+    elapsed = time.monotonic() - started
+
+    # Two 0.3s sources plus a timed-out one finish near the longest deadline, not the sum
+    assert elapsed < 1.5
+    assert len(results['mutual_funds']) == 4
+    assert results['market_data'] == valuation
+    assert results['news'] == [] and 'news' in screener.fetch_errors
+
+    html = screener.generate_html_report(screener.screen_beaten_down_funds())
+    assert 'Partial data: news unavailable' in html
+    assert '25,125' in html
+
+
+def test_late_fetches_do_not_touch_screener_state(tmp_path, stand_in):
+    items = [{'headline': 'Late item', 'summary': '', 'date': '2024-06-10', 'impact': 'Neutral'}]
+    funds = stand_in(SAMPLE, delay=0.5)
+    market = stand_in(json.dumps({}))
+    news = stand_in(json.dumps(items), delay=0.5)
+
+    screener = StandInScreener(market.url, news.url, http=HttpCache(cache_dir=str(tmp_path)))
+    screener.fetch_all_data(funds.url, deadlines={'mutual_funds': 0.1, 'market_data': 2.0, 'news': 0.1})
+    # Let the abandoned fetches run to completion
+    time.sleep(1.0)
+
+    assert set(screener.fetch_errors) == {'mutual_funds', 'news'}
+    assert screener.funds_data == [] and screener.news_data == []
+    assert screener.fund_source_url is None
+    assert not any(screener.screen_filter.rejected.values())
+
+
+def test_failed_source_still_renders_report(stand_in):
+    failing = stand_in('oops', status=500)
+
+    screener = StandInScreener(failing.url, failing.url)
+    screener.fetch_all_data(deadlines={'mutual_funds': 2.0, 'market_data': 2.0, 'news': 2.0})
+
+    assert set(screener.fetch_errors) == {'market_data', 'news'}
+    assert screener.nifty_valuation == {} and len(screener.funds_data) == 8
+
+    html = screener.generate_html_report(screener.screen_beaten_down_funds())
+    assert 'N/A' in html and 'SBI Small Cap Fund' in html
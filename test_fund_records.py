@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact screened-fund records
+Records must read, compare and serialize exactly like the merged dicts they replace
+"""
+
+import json
+import pickle
+
+import fund_records
+from fund_records import FundRecord
+
+FUNDS = [
+    {'fund_name': 'A Small Cap', 'fund_code': 'A', 'category': 'Small Cap', 'aum_cr': 1200, '1y_return': -4.5},
+    {'fund_name': 'B Mid Cap', 'fund_code': 'B', 'category': 'Mid Cap', 'aum_cr': None, '1y_return': -9.0},
+    {'fund_name': 'C Flexi', 'fund_code': 'C', 'recommendation': 'stale', '1y_return': -1.0},
+]
+COLUMNS = [('momentum_score', [70, 85, 40]), ('recommendation', ['Buy', 'Strong Buy', 'Avoid'])]
+
+
+def merged_dicts(indices):
+    return [{**FUNDS[i], **{name: values[position] for name, values in COLUMNS}}
+            for position, i in enumerate(indices)]
+
+
+def test_merge_matches_dict_merging_including_key_order():
+    records = fund_records.merge(FUNDS, [1, 0, 2], COLUMNS)
+    expected = merged_dicts([1, 0, 2])
+
+    assert records == expected
+    assert [list(record) for record in records] == [list(fund) for fund in expected]
+    assert json.dumps(records, default=fund_records.json_default) == json.dumps(expected)
+    assert fund_records.to_dicts(records) == expected
+
+
+def test_records_of_one_shape_share_layout_and_categorical_strings():
+    funds = [dict(FUNDS[0], fund_code=str(i)) for i in range(3)]
+    labels = [''.join(['Strong', ' Buy']) for _ in range(3)]
+
+    records = fund_records.merge(funds, range(3), [('recommendation', labels)])
+
+    assert records[0]._layout is records[2]._layout
+    assert records[0]['recommendation'] is records[2]['recommendation']
+
+
+def test_record_behaves_like_a_mutable_mapping():
+    record = FundRecord.from_dict(FUNDS[0])
+
+    assert record['aum_cr'] == 1200 and record.get('missing', 'x') == 'x' and 'category' in record
+    record['aum_cr'] = 1300
+    record['expense_ratio'] = 0.9
+    del record['fund_name']
+
+    assert record.to_dict() == {'fund_code': 'A', 'category': 'Small Cap', 'aum_cr': 1300,
+                                '1y_return': -4.5, 'expense_ratio': 0.9}
+    assert FundRecord.from_dict(FUNDS[0]) == FUNDS[0]
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_encode_json_and_pick_read_records_like_dicts():
+    funds = [dict(FUNDS[0], fund_code=str(i), fund_name=f'Fund, "{i}" ₹', aum_cr=[i, None] if i % 7 else i * 0.1,
+                  top_pick=i % 2 == 0) for i in range(70)]
+    records = [*fund_records.merge(funds, range(70), [('momentum_score', list(range(70)))]),
+               *fund_records.merge(FUNDS, [2, 1], [('momentum_score', [1, 2])])]
+    items = [*records[:40], merged_dicts([0])[0], *records[40:]]
+    dumps = json.JSONEncoder(separators=(',', ':'), default=fund_records.json_default).encode
+
+    assert list(fund_records.encode_json(items, dumps)) == [dumps(item) for item in items]
+    names = ('fund_name', 'aum_cr', 'missing')
+    assert list(fund_records.pick(items, names)) == [list(map(dict(item).get, names)) for item in items]
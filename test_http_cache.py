@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the conditional-GET HTTP cache
+A local stand-in server honours If-None-Match/If-Modified-Since like amfiindia.com
+"""
+
+import os
+import time
+
+import pytest
+
+import amfi
+import config
+from http_cache import HttpCache
+from mutual_fund_screener import IndianMutualFundScreener
+from test_amfi import SAMPLE
+
+
+@pytest.fixture
+def origin(stand_in):
+    """amfiindia.com stand-in whose body and ETag can be swapped"""
+    server = stand_in(SAMPLE, etag='"v1"', last_modified='Thu, 15 Oct 2026 18:00:00 GMT')
+    server.url += 'NAVAll.txt'
+    return server
+
+
+def test_revalidates_with_validators(origin, tmp_path):
+    cache = HttpCache(cache_dir=str(tmp_path))
+
+    first = cache.get(origin.url)
+    second = cache.get(origin.url)
+
+    assert not first.not_modified and second.not_modified
+    assert second.text == SAMPLE
+    assert origin.requests[1]['If-None-Match'] == '"v1"'
+    assert origin.requests[1]['If-Modified-Since'] == 'Thu, 15 Oct 2026 18:00:00 GMT'
+    assert cache.stats['hits'] == 1 and cache.stats['misses'] == 1
+
+    origin.etag = '"v2"'
+    origin.body = SAMPLE.replace('178.9123', '180.0000')
+    third = cache.get(origin.url)
+    assert not third.not_modified and '180.0000' in third.text
+    assert cache.stats['misses'] == 2
+
+
+def test_evicts_by_age_and_size(origin, tmp_path):
+    cache = HttpCache(cache_dir=str(tmp_path), max_age_seconds=0.5)
+    cache.get(origin.url)
+    cache.get(origin.url + '?other')
+
+    time.sleep(0.6)
+    cache.evict()
+    assert not any(name.endswith('.meta.json') for name in os.listdir(tmp_path))
+
+    cache = HttpCache(cache_dir=str(tmp_path), max_bytes=len(SAMPLE) + 10)
+    cache.get(origin.url)
+    cache.get(origin.url + '?other')
+    assert sum(name.endswith('.meta.json') for name in os.listdir(tmp_path)) == 1
+    assert cache.stats['evictions'] == 1
+
+
+def test_not_modified_short_circuits_parse_and_score(origin, tmp_path, monkeypatch):
+    cache = HttpCache(cache_dir=str(tmp_path))
+    funds = [{'fund_name': 'Falling Fund', 'fund_code': '118778', 'category': 'Small Cap',
+              'aum_cr': 5000, '1y_return': -6.0, '5y_return': 12.0, 'current_nav': 90.0,
+              '52w_high': 110.0, '52w_low': 85.0, 'expense_ratio': 1.2}]
+
+    screener = IndianMutualFundScreener(http=cache)
+    screener.fetch_mutual_fund_data(origin.url)
+    screener.funds_data = funds
+    first = screener.screen_beaten_down_funds()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('parse stage should have been skipped')
+
+    monkeypatch.setattr(amfi, 'stream_schemes', fail)
+    monkeypatch.setattr('scoring.score_columns', fail)
+
+    rerun = IndianMutualFundScreener(http=cache)
+    rerun.fetch_mutual_fund_data(origin.url)
+    assert rerun.screen_beaten_down_funds() == first
+    assert cache.stats['hits'] == 1
+
+
+def test_not_modified_rescreens_when_rules_change(origin, tmp_path, monkeypatch):
+    cache = HttpCache(cache_dir=str(tmp_path))
+    screener = IndianMutualFundScreener(http=cache)
+    screener.fetch_mutual_fund_data(origin.url)
+    screener.screen_beaten_down_funds()
+
+    monkeypatch.setattr(config, 'SCREENING_CONFIG', {**config.SCREENING_CONFIG, 'max_expense_ratio': 0.1})
+    rerun = IndianMutualFundScreener(http=cache)
+    rerun.fetch_mutual_fund_data(origin.url)
+
+    assert cache.stats['hits'] == 1
+    assert rerun.reused_screen is None and rerun.funds_data
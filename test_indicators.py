@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the technical indicators computed over a 2-D NAV array
+Checks every indicator against a straightforward per-scheme reference
+"""
+
+from datetime import date
+
+import numpy as np
+
+import indicators
+from mutual_fund_screener import IndianMutualFundScreener
+from nav_store import NavStore, business_days
+import rules
+
+
+def random_navs(schemes=40, days=900, seed=3):
+    rng = np.random.default_rng(seed)
+    navs = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, (schemes, days)), axis=1))
+    navs[5, :700] = np.nan   # launched late
+    navs[6, :-10] = np.nan   # too young for most indicators
+    navs[7, -30:] = navs[7, -31]  # flat tail
+    return navs
+
+
+def reference(nav_row, dates, end):
+    """Plain per-scheme loops over one NAV series"""
+    series = nav_row[:end + 1]
+    result = {}
+
+    changes = np.diff(series[-15:])
+    gains, losses = sum(c for c in changes if c > 0) / 14, sum(-c for c in changes if c < 0) / 14
+    if np.isnan(changes).any():
+        result['rsi_14'] = np.nan
+    elif losses == 0:
+        result['rsi_14'] = 100.0 if gains > 0 else 50.0
+    else:
+        result['rsi_14'] = 100 - 100 / (1 + gains / losses)
+
+    for field, days in indicators.ROC_DAYS.items():
+        result[field] = (series[-1] / series[-(days + 1)] - 1) * 100
+
+    fast = slow = signal = None
+    for value in series[-indicators.MACD_WARMUP_DAYS:]:
+        if np.isnan(value):
+            continue
+        fast = value if fast is None else fast + 2 / 13 * (value - fast)
+        slow = value if slow is None else slow + 2 / 27 * (value - slow)
+        signal = fast - slow if signal is None else signal + 2 / 10 * (fast - slow - signal)
+    result['macd_hist_pct'] = (fast - slow - signal) / series[-1] * 100 if fast is not None else np.nan
+
+    cutoff = dates[end] - np.timedelta64(indicators.DRAWDOWN_DAYS, 'D')
+    peak, worst = np.nan, np.nan
+    for day, value in zip(dates[:end + 1], series):
+        if day <= cutoff or np.isnan(value):
+            continue
+        peak = value if np.isnan(peak) else max(peak, value)
+        worst = max(0 if np.isnan(worst) else worst, (1 - value / peak) * 100)
+    result['max_drawdown_pct'] = worst
+    return result
+
+
+def test_indicators_match_per_scheme_reference():
+    navs = random_navs()
+    dates = np.array(business_days(date(2022, 1, 3), navs.shape[1]), dtype='datetime64[D]')
+    end = navs.shape[1] - 1
+    rows = np.arange(len(navs))
+
+    computed = indicators.compute(navs, dates, rows, end)
+
+    for row in rows:
+        expected = reference(navs[row], dates, end)
+        for field in indicators.INDICATOR_FIELDS:
+            np.testing.assert_allclose(computed[field][row], expected[field], rtol=1e-9, atol=1e-9,
+                                       err_msg=f'row {row} {field}')
+
+
+def test_indicators_are_fund_fields_and_scoring_inputs(tmp_path):
+    navs = random_navs(schemes=8)
+    days = business_days(date(2022, 1, 3), navs.shape[1])
+    codes = [f'F{i}' for i in range(len(navs))]
+    store = NavStore.create(str(tmp_path / 'store'), codes, days[0], len(days))
+    store.write_days(days, navs)
+
+    screener = IndianMutualFundScreener(nav_store=store)
+    screener.funds_data = [{'fund_name': code, 'fund_code': code, 'aum_cr': 5000, 'expense_ratio': 1.0}
+                           for code in codes]
+    funds = screener.apply_nav_history(screener.funds_data)
+    assert all(set(indicators.INDICATOR_FIELDS) <= set(fund) for fund in funds)
+
+    program = rules.compile_rules(rules=[
+        {'factor': 'current_positioning', 'field': 'rsi_14', 'bands': [['<', 50, 25]], 'otherwise': 5}])
+    for fund in funds:
+        expected = 25 if fund['rsi_14'] is not None and fund['rsi_14'] < 50 else 5
+        assert program.score_one(fund) == expected
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for per-stage timing and memory instrumentation
+"""
+
+import json
+import logging
+
+from instrumentation import Instrumentation
+from mutual_fund_screener import IndianMutualFundScreener
+import report_writer
+
+
+def test_disabled_stages_are_shared_no_ops():
+    instrumentation = Instrumentation(enabled=False)
+
+    assert instrumentation.stage('a') is instrumentation.stage('b')
+    with instrumentation.stage('a'):
+        pass
+    assert instrumentation.records == []
+    assert instrumentation.write_metrics('unused.json') is None
+
+
+def test_nested_stages_record_time_cpu_and_peak(caplog):
+    instrumentation = Instrumentation(enabled=True)
+
+    with caplog.at_level(logging.INFO, logger='mutual_fund_screener.stages'):
+        with instrumentation.stage('outer'):
+            with instrumentation.stage('inner'):
+                block = bytearray(4 * 2 ** 20)
+            del block
+            sum(range(100000))
+
+    inner, outer = instrumentation.records
+    assert (inner['stage'], outer['stage']) == ('inner', 'outer')
+    assert inner['peak_bytes'] >= 4 * 2 ** 20
+    assert outer['peak_bytes'] >= inner['peak_bytes']
+    assert outer['wall_seconds'] >= inner['wall_seconds'] and outer['cpu_seconds'] > 0
+    assert [json.loads(record.getMessage())['stage'] for record in caplog.records] == ['inner', 'outer']
+
+
+def test_run_analysis_writes_metrics_and_footer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    instrumentation = Instrumentation(enabled=True, metrics_file=str(tmp_path / 'metrics.json'))
+    screener = IndianMutualFundScreener(instrumentation=instrumentation)
+
+    screener.run_analysis()
+
+    stages = [record['stage'] for record in json.loads((tmp_path / 'metrics.json').read_text())['stages']]
+    assert sorted(stages) == sorted(['fetch.mutual_funds', 'fetch.market_data', 'fetch.news', 'fetch',
+                                     'screen', 'render', 'export'])
+    html = (tmp_path / 'index.html').read_text(encoding='utf-8')
+    assert 'Run stats: ' in html and 'screen ' in html
+
+
+def test_footer_without_stats_is_unchanged():
+    assert report_writer.render_footer() == report_writer.render_footer([])
+    assert 'Run stats' not in report_writer.render_footer()
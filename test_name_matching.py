@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for trigram scheme-name matching
+Names spelled differently by AMFI and secondary sources must join with a confidence,
+and a persisted mapping must answer repeat runs without searching again
+"""
+
+import json
+
+import pytest
+
+from mutual_fund_screener import IndianMutualFundScreener
+import name_matching
+from test_amfi import SAMPLE
+
+FACTSHEETS = [
+    {'fund_name': 'HDFC Mid-Cap Opportunities Fund', 'aum_cr': 83104, 'expense_ratio': 0.74,
+     'fund_manager': 'Chirag Setalvad'},
+    {'fund_name': 'Nippon India Smallcap Fund', 'aum_cr': 57009, 'expense_ratio': 0.68,
+     'fund_manager': 'Samir Rachh'},
+    {'fund_name': 'Nippon India Large Cap Fund', 'aum_cr': 40000, 'expense_ratio': 0.65},
+    {'fund_name': 'Axis Small Cap Fund', 'aum_cr': 25568, 'expense_ratio': 0.52},
+]
+
+
+def test_plan_words_and_spellings_normalize_alike():
+    assert name_matching.normalize_name('Nippon India Small Cap Fund - Direct Plan - Growth Plan - Growth Option') == \
+        name_matching.normalize_name('NIPPON INDIA SMALLCAP FUND')
+    assert name_matching.normalize_name('ICICI Pru Bluechip Fund (IDCW)') == 'icici prudential bluechip'
+
+
+def test_match_names_scores_every_query_in_one_pass():
+    queries = ['Nippon India Small Cap Fund - Direct Plan - Growth', 'SBI Small Cap Fund - Direct Plan - Growth',
+               'HDFC Mid Cap Opportunities Fund - Growth Option - Direct Plan']
+
+    matches = name_matching.match_names(queries, [record['fund_name'] for record in FACTSHEETS])
+
+    assert matches[0] == (1, 1.0)
+    assert matches[1][0] is None and 0 < matches[1][1] < 0.7   # closest is a different AMC
+    assert matches[2] == (0, 1.0)
+
+
+def test_trigram_scores_match_set_jaccard():
+    names = [record['fund_name'] for record in FACTSHEETS]
+    index = name_matching.TrigramIndex(names)
+    query = name_matching.trigrams(name_matching.normalize_name('Axis Small Cap'))
+
+    for score, name in zip(index.scores('Axis Small Cap'), names):
+        grams = name_matching.trigrams(name_matching.normalize_name(name))
+        assert score == pytest.approx(len(query & grams) / len(query | grams))
+
+
+def test_mapping_cache_answers_repeat_runs(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / 'names.json')
+    queries = ['Nippon India Small Cap Fund - Direct Plan - Growth', 'Unknown Scheme']
+    candidates = [record['fund_name'] for record in FACTSHEETS]
+    first = name_matching.match_names(queries, candidates, cache=name_matching.MappingCache(cache_path))
+
+    def no_search(names):
+        raise AssertionError('index rebuilt despite cached mappings')
+
+    monkeypatch.setattr(name_matching, 'TrigramIndex', no_search)
+    assert name_matching.match_names(queries, candidates, cache=name_matching.MappingCache(cache_path)) == \
+        [(1, 1.0), (None, 0.0)]
+    assert first[0] == (1, 1.0)
+    assert json.loads((tmp_path / 'names.json').read_text())['mappings']['nippon india small cap'][1] == 1.0
+
+    # A new candidate may match a cached miss, so misses are searched again
+    with pytest.raises(AssertionError):
+        name_matching.match_names(queries, candidates + ['Unknown Scheme'],
+                                  cache=name_matching.MappingCache(cache_path))
+
+
+def test_amfi_funds_are_enriched_from_factsheets(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'NAVAll.txt').write_text(SAMPLE)
+    screener = IndianMutualFundScreener(factsheets=FACTSHEETS)
+
+    funds = {fund['fund_code']: fund for fund in screener.fetch_mutual_fund_data(str(tmp_path / 'NAVAll.txt'))}
+
+    assert funds['118778']['aum_cr'] == 57009 and funds['118778']['fund_manager'] == 'Samir Rachh'
+    assert funds['118778']['name_match_score'] == 1.0
+    assert funds['118989']['expense_ratio'] == 0.74
+    assert 'aum_cr' not in funds['125497'] and funds['125497']['name_match_score'] == 0.0
+
+
+def test_plan_fields_come_from_the_same_plan():
+    records = [{'fund_name': 'Kotak Flexicap Fund - Direct Plan', 'aum_cr': 50000, 'expense_ratio': 0.62},
+               {'fund_name': 'Kotak Flexicap Fund - Regular Plan', 'aum_cr': 50000, 'expense_ratio': 1.48},
+               {'fund_name': 'Quant Small Cap Fund - Direct Plan', 'aum_cr': 20000, 'expense_ratio': 0.77}]
+    funds = [{'fund_name': 'Kotak Flexicap Fund - Regular Plan - Growth'},
+             {'fund_name': 'Kotak Flexicap Fund - Direct Plan - Growth'},
+             {'fund_name': 'Quant Small Cap Fund - Regular Plan - Growth'}]
+
+    regular, direct, quant = name_matching.enrich(funds, records, ['aum_cr', 'expense_ratio'], cache_path=False)
+
+    assert regular['expense_ratio'] == 1.48 and direct['expense_ratio'] == 0.62
+    # Only the Direct plan is listed: the scheme's AUM carries over, its expense ratio does not
+    assert quant['aum_cr'] == 20000 and 'expense_ratio' not in quant
+
+
+def test_csv_records_load_with_numbers(tmp_path):
+    path = tmp_path / 'factsheets.csv'
+    path.write_text('fund_name,aum_cr,expense_ratio\nAxis Small Cap Fund,"25,568",0.52\nEmpty Fund,,\n')
+
+    assert name_matching.load_records(str(path)) == [
+        {'fund_name': 'Axis Small Cap Fund', 'aum_cr': 25568.0, 'expense_ratio': 0.52},
+        {'fund_name': 'Empty Fund', 'aum_cr': None, 'expense_ratio': None},
+    ]
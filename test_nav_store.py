@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory-mapped NAV history store
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from mutual_fund_screener import IndianMutualFundScreener
+from nav_store import NavStore, business_days
+import scoring
+import screening
+
+
+def build_store(path, codes=('HDFC_MID_CAP', 'SBI_SMALL_CAP', 'NEW_FUND'), years=11):
+    """Store with a smooth NAV path per scheme; the last scheme launched 200 days ago"""
+    days = business_days(date(2015, 10, 1), years * 261)
+    rng = np.random.default_rng(3)
+    navs = 10 * np.cumprod(1 + rng.normal(0.0004, 0.01, size=(len(codes), len(days))), axis=1)
+    navs[-1, :-200] = np.nan
+
+    store = NavStore.create(str(path), codes, days[0], capacity=len(days) + 10)
+    store.write_days(days, navs)
+    store.flush()
+    return days, navs
+
+
+def expected_fields(days, nav):
+    """Straightforward per-scheme reference for the derived fields"""
+    end = days[-1]
+    window = [v for d, v in zip(days, nav) if d > end - timedelta(days=365)]
+
+    def value_on_or_before(target):
+        past = [v for d, v in zip(days, nav) if d <= target]
+        return past[-1] if past else np.nan
+
+    one_year = value_on_or_before(end - timedelta(days=365))
+    five_year = value_on_or_before(end - timedelta(days=5 * 365))
+    return {
+        'current_nav': nav[-1],
+        '52w_high': np.nanmax(window),
+        '52w_low': np.nanmin(window),
+        '1y_return': (nav[-1] / one_year - 1) * 100,
+        '5y_return': ((nav[-1] / five_year) ** (1 / 5) - 1) * 100,
+    }
+
+
+def test_open_is_memory_mapped(tmp_path):
+    build_store(tmp_path)
+    store = NavStore.open(str(tmp_path))
+
+    assert isinstance(store.navs, np.memmap)
+    assert store.navs.shape[0] == 3
+    assert store.length == 11 * 261
+
+
+def test_derived_fields_match_reference(tmp_path):
+    days, navs = build_store(tmp_path)
+    store = NavStore.open(str(tmp_path))
+
+    derived = store.derive_fields(['HDFC_MID_CAP', 'SBI_SMALL_CAP', 'MISSING'])
+    for row in range(2):
+        for field, value in expected_fields(days, navs[row]).items():
+            assert np.isclose(derived[field][row], value), field
+    assert all(np.isnan(derived[field][2]) for field in derived)
+
+    young = store.fund_fields('NEW_FUND')
+    assert young['1y_return'] is None and young['10y_return'] is None
+    assert young['52w_high'] >= young['current_nav'] >= young['52w_low']
+
+
+def test_screener_derives_fields_from_history(tmp_path):
+    build_store(tmp_path)
+    screener = IndianMutualFundScreener(nav_store=NavStore.open(str(tmp_path)))
+    screener.fetch_mutual_fund_data()
+
+    history = screener.nav_store.fund_fields('HDFC_MID_CAP')
+    enriched = screener.apply_nav_history(screener.funds_data)
+    hdfc = next(fund for fund in enriched if fund['fund_code'] == 'HDFC_MID_CAP')
+    assert all(hdfc[field] == value for field, value in history.items())
+
+    screened = {fund['fund_code']: fund for fund in screener.screen_beaten_down_funds()}
+    for fund in screener.funds_data:
+        momentum = screener.calculate_momentum_indicators(fund)
+        if fund['fund_code'] in screened:
+            assert all(screened[fund['fund_code']][key] == value for key, value in momentum.items())
+
+
+def test_history_fields_are_screened_before_merging(tmp_path):
+    build_store(tmp_path)
+    screener = IndianMutualFundScreener(nav_store=NavStore.open(str(tmp_path)))
+    screener.fetch_mutual_fund_data()
+    merged = screener.apply_nav_history(screener.funds_data)
+    reference = screening.compile_filter()
+    keep = reference.mask(scoring.build_columns(merged, fields=reference.fields))
+
+    screen_filter = screening.compile_filter()
+    survivors = screener.apply_nav_history(screener.funds_data, screen_filter)
+
+    assert survivors == [fund for fund, kept in zip(merged, keep) if kept]
+    assert screen_filter.rejected == reference.rejected and sum(reference.rejected.values())
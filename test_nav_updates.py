@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental daily NAV updates
+Rolling state must match a full recompute from the NAV store after every appended day
+"""
+
+from datetime import date
+
+import numpy as np
+
+from amfi import AmfiScheme
+import indicators
+from mutual_fund_screener import IndianMutualFundScreener
+from nav_store import NavStore, business_days
+from nav_updates import RollingState, append_day
+
+CODES = ['101', '102', '103', '104']
+
+
+def make_history(days=3 * 261 + 40, seed=11):
+    """NAV paths with flat stretches (ties), a late launch and a gap carried forward"""
+    rng = np.random.default_rng(seed)
+    navs = 50 * np.cumprod(1 + rng.normal(0.0003, 0.012, size=(len(CODES), days)), axis=1)
+    navs[1, 100:160] = navs[1, 99]
+    navs[2, :500] = np.nan
+    return business_days(date(2022, 1, 3), days), navs
+
+
+class RecordingNavs:
+    """NAV matrix stand-in recording how many days each read spans"""
+
+    def __init__(self, navs):
+        self.navs = navs
+        self.spans = []
+
+    def __getitem__(self, key):
+        columns = key[1]
+        self.spans.append(columns.stop - columns.start if isinstance(columns, slice) else 1)
+        return self.navs[key]
+
+
+def assert_matches_full_recompute(store, state):
+    expected = store.derive_fields(CODES)
+    actual = state.derive_fields(store)
+    for field, values in expected.items():
+        np.testing.assert_array_equal(actual[field], values, err_msg=field)
+
+
+def test_daily_appends_match_full_recompute(tmp_path):
+    days, navs = make_history()
+    split = 400
+    store = NavStore.create(str(tmp_path), CODES, days[0], capacity=len(days))
+    store.write_days(days[:split], navs[:, :split])
+    state = RollingState.rebuild(store)
+    assert_matches_full_recompute(store, state)
+
+    for i in range(split, len(days)):
+        nav_by_code = {code: navs[row, i] for row, code in enumerate(CODES) if not np.isnan(navs[row, i])}
+        assert append_day(store, state, days[i], nav_by_code)
+        if i % 37 == 0 or i == len(days) - 1:
+            assert_matches_full_recompute(store, state)
+
+    assert not append_day(store, state, days[-1], {'101': 1.0})
+
+
+def test_daily_derive_reads_only_a_trailing_window(tmp_path):
+    days, navs = make_history()
+    store = NavStore.create(str(tmp_path), CODES, days[0], capacity=len(days))
+    store.write_days(days[:-30], navs[:, :-30])
+    state = RollingState.rebuild(store)
+    for i in range(len(days) - 30, len(days)):
+        append_day(store, state, days[i], {code: navs[row, i] for row, code in enumerate(CODES)})
+    expected = store.derive_fields(CODES)
+
+    store.navs = RecordingNavs(store.navs)
+    actual = state.derive_fields(store)
+
+    assert max(store.navs.spans) <= indicators.MACD_WARMUP_DAYS
+    for field, values in expected.items():
+        np.testing.assert_array_equal(actual[field], values, err_msg=field)
+
+
+def test_state_persists_and_reloads(tmp_path):
+    days, navs = make_history(days=300)
+    store = NavStore.create(str(tmp_path), CODES, days[0], capacity=len(days) + 5)
+    store.write_days(days, navs)
+    store.flush()
+    state = RollingState.rebuild(store)
+    append_day(store, state, date(2023, 6, 1), {'101': 60.0})
+
+    reopened = NavStore.open(str(tmp_path), mode='r+')
+    reloaded = RollingState.load(reopened)
+    assert reloaded.end == reopened.length - 1
+    assert reloaded.highs == state.highs and reloaded.lows == state.lows
+    assert_matches_full_recompute(reopened, reloaded)
+
+
+def test_screener_appends_todays_amfi_navs(tmp_path):
+    days, navs = make_history(days=300)
+    store = NavStore.create(str(tmp_path), CODES, days[0], capacity=len(days) + 5)
+    store.write_days(days, navs)
+    store.flush()
+
+    screener = IndianMutualFundScreener(nav_store=NavStore.open(str(tmp_path), mode='r+'), incremental=True)
+    today = date(2023, 3, 15)
+    schemes = [AmfiScheme(int(code), None, None, f'Scheme {code}', 42.0, today, 'AMC', 'Open Ended Schemes',
+                          'Equity Scheme - Small Cap Fund') for code in CODES[:2]]
+    assert screener.update_nav_history(schemes)
+
+    funds = screener.apply_nav_history([{'fund_code': code} for code in CODES])
+    assert funds[0]['current_nav'] == 42.0
+    assert funds[3]['current_nav'] == round(navs[3, -1], 4)
+    assert funds[0] == {'fund_code': '101', **screener.nav_store.fund_fields('101')}
+    assert_matches_full_recompute(screener.nav_store, screener.rolling_state)
+
+
+def test_appends_grow_a_full_store(tmp_path):
+    days, navs = make_history(days=300)
+    store = NavStore.create(str(tmp_path), CODES, days[0], capacity=len(days) - 1)
+    store.write_days(days[:-1], navs[:, :-1])
+    state = RollingState.rebuild(store)
+
+    assert append_day(store, state, days[-1], {code: navs[row, -1] for row, code in enumerate(CODES)})
+
+    reopened = NavStore.open(str(tmp_path))
+    assert reopened.meta['capacity'] == 2 * (len(days) - 1) and reopened.length == len(days)
+    np.testing.assert_array_equal(reopened.navs[:, :len(days)], navs)
+    assert np.isnan(reopened.navs[:, len(days):]).all()
+    assert_matches_full_recompute(store, state)
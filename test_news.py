@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming news ingestion
+Runs against generated RSS, Atom and HTML fixture feeds with thousands of items
+"""
+
+
+import pytest
+
+from http_cache import HttpCache
+from mutual_fund_screener import IndianMutualFundScreener
+import news
+import report_writer
+from synthetic_data import HEADLINES, rss_feed
+
+ATOM_FEED = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Funds</title>
+<entry><title>Parag Parikh Flexi Cap Fund crosses a milestone</title><link href="https://example.com/ppfas"/>
+<published>2026-10-16T08:00:00Z</published><summary type="html">Record high &lt;b&gt;AUM&lt;/b&gt;</summary></entry>
+</feed>"""
+
+HTML_PAGE = """<!DOCTYPE html><html><body><nav>Menu</nav>
+<article><h2><a href="https://example.com/elss">ELSS funds &amp; the new tax regime</a></h2>
+<time datetime="2026-10-15T10:00:00+05:30">Oct 15</time><p>Tax saver schemes see declines in flows.</p></article>
+<article><h3>Broken <b>markup</article>
+</body></html>"""
+
+
+def test_matcher_finds_overlapping_phrases_in_one_pass():
+    matcher = news.KeywordMatcher({'mid cap': 'Mid', 'large and mid cap': 'LargeMid', 'cap': 'Cap',
+                                   'and mid': 'AndMid'})
+
+    assert matcher.find('A large and mid cap fund') == ['AndMid', 'LargeMid', 'Mid', 'Cap']
+    assert matcher.find('large and small cap') == ['Cap']
+    assert matcher.find('') == []
+
+
+def test_items_are_tagged_with_categories_amcs_and_impact():
+    item = news.tag({'headline': HEADLINES[1][0], 'summary': HEADLINES[1][1]})
+
+    assert item['categories'] == ['Mid Cap']
+    assert item['amcs'] == ['HDFC']
+    assert item['impact'] == 'Negative'
+    assert news.tag({'headline': 'RBI holds rates', 'summary': ''})['impact'] == 'Neutral'
+
+
+def test_seen_hashes_are_bounded_lru():
+    seen = news.SeenHashes(max_entries=2)
+
+    assert seen.add(b'a') and seen.add(b'b')
+    assert not seen.add(b'a')
+    assert seen.add(b'c')  # evicts b, the least recently seen
+    assert len(seen) == 2 and seen.add(b'b') and not seen.add(b'c')
+
+
+def test_large_rss_feed_is_streamed_deduplicated_and_tagged(tmp_path):
+    path = tmp_path / 'feed.xml'
+    path.write_text(rss_feed(6000), encoding='utf-8')
+
+    items = list(news.iter_news([str(path)]))
+
+    assert len(items) == 4000
+    first = items[0]
+    assert first['headline'] == 'SBI Small Cap Fund stops lump-sum inflows after rally #0'
+    assert first['summary'] == 'Small caps surge for a fifth week.'
+    assert first['date'] == '2026-09-01' and first['link'] == 'https://news.example.com/0'
+    assert first['categories'] == ['Small Cap'] and first['amcs'] == ['SBI'] and first['impact'] == 'Positive'
+    # A small LRU forgets old stories but still catches repeats that follow closely
+    assert len(list(news.iter_news([str(path)], seen=news.SeenHashes(max_entries=4)))) == 4000
+
+
+def test_atom_and_html_feeds(tmp_path):
+    (tmp_path / 'atom.xml').write_text(ATOM_FEED, encoding='utf-8')
+    (tmp_path / 'page.html').write_text(HTML_PAGE, encoding='utf-8')
+
+    atom, elss, broken = news.iter_news([str(tmp_path / 'atom.xml'), str(tmp_path / 'page.html')])
+
+    assert atom['link'] == 'https://example.com/ppfas' and atom['date'] == '2026-10-16'
+    assert atom['summary'] == 'Record high AUM'
+    assert atom['categories'] == ['Flexi Cap'] and atom['amcs'] == ['Parag Parikh']
+    assert elss['headline'] == 'ELSS funds & the new tax regime' and elss['date'] == '2026-10-15'
+    assert elss['categories'] == ['ELSS'] and elss['impact'] == 'Negative'
+    assert broken['headline'] == 'Broken markup'
+
+
+def test_fetch_news_keeps_newest_and_survives_a_bad_feed(tmp_path, stand_in):
+    feed = stand_in(rss_feed(300))
+    path = tmp_path / 'feed.xml'
+    path.write_text(ATOM_FEED, encoding='utf-8')
+
+    items = news.fetch_news([feed.url, str(tmp_path / 'missing.xml'), str(path)],
+                            http=HttpCache(cache_dir=str(tmp_path / 'http')), max_items=5)
+
+    assert [item['date'] for item in items] == ['2026-10-16'] + ['2026-09-28'] * 4
+    with pytest.raises(RuntimeError, match='all news feeds failed'):
+        news.fetch_news([str(tmp_path / 'missing.xml')])
+
+
+def test_screener_reports_feed_news(tmp_path):
+    path = tmp_path / 'feed.xml'
+    path.write_text(rss_feed(30), encoding='utf-8')
+
+    screener = IndianMutualFundScreener(news_feeds=[str(path)])
+    news_data = screener.fetch_market_news()
+
+    assert len(news_data) == 10
+    html = report_writer.render_news_item(news_data[0])
+    assert '<a href="https://news.example.com/' in html and 'Tags: ' in html
+    assert IndianMutualFundScreener(news_feeds=[]).fetch_market_news() == []
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for process-pool indicator computation
+The worker pool must reproduce the in-process derive_fields result exactly
+"""
+
+import numpy as np
+import pytest
+
+from config import INDICATOR_CONFIG
+from nav_store import HISTORY_FIELDS, NavStore
+import parallel_indicators
+from synthetic_data import synthetic_universe
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setitem(INDICATOR_CONFIG, 'min_schemes_per_worker', 1)
+
+
+def assert_same(left, right):
+    for field in HISTORY_FIELDS:
+        np.testing.assert_array_equal(left[field], right[field])
+
+
+def test_memory_mapped_store_matches_serial(tmp_path, small_chunks):
+    _, store, _ = synthetic_universe(300, 2, str(tmp_path))
+    codes = list(reversed(store.scheme_codes)) + ['UNKNOWN']
+
+    assert_same(store.derive_fields(codes, workers=3), store.derive_fields(codes))
+
+
+def test_in_memory_matrix_goes_through_shared_memory(tmp_path, small_chunks):
+    _, mapped, _ = synthetic_universe(120, 2, str(tmp_path))
+    store = NavStore(mapped.path, dict(mapped.meta), np.array(mapped.dates), np.array(mapped.navs))
+    as_of = store.dates[store.length // 2]
+
+    assert_same(store.derive_fields(store.scheme_codes, as_of, workers=2),
+                store.derive_fields(store.scheme_codes, as_of))
+
+
+def test_worker_count_is_capped_by_universe_size(monkeypatch):
+    monkeypatch.setitem(INDICATOR_CONFIG, 'min_schemes_per_worker', 1000)
+
+    assert parallel_indicators.resolve_workers(8, 2500) == 3
+    assert parallel_indicators.resolve_workers(8, 10) == 1
+    assert parallel_indicators.resolve_workers(0, 10 ** 6) >= 1
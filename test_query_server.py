@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for the query server
+Starts the server on a free localhost port and queries it over HTTP
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import exporters
+from query_server import FundDataset, QueryError, QueryServer, aum_bucket
+
+FUNDS = [
+    {'fund_name': 'SBI Small Cap', 'fund_code': 'SBI', 'category': 'Small Cap', 'fund_manager': 'R. Srinivasan',
+     'aum_cr': 31227, 'momentum_score': 85, 'recommendation': 'Strong Buy'},
+    {'fund_name': 'Axis Small Cap', 'fund_code': 'AXIS', 'category': 'Small Cap', 'fund_manager': 'Shreyash',
+     'aum_cr': 25568, 'momentum_score': 70, 'recommendation': 'Buy'},
+    {'fund_name': 'HDFC Mid Cap', 'fund_code': 'HDFC', 'category': 'Mid Cap', 'fund_manager': 'Chirag',
+     'aum_cr': 83104, 'momentum_score': 90, 'recommendation': 'Strong Buy'},
+    {'fund_name': 'Tiny Flexi', 'fund_code': 'TINY', 'category': 'Flexi Cap', 'aum_cr': None,
+     'momentum_score': 40, 'recommendation': 'Avoid'},
+]
+
+
+def export(directory, funds):
+    return exporters.export(funds, {'analysis_timestamp': 'now'}, 'json-compact',
+                            os.path.join(directory, 'fund_analysis_data'))
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = export(str(tmp_path), FUNDS)
+    server = QueryServer(('127.0.0.1', 0), path, fmt='json-compact', directory=str(tmp_path), reload_seconds=0)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, headers=None):
+    request = urllib.request.Request(f'http://127.0.0.1:{server.server_port}{path}', headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            body = response.read()
+            return response.status, response.headers, json.loads(body) if body else None
+    except urllib.error.HTTPError as e:
+        body = e.read()
+        return e.code, e.headers, json.loads(body) if body else None
+
+
+def test_filter_sort_and_paginate(server):
+    status, _, body = get(server, '/api/funds?category=Small%20Cap&category=Mid%20Cap&min_aum_cr=25000'
+                                  '&sort=-aum_cr&page_size=2')
+
+    assert status == 200
+    assert body['total'] == 3
+    assert [fund['fund_code'] for fund in body['funds']] == ['HDFC', 'SBI']
+
+    _, _, page2 = get(server, '/api/funds?category=Small%20Cap&category=Mid%20Cap&min_aum_cr=25000'
+                              '&sort=-aum_cr&page_size=2&page=2')
+    assert [fund['fund_code'] for fund in page2['funds']] == ['AXIS']
+
+
+def test_default_order_and_unknown_bucket(server):
+    _, _, body = get(server, '/api/funds')
+    assert [fund['fund_code'] for fund in body['funds']] == ['HDFC', 'SBI', 'AXIS', 'TINY']
+
+    _, _, facets = get(server, '/api/facets')
+    assert facets['aum_bucket'] == {'20000-50000': 2, '50000+': 1, 'unknown': 1}
+    assert facets['recommendation']['Strong Buy'] == 2
+
+
+def test_etag_revalidation(server):
+    _, headers, _ = get(server, '/api/funds?recommendation=Strong%20Buy')
+
+    status, _, body = get(server, '/api/funds?recommendation=Strong%20Buy',
+                          headers={'If-None-Match': headers['ETag']})
+    assert status == 304 and body is None
+
+    status, _, _ = get(server, '/api/funds?recommendation=Buy', headers={'If-None-Match': headers['ETag']})
+    assert status == 200
+
+
+def test_bad_queries_are_rejected(server):
+    assert get(server, '/api/funds?colour=red')[0] == 400
+    assert get(server, '/api/funds?min_aum_cr=lots')[0] == 400
+    assert get(server, '/api/funds?sort=-nothing')[0] == 400
+    assert get(server, '/api/funds?page=0')[0] == 400
+
+
+def test_new_run_is_swapped_in(server, tmp_path):
+    _, headers, _ = get(server, '/api/funds')
+    old_version = server.dataset.version
+
+    export(str(tmp_path), FUNDS[:2])
+    os.utime(server.data_path, ns=(1, 1))
+    assert server.reload_if_changed()
+
+    status, _, body = get(server, '/api/funds', headers={'If-None-Match': headers['ETag']})
+    assert status == 200 and body['total'] == 2
+    assert body['version'] != old_version
+    assert get(server, '/api/health')[2]['funds'] == 2
+
+
+def test_static_report_is_still_served(server, tmp_path):
+    (tmp_path / 'index.html').write_text('<html>report</html>')
+
+    with urllib.request.urlopen(f'http://127.0.0.1:{server.server_port}/index.html') as response:
+        assert response.read() == b'<html>report</html>'
+
+
+def test_dataset_query_without_http():
+    dataset = FundDataset(FUNDS, 'v1')
+
+    total, rows = dataset.query({'fund_manager': ['unknown']})
+    assert (total, rows.tolist()) == (1, [3])
+    with pytest.raises(QueryError):
+        dataset.query({'page_size': ['100000']})
+    assert aum_bucket(999) == '<1000' and aum_bucket(1000) == '1000-5000'
+
+
+def test_watcher_keeps_old_snapshot_on_truncated_export(tmp_path):
+    path = exporters.export(FUNDS, {'analysis_timestamp': 'now'}, 'npz', os.path.join(str(tmp_path), 'data'))
+    server = QueryServer(('127.0.0.1', 0), path, fmt='npz', reload_seconds=0.02)
+    try:
+        with open(path, 'rb') as f:
+            payload = f.read()
+        with open(path, 'wb') as f:
+            f.write(payload[:len(payload) // 2])
+        time.sleep(0.1)
+        assert server._watcher.is_alive() and server.dataset.count == len(FUNDS)
+
+        exporters.export(FUNDS[:2], {'analysis_timestamp': 'later'}, 'npz', os.path.join(str(tmp_path), 'data'))
+        deadline = time.time() + 2
+        while server.dataset.count != 2 and time.time() < deadline:
+            time.sleep(0.02)
+        assert server.dataset.count == 2
+    finally:
+        server.server_close()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for top-K leaderboard ranking
+Partial selection must agree with a full multi-key sort, ties included
+"""
+
+import random
+
+import numpy as np
+
+import ranking
+
+
+def tied_funds(count, seed=5):
+    """Universe where scores, drawdowns and AUMs collide often"""
+    rng = random.Random(seed)
+    return [{
+        'fund_code': f'F{rng.randint(0, 10 ** 6):07d}',
+        'category': rng.choice(['Small Cap', 'Mid Cap', 'Flexi Cap']),
+        'momentum_score': rng.choice([100, 100, 90, 85, 70, 55]),
+        'drawdown_from_high': rng.choice([12.5, 20.0, 20.0, 31.25]),
+        'aum_cr': rng.choice([5000, 12000, 12000, 40000]),
+        'expense_ratio': rng.choice([0.5, 1.2, 1.2, None]),
+    } for _ in range(count)]
+
+
+def as_columns(funds):
+    return {name: np.array([fund[name] for fund in funds], dtype=None if name in ('fund_code', 'category') else float)
+            for name in funds[0]}
+
+
+def test_heap_and_partition_match_full_sort():
+    funds = tied_funds(3000)
+    expected = sorted(funds, key=ranking.rank_key)
+
+    for k in (1, 50, 2999, 5000):
+        assert ranking.top_k(funds, k) == expected[:k]
+        indices = ranking.top_k_indices(as_columns(funds), k)
+        assert [funds[i] for i in indices] == expected[:k]
+
+
+def test_per_category_leaderboards():
+    funds = tied_funds(2000)
+    boards = ranking.top_k(funds, 25, per_category=True)
+    index_boards = ranking.top_k_indices_per_category(as_columns(funds), 25)
+
+    for category, board in boards.items():
+        members = sorted((f for f in funds if f['category'] == category), key=ranking.rank_key)
+        assert board == members[:25]
+        assert [funds[i] for i in index_boards[category]] == board
+
+
+def test_tie_break_order():
+    base = {'fund_code': 'A', 'category': 'Small Cap', 'momentum_score': 100,
+            'drawdown_from_high': 20.0, 'aum_cr': 10000, 'expense_ratio': 1.0}
+    funds = [
+        dict(base, fund_code='E', expense_ratio=1.5),
+        dict(base, fund_code='D', aum_cr=20000),
+        dict(base, fund_code='C', drawdown_from_high=25.0),
+        dict(base, fund_code='B', momentum_score=90, drawdown_from_high=40.0),
+        dict(base, fund_code='A'),
+    ]
+    assert [f['fund_code'] for f in ranking.top_k(funds, 5)] == ['C', 'D', 'A', 'E', 'B']
+
+
+def test_screen_order_keeps_input_order_for_ties():
+    scores = np.array([55, 100, 70, 100, 55, 90, 100])
+    expected = sorted(range(len(scores)), key=lambda i: -scores[i])
+
+    assert ranking.order_by_score(scores).tolist() == expected
+    assert ranking.order_by_score(scores.astype(float)).tolist() == expected
+    assert ranking.order_by_score(np.array([2 ** 40, 1, 2 ** 40])).tolist() == [0, 2, 1]
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the sharded static report output
+"""
+
+import json
+import os
+
+import config
+from mutual_fund_screener import IndianMutualFundScreener
+import report_shards
+from synthetic_data import synthetic_screened_funds
+
+
+def test_shards_cover_every_fund_per_category(tmp_path):
+    funds = synthetic_screened_funds(1234)
+    manifest = report_shards.write_shards(str(tmp_path), funds, shard_size=100)
+
+    seen = 0
+    for slug, entry in manifest['categories'].items():
+        rows = []
+        for file_name in entry['shards']:
+            with open(tmp_path / file_name, encoding='utf-8') as f:
+                shard = json.load(f)
+            assert len(shard) <= 100
+            rows.extend(shard)
+        expected = [fund for fund in funds if report_shards.category_slug(fund['category']) == slug]
+        assert rows == [[fund.get(c) for c in manifest['columns']] for fund in expected]
+        assert entry['count'] == len(expected)
+        seen += len(rows)
+    assert seen == len(funds)
+
+    with open(tmp_path / report_shards.MANIFEST_FILE, encoding='utf-8') as f:
+        assert json.load(f) == manifest
+
+
+def test_sharded_index_embeds_only_top_funds(tmp_path, monkeypatch):
+    monkeypatch.setitem(config.REPORT_CONFIG, 'top_n', 25)
+    monkeypatch.setitem(config.REPORT_CONFIG, 'shard_size', 200)
+    monkeypatch.chdir(tmp_path)
+    funds = synthetic_screened_funds(3000)
+
+    screener = IndianMutualFundScreener()
+    screener.fetch_nifty_valuation_data()
+    screener.fetch_market_news()
+    sharded = screener.generate_html_report(funds, shard_dir='shards')
+    inline = screener.generate_html_report(funds)
+
+    assert sharded.count('<small>Manager: ') == 25
+    assert '"shards/manifest.json"' in sharded
+    assert len(sharded) < len(inline) / 20
+    assert os.path.exists(tmp_path / 'shards' / 'small-cap-0.json')
+    assert report_shards.category_slug('Large & Mid Cap') == 'large-mid-cap'
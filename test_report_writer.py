@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming HTML report writer
+"""
+
+import io
+import os
+
+import report_writer
+
+# Report produced by the original create_html_template for the inputs below
+BASELINE_REPORT = os.path.join(os.path.dirname(__file__), 'fixtures', 'baseline_report.html')
+CURRENT_TIME = '2026-01-01 00:00:00 IST'
+FUNDS = [
+    {'fund_name': 'SBI Small Cap Fund', 'fund_manager': 'R. Srinivasan', 'category': 'Small Cap',
+     'aum_cr': 31227, '1y_return': -8.2, '3y_return': 18.45, '5y_return': 24.1, '10y_return': 19.95,
+     'momentum_score': 95, 'beaten_down_level': 'Medium', 'recovery_potential_pct': 12.345,
+     'recommendation': 'Strong Buy'},
+    {'fund_name': 'Quant Mid Cap Fund', 'fund_manager': 'Sanjeev Sharma', 'category': 'Mid Cap',
+     'aum_cr': 8420, '1y_return': -14.0, '3y_return': 22.0, '5y_return': 12.5, '10y_return': 15.04,
+     'momentum_score': 70, 'beaten_down_level': 'High', 'recovery_potential_pct': 55.0,
+     'recommendation': 'Buy'},
+    {'fund_name': 'Axis Bluechip Fund', 'fund_manager': 'Shreyash Devalkar', 'category': 'Large Cap',
+     'aum_cr': 1500, '1y_return': -0.45, '3y_return': -2.3, '5y_return': 9.0, '10y_return': 11.0,
+     'momentum_score': 45, 'beaten_down_level': 'Low', 'recovery_potential_pct': 88.8,
+     'recommendation': 'Avoid'},
+]
+VALUATION = {'nifty_50_level': 25125.5, 'nifty_50_pe': 22.4, 'market_cap_to_gdp': 118,
+             'current_vs_historical': 'Fairly Valued'}
+NEWS = [
+    {'headline': 'RBI holds repo rate', 'summary': 'Policy stance unchanged for the quarter.',
+     'impact': 'Neutral', 'date': '2026-01-01'},
+    {'headline': 'Small caps slide for a third week', 'summary': 'Valuations cool after a long rally.',
+     'impact': 'Positive for contrarian entries', 'date': '2025-12-31'},
+]
+
+
+def test_streamed_report_matches_baseline_report():
+    out = io.StringIO()
+    report_writer.write_report(out, CURRENT_TIME, FUNDS, VALUATION, NEWS)
+
+    with open(BASELINE_REPORT, encoding='utf-8') as f:
+        baseline = f.read()
+    # The only intended change since: the style of the redundant-pick note
+    anchor = '        .beaten-down-low { color: #20c997; font-weight: bold; }\n'
+    expected = baseline.replace(anchor, anchor + '        .redundant { color: #fd7e14; }\n')
+    assert expected != baseline
+    assert out.getvalue() == expected
+
+
+def test_rows_are_escaped_and_missing_values_render():
+    fund = {'fund_name': 'Risky <script>alert(1)</script> & Co', 'fund_manager': None,
+            'category': 'Small Cap', 'aum_cr': None, '1y_return': -3.0, '3y_return': None,
+            '5y_return': 12.0, '10y_return': None, 'momentum_score': 55,
+            'beaten_down_level': 'Low', 'recovery_potential_pct': 40.0, 'recommendation': 'Hold'}
+
+    row = report_writer.render_fund_row(fund)
+
+    assert '<script>' not in row
+    assert 'Risky &lt;script&gt;alert(1)&lt;/script&gt; &amp; Co' in row
+    assert 'Manager: N/A' in row and '<td>N/A</td>' in row
+    assert 'class="recommendation hold"' in row
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the input-fingerprint result cache
+A run whose inputs, config and code are unchanged must restore the previous outputs
+byte-for-byte without screening or rendering again
+"""
+
+import pytest
+
+from config import SCREENING_CONFIG
+from mutual_fund_screener import IndianMutualFundScreener
+import result_cache
+
+OUTPUTS = ['index.html', 'fund_analysis_data.json']
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return result_cache.ResultCache(str(tmp_path / 'results'), max_entries=2)
+
+
+def read_outputs(tmp_path):
+    return {name: (tmp_path / name).read_bytes() for name in OUTPUTS}
+
+
+def test_unchanged_inputs_restore_previous_outputs(tmp_path, cache, monkeypatch, capsys):
+    first = IndianMutualFundScreener(result_cache=cache).run_analysis()
+    written = read_outputs(tmp_path)
+    for name in OUTPUTS:
+        (tmp_path / name).write_text('edited')
+
+    screener = IndianMutualFundScreener(result_cache=cache)
+    monkeypatch.setattr(screener, 'screen_beaten_down_funds', lambda: pytest.fail('screened again'))
+    monkeypatch.setattr(screener, 'write_outputs', lambda funds: pytest.fail('rendered again'))
+    second = screener.run_analysis()
+
+    assert read_outputs(tmp_path) == written
+    assert second == first
+    assert screener.screen_filter.rejected
+    assert 'Inputs unchanged' in capsys.readouterr().out
+
+
+def test_config_change_or_refresh_reruns(tmp_path, cache, monkeypatch):
+    IndianMutualFundScreener(result_cache=cache).run_analysis()
+    written = read_outputs(tmp_path)
+
+    IndianMutualFundScreener(result_cache=cache).run_analysis(refresh=True)
+    assert read_outputs(tmp_path) != written  # fresh analysis timestamp
+
+    monkeypatch.setitem(SCREENING_CONFIG, 'max_expense_ratio', 1.0)
+    screener = IndianMutualFundScreener(result_cache=cache)
+    screener.run_analysis()
+    assert screener.screen_filter.rejected['expense_ratio <= 1.0'] > 0
+
+
+def test_fingerprint_covers_inputs_and_config(monkeypatch):
+    inputs = {'funds_data': [{'fund_code': 'A', 'current_nav': 10.0}]}
+    key = result_cache.fingerprint(inputs)
+
+    assert result_cache.fingerprint({'funds_data': [{'current_nav': 10.0, 'fund_code': 'A'}]}) == key
+    assert result_cache.fingerprint({'funds_data': [{'fund_code': 'A', 'current_nav': 10.5}]}) != key
+    monkeypatch.setitem(SCREENING_CONFIG, 'min_aum_crores', 500)
+    assert result_cache.fingerprint(inputs) != key
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, cache):
+    (tmp_path / 'out.txt').write_text('x')
+    for key in ('a', 'b', 'c'):
+        cache.store(key, ['out.txt'], [])
+
+    assert cache.load('a') is None
+    assert cache.load('c')['files'] == ['out.txt']
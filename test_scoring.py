@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the vectorized scoring engine
+The columnar pass must reproduce the original per-fund if/elif scoring exactly
+"""
+
+import json
+
+import pytest
+
+from mutual_fund_screener import IndianMutualFundScreener
+import report_writer
+import rules
+import scoring
+import screening
+from synthetic_data import synthetic_funds
+
+
+def baseline_momentum(fund):
+    """The original per-fund if/elif scoring, frozen here as the reference the rules must reproduce"""
+    current_nav = fund['current_nav']
+    high_52w = fund['52w_high']
+    low_52w = fund['52w_low']
+
+    drawdown_from_high = ((high_52w - current_nav) / high_52w) * 100
+    recovery_potential = ((current_nav - low_52w) / (high_52w - low_52w)) * 100
+
+    short_term_return = fund['1y_return']
+    long_term_return = fund['5y_return']
+
+    momentum_score = 0
+
+    if short_term_return < -5:
+        momentum_score += 30
+    elif short_term_return < 0:
+        momentum_score += 20
+
+    if long_term_return > 15:
+        momentum_score += 25
+    elif long_term_return > 10:
+        momentum_score += 15
+
+    if recovery_potential > 70:
+        momentum_score += 10
+    elif recovery_potential < 30:
+        momentum_score += 25
+    else:
+        momentum_score += 15
+
+    if fund['aum_cr'] > 10000:
+        momentum_score += 10
+    if fund['expense_ratio'] < 1.5:
+        momentum_score += 10
+
+    return {
+        'momentum_score': min(momentum_score, 100),
+        'drawdown_from_high': round(drawdown_from_high, 2),
+        'recovery_potential_pct': round(recovery_potential, 2),
+        'beaten_down_level': 'High' if short_term_return < -10 else 'Medium' if short_term_return < -5 else 'Low'
+    }
+
+
+def baseline_recommendation(momentum_score):
+    if momentum_score >= 80:
+        return 'Strong Buy'
+    elif momentum_score >= 65:
+        return 'Buy'
+    elif momentum_score >= 50:
+        return 'Hold'
+    else:
+        return 'Avoid'
+
+
+def screen_per_fund(screener):
+    """Reference implementation: the frozen baseline scoring, one fund dict at a time"""
+    screened_funds = []
+    screen_filter = screening.compile_filter()
+
+    for fund in screener.funds_data:
+        momentum_data = baseline_momentum(fund)
+        fund_analysis = {
+            **fund,
+            **momentum_data,
+            'recommendation': baseline_recommendation(momentum_data['momentum_score'])
+        }
+        if screen_filter.accepts(fund):
+            screened_funds.append(fund_analysis)
+
+    screened_funds.sort(key=lambda x: x['momentum_score'], reverse=True)
+    return screened_funds
+
+
+def test_sample_funds_match_per_fund_path():
+    screener = IndianMutualFundScreener()
+    screener.fetch_mutual_fund_data()
+
+    assert screener.screen_beaten_down_funds() == screen_per_fund(screener)
+
+
+def test_synthetic_universe_matches_per_fund_path():
+    screener = IndianMutualFundScreener()
+    screener.funds_data = synthetic_funds(5000)
+
+    vectorized = screener.screen_beaten_down_funds()
+    reference = screen_per_fund(screener)
+
+    assert vectorized == reference
+    assert [list(fund) for fund in vectorized] == [list(fund) for fund in reference]
+    assert all(type(fund['momentum_score']) is int for fund in vectorized)
+
+
+def test_empty_universe():
+    screener = IndianMutualFundScreener()
+    screener.funds_data = []
+
+    assert screener.screen_beaten_down_funds() == []
+
+
+def test_rules_come_from_config():
+    program = rules.compile_rules(
+        rules=[{'factor': 'beaten_down_factor', 'field': '1y_return', 'bands': [['<', 0, 30]], 'otherwise': 5},
+               {'factor': 'fund_quality', 'field': 'drawdown_from_high', 'bands': [['>=', 20, 20]]}],
+        thresholds={'strong_buy': 45, 'buy': 30, 'hold': 10, 'avoid': 0})
+    funds = synthetic_funds(2000)
+    columns = scoring.build_columns(funds, program)
+    scored = scoring.score_columns(columns, program)
+
+    for i, fund in enumerate(funds):
+        drawdown = (fund['52w_high'] - fund['current_nav']) / fund['52w_high'] * 100
+        expected = (30 if fund['1y_return'] < 0 else 5) + (20 if drawdown >= 20 else 0)
+        assert scored['momentum_score'][i] == expected
+        assert scored['recommendation'][i] == program.recommend_one(expected)
+        assert program.score_one({**fund, 'drawdown_from_high': drawdown}) == expected
+
+
+def test_rules_over_factor_weight_are_rejected():
+    with pytest.raises(ValueError, match='beaten_down_factor'):
+        rules.compile_rules(rules=[{'factor': 'beaten_down_factor', 'field': '1y_return', 'bands': [['<', 0, 31]]}])
+    with pytest.raises(ValueError, match='unknown operator'):
+        rules.compile_rules(rules=[{'factor': 'fund_quality', 'field': 'aum_cr', 'bands': [['!=', 0, 5]]}])
+
+
+def test_flat_52_week_range_has_unknown_positioning():
+    screener = IndianMutualFundScreener()
+    screener.funds_data = synthetic_funds(3)
+    screener.funds_data[2].update({'52w_low': 120.0, '52w_high': 120.0, 'current_nav': 120.0, '1y_return': -1.0})
+
+    flat = next(fund for fund in screener.screen_beaten_down_funds() if fund['fund_code'] == 'SYN_2')
+    per_fund = screener.calculate_momentum_indicators(screener.funds_data[2])
+
+    assert flat['recovery_potential_pct'] is None and flat['drawdown_from_high'] == 0.0
+    assert per_fund['recovery_potential_pct'] is None
+    assert flat['momentum_score'] == per_fund['momentum_score']
+    assert 'NaN' not in json.dumps(dict(flat))
+    assert '<td>N/A</td>' in report_writer.render_fund_row(flat)
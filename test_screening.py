@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the SCREENING_CONFIG predicates
+Ingestion-time and columnar filtering must agree and charge each rejected row once
+"""
+
+import numpy as np
+import pytest
+
+from mutual_fund_screener import IndianMutualFundScreener
+import scoring
+import screening
+from synthetic_data import synthetic_funds
+
+
+def test_ingestion_and_columnar_paths_agree():
+    funds = synthetic_funds(3000)
+    funds[5]['aum_cr'] = None
+    funds[6].update({'1y_return': -20.0, 'aum_cr': 5000, 'expense_ratio': 1.0, '3y_return': None})
+
+    per_fund = screening.compile_filter()
+    accepted = [fund for fund in funds if per_fund.accepts(fund)]
+
+    columnar = screening.compile_filter()
+    keep = columnar.mask(scoring.build_columns(funds, fields=columnar.fields))
+
+    assert accepted == [funds[i] for i in np.flatnonzero(keep)]
+    assert per_fund.rejected == columnar.rejected
+    assert sum(per_fund.rejected.values()) == len(funds) - len(accepted)
+    assert all(per_fund.rejected.values())
+
+
+def test_missing_aum_is_kept_and_missing_return_rejected():
+    screen_filter = screening.compile_filter()
+    fund = {'1y_return': -4.0, '3y_return': 9.0, 'aum_cr': None}
+
+    assert screen_filter.accepts(fund)
+    assert not screen_filter.accepts({**fund, '1y_return': None})
+    assert screen_filter.rejected['1y_return < 0'] == 1
+
+
+def test_fields_missing_from_the_record_are_deferred():
+    screen_filter = screening.compile_filter()
+
+    # AMFI records carry no returns, AUM or expense ratio yet
+    assert screen_filter.accepts({'fund_code': '118778', 'current_nav': 178.9})
+    assert screen_filter.accepts({'1y_return': 5.0}, deferred_fields=['1y_return'])
+    assert not any(screen_filter.rejected.values())
+
+
+def test_screen_reports_rejections_before_scoring():
+    screener = IndianMutualFundScreener()
+    screener.funds_data = synthetic_funds(1000)
+
+    screened = screener.screen_beaten_down_funds()
+
+    assert len(screened) + sum(screener.screen_filter.rejected.values()) == 1000
+    assert all(fund['1y_return'] < 0 and fund['aum_cr'] >= 1000 and fund['expense_ratio'] <= 2.0
+               for fund in screened)
+
+
+def test_track_record_uses_shortest_covering_return_period():
+    predicates = screening.compile_predicates({'min_track_record_years': 4})
+    assert [predicate.field for predicate in predicates] == ['5y_return']
+
+    with pytest.raises(ValueError):
+        screening.compile_predicates({'min_track_record_years': 20})